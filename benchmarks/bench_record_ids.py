@@ -0,0 +1,123 @@
+"""Insert throughput and primary key index shape: random ``uuid4`` vs time-ordered ``uuid7`` ids.
+
+Builds the ``records`` table (with its indexes) in a fresh SQLite file per variant and
+inserts ``--rows`` rows in batches, the way a steady ingest stream would. Reported:
+
+- ``rows/s`` over the whole run and over the last ``--tail`` share of rows, where random
+  keys hurt most because the index no longer fits in the page cache
+- pages written per 1000 rows (WAL frames, checkpointed after every batch): random keys
+  dirty a different leaf page of the primary key index for almost every row and split
+  pages all over the B-tree, while time-ordered keys only touch and split its right edge
+- pages and average fill of the primary key index, from the ``dbstat`` virtual table
+  (SQLite rebalances siblings on split, so fill stays similar; B-tree indexes without
+  rebalancing, e.g. Postgres, are left with half-empty pages after random inserts)
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/bench_record_ids.py --rows 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from workflow_service.app.models import Base
+from workflow_service.app.utils.ids import new_record_id
+
+GENERATORS = {
+    "uuid4": lambda: str(uuid.uuid4()),
+    "uuid7": new_record_id,
+}
+
+
+def build_database(path: Path) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def pk_index_stats(conn: sqlite3.Connection) -> tuple[int, float]:
+    name = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'records' "
+        "AND name LIKE 'sqlite_autoindex_records_%'"
+    ).fetchone()[0]
+    pages, size, unused = conn.execute(
+        "SELECT count(*), sum(pgsize), sum(unused) FROM dbstat WHERE name = ?", (name,)
+    ).fetchone()
+    return pages, 1 - unused / size
+
+
+def run(variant: str, rows: int, batch: int, tail: float, cache_kib: int) -> dict:
+    new_id = GENERATORS[variant]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ids.db"
+        build_database(path)
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{cache_kib}")
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+
+        payload = json.dumps({"priority": 3})
+        started_at = datetime(2026, 1, 1)
+        tail_from = int(rows * (1 - tail))
+        tail_started = None
+        pages_written = 0
+        started = time.perf_counter()
+        for offset in range(0, rows, batch):
+            if tail_started is None and offset >= tail_from:
+                tail_started = time.perf_counter()
+            values = [
+                (new_id(), started_at + timedelta(milliseconds=i), "pending", "bench", "c", payload)
+                for i in range(offset, min(offset + batch, rows))
+            ]
+            with conn:
+                conn.executemany(
+                    "INSERT INTO records (id, created_at, status, source, category, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    values,
+                )
+            _, wal_frames, _ = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            pages_written += wal_frames
+        finished = time.perf_counter()
+        pages, fill = pk_index_stats(conn)
+        conn.close()
+    return {
+        "rows_per_s": rows / (finished - started),
+        "tail_rows_per_s": (rows - tail_from) / (finished - (tail_started or started)),
+        "pages_per_1k_rows": pages_written * 1000 / rows,
+        "pk_pages": pages,
+        "pk_fill": fill,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--tail", type=float, default=0.1, help="share of rows in the tail")
+    parser.add_argument("--cache-kib", type=int, default=16000, help="SQLite page cache")
+    args = parser.parse_args()
+
+    print(
+        f"{'ids':<6} {'rows/s':>9} {'tail_rows/s':>12} {'pages/1k_rows':>14} "
+        f"{'pk_pages':>9} {'pk_fill':>8}"
+    )
+    for variant in GENERATORS:
+        result = run(variant, args.rows, args.batch, args.tail, args.cache_kib)
+        print(
+            f"{variant:<6} {result['rows_per_s']:>9.0f} {result['tail_rows_per_s']:>12.0f} "
+            f"{result['pages_per_1k_rows']:>14.1f} {result['pk_pages']:>9} {result['pk_fill']:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
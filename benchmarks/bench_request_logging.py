@@ -0,0 +1,147 @@
+"""Per-request overhead of the request logging middleware.
+
+Drives a one-route Starlette app directly over ASGI (no sockets) and compares:
+
+- ``none``: no middleware (baseline)
+- ``base_http``: the previous ``BaseHTTPMiddleware`` implementation that ``json.dumps``
+  and writes to a ``StreamHandler`` on the event loop
+- ``asgi_queue``: the current pure ASGI ``RequestLoggingMiddleware`` with queued logging
+
+Log output goes to os.devnull in every variant so the numbers measure the request path,
+not the terminal.
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/bench_request_logging.py --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from workflow_service.app.main import RequestLoggingMiddleware
+from workflow_service.app.utils import logging as app_logging
+
+_devnull = open(os.devnull, "w")
+
+legacy_logger = logging.getLogger("bench.legacy")
+legacy_logger.addHandler(logging.StreamHandler(_devnull))
+legacy_logger.propagate = False
+legacy_logger.setLevel(logging.INFO)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The pre-ASGI implementation, kept here only as a comparison point."""
+
+    async def dispatch(self, request, call_next):
+        started_at = time.time()
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request.state.request_id = request_id
+        legacy_logger.info(
+            json.dumps(
+                {
+                    "event": "request.start",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "request_id": request_id,
+                }
+            )
+        )
+        response = await call_next(request)
+        legacy_logger.info(
+            json.dumps(
+                {
+                    "event": "request.end",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status_code": response.status_code,
+                    "duration_ms": int((time.time() - started_at) * 1000),
+                    "request_id": request_id,
+                }
+            )
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+async def ping(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware_cls):
+    middleware = [Middleware(middleware_cls)] if middleware_cls else []
+    return Starlette(routes=[Route("/ping", ping)], middleware=middleware)
+
+
+async def drive(app, requests: int) -> list[float]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await app(dict(scope), receive, send)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=1000)
+    args = parser.parse_args()
+
+    # send the service logger's queue listener output to devnull as well
+    app_logging.configure_logging("INFO")
+    for handler in app_logging._listener.handlers:
+        handler.setStream(_devnull)
+
+    variants = {
+        "none": build_app(None),
+        "base_http": build_app(LegacyRequestLoggingMiddleware),
+        "asgi_queue": build_app(RequestLoggingMiddleware),
+    }
+    baseline = None
+    print(f"{'variant':<12} {'mean_us':>9} {'p50_us':>9} {'p99_us':>9} {'overhead_us':>12}")
+    for name, app in variants.items():
+        asyncio.run(drive(app, args.warmup))
+        samples = asyncio.run(drive(app, args.requests))
+        mean = statistics.fmean(samples)
+        p50 = statistics.median(samples)
+        p99 = statistics.quantiles(samples, n=100)[98]
+        baseline = mean if baseline is None else baseline
+        print(f"{name:<12} {mean:>9.1f} {p50:>9.1f} {p99:>9.1f} {mean - baseline:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
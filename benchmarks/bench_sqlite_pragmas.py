@@ -0,0 +1,103 @@
+"""Ingest and read throughput on SQLite: default connection settings vs the tuned pragmas.
+
+Each variant gets a fresh file database built with ``database.build_engine`` and runs:
+
+- ``ingest``: one ORM insert + commit per record, like ``POST /records``
+- ``read``: the ``GET /records`` page query (count + filtered, ordered page)
+- ``mixed``: reader threads running the page query while one thread ingests
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/bench_sqlite_pragmas.py --records 2000 --reads 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from workflow_service.app.config import Settings
+from workflow_service.app.database import build_engine
+from workflow_service.app.models import Base
+from workflow_service.app.models.record import Record
+from workflow_service.app.services import reporting
+
+CATEGORIES = ["alpha", "beta", "gamma", "delta"]
+
+
+def ingest(session_factory, count: int, offset: int = 0) -> float:
+    started = time.perf_counter()
+    for i in range(offset, offset + count):
+        with session_factory() as session:
+            session.add(
+                Record(source="bench", category=CATEGORIES[i % len(CATEGORIES)], payload="{}")
+            )
+            session.commit()
+    return count / (time.perf_counter() - started)
+
+
+def read(session_factory, count: int) -> float:
+    started = time.perf_counter()
+    for i in range(count):
+        with session_factory() as session:
+            reporting.get_records(session, category=CATEGORIES[i % len(CATEGORIES)], limit=20)
+    return count / (time.perf_counter() - started)
+
+
+def mixed(session_factory, writes: int, reads: int, readers: int) -> tuple[float, float]:
+    results: dict[str, float] = {}
+    threads = [
+        threading.Thread(
+            target=lambda: results.__setitem__("write", ingest(session_factory, writes, 10**6))
+        )
+    ]
+    for n in range(readers):
+        threads.append(
+            threading.Thread(
+                target=lambda n=n: results.__setitem__(f"read{n}", read(session_factory, reads))
+            )
+        )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results["write"], sum(v for k, v in results.items() if k.startswith("read"))
+
+
+def run(variant: str, config: Settings, args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", config)
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        ingest_rate = ingest(session_factory, args.records)
+        read_rate = read(session_factory, args.reads)
+        mixed_write, mixed_read = mixed(
+            session_factory, args.records // 2, args.reads // args.readers, args.readers
+        )
+        engine.dispose()
+    print(
+        f"{variant:<9} {ingest_rate:>11.0f} {read_rate:>11.0f} "
+        f"{mixed_write:>13.0f} {mixed_read:>12.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'variant':<9} {'ingest/s':>11} {'reads/s':>11} {'mix_ingest/s':>13} {'mix_reads/s':>12}"
+    )
+    run("defaults", Settings(SQLITE_TUNED=False), args)
+    run("tuned", Settings(SQLITE_TUNED=True), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Python-side cost per query: ORM ``Query`` building vs prebuilt, bound-parameter statements.
+
+Runs the hot read paths against a small in-memory SQLite table, so time spent in SQLite is
+small and the numbers are dominated by statement construction, cache-key generation,
+compilation and result processing:
+
+- ``legacy``: the previous ``session.query(...)`` implementations, kept here as the
+  comparison point
+- ``cached``: the current ``reporting.get_records``/``get_summary`` and ``_fetch_record``,
+  which reuse statements memoized per filter shape
+- ``raw_sql``: the same SELECTs sent via ``exec_driver_sql``, as the driver floor
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/bench_statement_cache.py --iterations 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import and_, create_engine, func
+from sqlalchemy.orm import Session
+
+from workflow_service.app.api.records import _fetch_record
+from workflow_service.app.models import Base
+from workflow_service.app.models.record import Record
+from workflow_service.app.services import reporting
+
+CATEGORIES = ["alpha", "beta", "gamma", "delta"]
+
+
+def legacy_get_records(db, category, limit=50, offset=0):
+    base_q = db.query(Record).filter(Record.category == category)
+    total = base_q.count()
+    items = base_q.order_by(Record.created_at.desc()).limit(limit).offset(offset).all()
+    return items, total
+
+
+def legacy_get_summary(db, category):
+    filters = [Record.category == category]
+    total = db.query(func.count(Record.id)).filter(and_(*filters)).scalar()
+    status_rows = (
+        db.query(Record.status, func.count(Record.id))
+        .group_by(Record.status)
+        .filter(and_(*filters))
+        .all()
+    )
+    cat_rows = (
+        db.query(Record.category, func.count(Record.id))
+        .group_by(Record.category)
+        .filter(Record.category == category)
+        .all()
+    )
+    return total, status_rows, cat_rows
+
+
+def legacy_fetch_record(db, record_id):
+    return db.query(Record).filter(Record.id == record_id).first()
+
+
+def raw_get_records(db, category):
+    conn = db.connection()
+    conn.exec_driver_sql("SELECT count(records.id) FROM records WHERE category = ?", (category,))
+    return conn.exec_driver_sql(
+        "SELECT * FROM records WHERE category = ? ORDER BY created_at DESC LIMIT 50 OFFSET 0",
+        (category,),
+    ).fetchall()
+
+
+def raw_get_summary(db, category):
+    conn = db.connection()
+    conn.exec_driver_sql("SELECT count(id) FROM records WHERE category = ?", (category,))
+    conn.exec_driver_sql(
+        "SELECT status, count(id) FROM records WHERE category = ? GROUP BY status", (category,)
+    ).fetchall()
+    return conn.exec_driver_sql(
+        "SELECT category, count(id) FROM records WHERE category = ? GROUP BY category",
+        (category,),
+    ).fetchall()
+
+
+def raw_fetch_record(db, record_id):
+    return (
+        db.connection()
+        .exec_driver_sql("SELECT * FROM records WHERE id = ? LIMIT 1", (record_id,))
+        .fetchall()
+    )
+
+
+def measure(func, session, args_for, iterations: int) -> float:
+    for i in range(200):  # warm the caches
+        func(session, *args_for(i))
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        func(session, *args_for(i))
+        samples.append((time.perf_counter() - started) * 1_000_000)
+        session.expunge_all()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            Record(source="bench", category=CATEGORIES[i % len(CATEGORIES)], payload="{}")
+            for i in range(args.rows)
+        )
+        session.commit()
+        ids = [r for (r,) in session.query(Record.id)]
+
+    def by_category(i):
+        return (CATEGORIES[i % len(CATEGORIES)],)
+
+    def by_id(i):
+        return (ids[i % len(ids)],)
+
+    cases = {
+        "get_records": (
+            by_category,
+            legacy_get_records,
+            lambda db, category: reporting.get_records(db, category=category),
+            raw_get_records,
+        ),
+        "get_summary": (
+            by_category,
+            legacy_get_summary,
+            lambda db, category: reporting.get_summary(db, category=category),
+            raw_get_summary,
+        ),
+        "fetch_record": (by_id, legacy_fetch_record, _fetch_record, raw_fetch_record),
+    }
+
+    print(f"{'query':<14} {'legacy_us':>10} {'cached_us':>10} {'raw_sql_us':>11} {'saved_us':>9}")
+    with Session(engine) as session:
+        for name, (args_for, legacy, current, raw) in cases.items():
+            legacy_us = measure(legacy, session, args_for, args.iterations)
+            cached_us = measure(current, session, args_for, args.iterations)
+            raw_us = measure(raw, session, args_for, args.iterations)
+            print(
+                f"{name:<14} {legacy_us:>10.1f} {cached_us:>10.1f} {raw_us:>11.1f} "
+                f"{legacy_us - cached_us:>9.1f}"
+            )
+    print("statement builder cache:", reporting.statement_cache_info())
+
+
+if __name__ == "__main__":
+    main()
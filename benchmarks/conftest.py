@@ -0,0 +1,62 @@
+"""Fixtures for the pytest-benchmark microbenchmarks in this directory.
+
+The benchmarks share one in-memory SQLite database seeded with ``BENCH_ROWS`` records
+(default 10000) spread over a few categories, sources and statuses.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from workflow_service.app import database
+from workflow_service.app.models import Base
+from workflow_service.app.models.record import Record
+from workflow_service.app.utils.ids import new_record_id
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "10000"))
+CATEGORIES = ["alpha", "beta", "gamma", "delta"]
+SOURCES = ["api", "batch", "import"]
+STATUSES = ["pending", "processed", "processed", "failed"]
+
+
+@pytest.fixture(scope="session")
+def bench_session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    started = datetime(2024, 1, 1)
+    rows = [
+        {
+            "id": new_record_id(),
+            "created_at": started + timedelta(seconds=i),
+            "status": STATUSES[i % len(STATUSES)],
+            "source": SOURCES[i % len(SOURCES)],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "payload": {"n": i, "priority": i % 5},
+        }
+        for i in range(BENCH_ROWS)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Record), rows)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(bench_session_factory):
+    with bench_session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def processing_sessions(bench_session_factory, monkeypatch):
+    """Point the shared session factory (used by ``process_record``) at the benchmark database."""
+    monkeypatch.setattr(database, "SessionLocal", bench_session_factory)
+    return bench_session_factory
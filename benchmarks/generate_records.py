@@ -0,0 +1,265 @@
+"""Bulk-generate synthetic ``records`` rows for scale testing.
+
+Rows are produced in ``created_at`` order over a time window, with configurable
+distributions for category, source and status, and log-normally distributed payload
+sizes. Everything, including the (UUIDv7) ids, is derived from ``--seed``, so the same
+arguments always produce the same table and benchmark runs stay comparable.
+
+Rows are written through the fastest path per backend, in one transaction:
+
+- Postgres: ``COPY records (...) FROM STDIN`` in CSV format, one COPY per batch
+- SQLite: ``executemany`` on the raw driver connection, per batch
+
+Distribution specs are ``name:weight`` lists (``api:6,batch:3,import:1``) or, for many
+values, ``zipf:<count>:<exponent>`` (names ``<prefix>-000``, ``<prefix>-001``, ...).
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/generate_records.py --database-url sqlite:///./bench.db \\
+        --rows 1000000 --create-tables
+    PYTHONPATH=. python benchmarks/generate_records.py \\
+        --database-url postgresql://localhost/bench --rows 10000000 --seed 7 \\
+        --categories zipf:200:1.1 --statuses pending:1,processed:8,failed:1
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import math
+import random
+import string
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from workflow_service.app.config import settings
+from workflow_service.app.models import Base
+from workflow_service.app.utils.ids import uuid7_from_parts
+
+COLUMNS = (
+    "id",
+    "created_at",
+    "status",
+    "source",
+    "category",
+    "payload",
+    "classification",
+    "score",
+    "error",
+)
+EPOCH = datetime(1970, 1, 1)
+
+
+class Choice:
+    """Weighted choice over a fixed set of values (cumulative weights + bisect)."""
+
+    def __init__(self, values: list[str], weights: list[float]):
+        self.values = values
+        self.cumulative = list(itertools.accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    @classmethod
+    def parse(cls, spec: str, prefix: str) -> Choice:
+        if spec.startswith("zipf:"):
+            _, count, exponent = spec.split(":")
+            values = [f"{prefix}-{i:03d}" for i in range(int(count))]
+            return cls(
+                values, [1 / (rank ** float(exponent)) for rank in range(1, len(values) + 1)]
+            )
+        pairs = [item.split(":") for item in spec.split(",")]
+        return cls([name for name, _ in pairs], [float(weight) for _, weight in pairs])
+
+    def pick(self, rng: random.Random) -> str:
+        return self.values[bisect.bisect_right(self.cumulative, rng.random() * self.total)]
+
+
+class RecordGenerator:
+    def __init__(
+        self,
+        rows: int,
+        seed: int,
+        start: datetime,
+        days: float,
+        categories: Choice,
+        sources: Choice,
+        statuses: Choice,
+        payload_bytes: int,
+    ):
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.start = start
+        self.step = timedelta(days=days) / max(rows, 1)
+        self.categories = categories
+        self.sources = sources
+        self.statuses = statuses
+        # median payload size; sizes are log-normal around it with a long tail
+        self.payload_mu = math.log(max(payload_bytes, 1))
+        # slices of one random pool make filler text far cheaper than per-row random strings
+        self.filler = "".join(self.rng.choices(string.ascii_letters + string.digits, k=1 << 16))
+
+    def _payload(self, i: int) -> str:
+        """The payload column value: JSON object text, as the API stores it."""
+        rng = self.rng
+        size = min(int(rng.lognormvariate(self.payload_mu, 0.8)), len(self.filler))
+        offset = rng.randrange(len(self.filler) - size + 1)
+        blob = self.filler[offset : offset + size]
+        # built directly rather than json.dumps'd: the filler is alphanumeric, so nothing
+        # needs escaping
+        return f'{{"n":{i},"priority":{rng.randrange(5)},"blob":"{blob}"}}'
+
+    def rows_iter(self) -> Iterator[tuple[object, ...]]:
+        rng = self.rng
+        last_ms, counter = -1, 0
+        for i in range(self.rows):
+            created_at = self.start + self.step * (i + rng.random())
+            ms = (created_at - EPOCH) // timedelta(milliseconds=1)
+            # rows are generated in time order; keep ids strictly increasing within a ms
+            if ms > last_ms:
+                last_ms, counter = ms, rng.getrandbits(11)
+            else:
+                counter += 1
+                if counter > 0xFFF:
+                    last_ms, counter = last_ms + 1, rng.getrandbits(11)
+            record_id = str(uuid7_from_parts(last_ms, counter, rng.getrandbits(62)))
+
+            status = self.statuses.pick(rng)
+            classification = score = error = None
+            if status == "processed":
+                classification = rng.choice(("low", "medium", "high"))
+                score = f"{rng.random():.4f}"
+            elif status == "failed":
+                error = "invalid priority"
+            yield (
+                record_id,
+                # the text SQLAlchemy's DateTime writes on SQLite; Postgres parses it too
+                created_at.isoformat(" ", "microseconds"),
+                status,
+                self.sources.pick(rng),
+                self.categories.pick(rng),
+                self._payload(i),
+                classification,
+                score,
+                error,
+            )
+
+
+def _batches(rows: Iterator[tuple[object, ...]], size: int) -> Iterator[list[tuple[object, ...]]]:
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+def write_sqlite(engine: Engine, rows: Iterator[tuple[object, ...]], batch_size: int) -> int:
+    placeholders = ", ".join("?" for _ in COLUMNS)
+    sql = f"INSERT INTO records ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+    written = 0
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        for batch in _batches(rows, batch_size):
+            cursor.executemany(sql, batch)
+            written += len(batch)
+            _progress(written)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return written
+
+
+def write_postgres(engine: Engine, rows: Iterator[tuple[object, ...]], batch_size: int) -> int:
+    sql = f"COPY records ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    written = 0
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        for batch in _batches(rows, batch_size):
+            buffer = io.StringIO()
+            # None -> empty unquoted field, which CSV-format COPY reads as NULL
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            written += len(batch)
+            _progress(written)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return written
+
+
+def _progress(written: int) -> None:
+    print(f"\r{written:,} rows", end="", file=sys.stderr, flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument(
+        "--start",
+        type=datetime.fromisoformat,
+        default=datetime(2024, 1, 1),
+        help="created_at of the first row (UTC, ISO 8601)",
+    )
+    parser.add_argument("--days", type=float, default=365.0, help="created_at window length")
+    parser.add_argument("--categories", default="zipf:50:1.1")
+    parser.add_argument("--sources", default="api:6,batch:3,import:1")
+    parser.add_argument("--statuses", default="pending:1,processed:8,failed:1")
+    parser.add_argument("--payload-bytes", type=int, default=256, help="median payload filler")
+    parser.add_argument("--create-tables", action="store_true", help="create missing tables")
+    parser.add_argument("--truncate", action="store_true", help="delete existing records first")
+    args = parser.parse_args()
+
+    start = args.start
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    generator = RecordGenerator(
+        rows=args.rows,
+        seed=args.seed,
+        start=start,
+        days=args.days,
+        categories=Choice.parse(args.categories, "category"),
+        sources=Choice.parse(args.sources, "source"),
+        statuses=Choice.parse(args.statuses, "status"),
+        payload_bytes=args.payload_bytes,
+    )
+
+    engine = create_engine(args.database_url)
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+    if args.truncate:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM records"))
+
+    if engine.dialect.name == "postgresql":
+        write = write_postgres
+    elif engine.dialect.name == "sqlite":
+        write = write_sqlite
+    else:
+        raise SystemExit(f"unsupported database: {engine.dialect.name}")
+
+    started = time.perf_counter()
+    written = write(engine, generator.rows_iter(), args.batch_size)
+    elapsed = time.perf_counter() - started
+    print(
+        f"\r{written:,} rows in {elapsed:.1f}s ({written / elapsed:,.0f} rows/s)", file=sys.stderr
+    )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
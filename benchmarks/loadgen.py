@@ -0,0 +1,312 @@
+"""Async HTTP load generator for the service's main endpoints.
+
+Starts the app under uvicorn against a fresh SQLite file (or ``--database-url``, e.g. a
+local Postgres), or targets an already running server with ``--url``, then drives each
+scenario with ``--concurrency`` concurrent clients and reports throughput and
+p50/p95/p99 latency:
+
+- ``ingest``: ``POST /records``
+- ``list``: ``GET /records`` (first page)
+- ``list_deep``: ``GET /records`` at a deep offset
+- ``summary``: ``GET /reports/summary``
+- ``process``: ``POST /records/{id}/process`` on records created beforehand
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/loadgen.py --requests 2000 --concurrency 32
+    PYTHONPATH=. python benchmarks/loadgen.py --database-url postgresql://localhost/bench \\
+        --scenarios ingest summary --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+
+from workflow_service.app.models import Base
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CATEGORIES = ["alpha", "beta", "gamma", "delta"]
+SCENARIOS = ["ingest", "list", "list_deep", "summary", "process"]
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    requests: int
+    errors: int  # failed requests, including shed ones
+    shed: int  # 503s from admission control
+    db_queries_per_request: float  # from the Server-Timing header
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(q / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def db_queries(response: httpx.Response) -> int:
+    """Statements the request issued, from ``Server-Timing: db;...;desc="N queries"``."""
+    timing = response.headers.get("server-timing", "")
+    if 'desc="' not in timing:
+        return 0
+    return int(timing.split('desc="', 1)[1].split()[0])
+
+
+def _record_payload(i: int) -> dict[str, object]:
+    return {
+        "source": "loadgen",
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "payload": {"n": i, "priority": i % 5},
+    }
+
+
+async def create_records(client: httpx.AsyncClient, count: int, concurrency: int) -> list[str]:
+    ids: list[str] = []
+
+    async def create(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        r = await c.post("/records", json=_record_payload(i))
+        if r.status_code == 201:
+            ids.append(r.json()["id"])
+        return r
+
+    await run_requests(client, create, count, concurrency)
+    return ids
+
+
+async def run_requests(
+    client: httpx.AsyncClient, request: Request, count: int, concurrency: int
+) -> tuple[list[float], Counter[int], int, float]:
+    """Issue ``count`` requests from ``concurrency`` workers.
+
+    Returns latencies (ms), response status counts (0 for transport errors), the total of
+    DB statements reported by the responses and wall time.
+    """
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    queries = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index, queries
+        while next_index < count:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await request(client, i)
+                status = response.status_code
+                queries += db_queries(response)
+            except httpx.HTTPError:
+                status = 0
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, queries, time.perf_counter() - started
+
+
+async def scenario_request(
+    client: httpx.AsyncClient, scenario: str, count: int, concurrency: int, seed: int
+) -> Request:
+    """Build the request function for ``scenario``, creating the records it needs first."""
+    rng = random.Random(seed)
+    if scenario == "ingest":
+        return lambda c, i: c.post("/records", json=_record_payload(i))
+    if scenario == "list":
+        return lambda c, i: c.get("/records", params={"limit": 50})
+    if scenario == "list_deep":
+        total = (await client.get("/records", params={"limit": 1})).json()["total"]
+        offset = max(total - 100, 0)
+        return lambda c, i: c.get("/records", params={"limit": 50, "offset": offset})
+    if scenario == "summary":
+        return lambda c, i: c.get("/reports/summary", params={"category": rng.choice(CATEGORIES)})
+    if scenario == "process":
+        ids = await create_records(client, count, concurrency)
+        return lambda c, i: c.post(f"/records/{ids[i % len(ids)]}/process")
+    raise ValueError(f"unknown scenario: {scenario}")
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: str, count: int, concurrency: int, seed: int = 0
+) -> ScenarioResult:
+    request = await scenario_request(client, scenario, count, concurrency, seed)
+    latencies, statuses, queries, duration = await run_requests(client, request, count, concurrency)
+    return ScenarioResult(
+        scenario=scenario,
+        requests=len(latencies),
+        errors=sum(n for status, n in statuses.items() if status == 0 or status >= 400),
+        shed=statuses[503],
+        db_queries_per_request=round(queries / len(latencies), 2) if latencies else 0.0,
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 1) if duration else 0.0,
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(
+    database_url: str | None = None, workers: int = 1, server_logs: bool = False
+) -> Iterator[str]:
+    """Run the app under uvicorn on a free port; yields its base URL.
+
+    Without ``database_url`` a fresh SQLite file in a temporary directory is used. Tables
+    are created from the models (benchmark databases are not migrated).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url = database_url or f"sqlite:///{Path(tmp) / 'loadgen.db'}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": url,
+            "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.getenv("PYTHONPATH")])),
+        }
+        # dev mode: no API keys, so per-key write limits do not skew the numbers
+        env.pop("API_KEY", None)
+        env.pop("API_KEYS_FILE", None)
+        # the SQLite pragmas are opt-in; measure the tuned setup the baseline was recorded with
+        env.setdefault("SQLITE_TUNED", "true")
+        if workers > 1:
+            metrics_dir = Path(tmp) / "metrics"
+            metrics_dir.mkdir()
+            env["PROMETHEUS_MULTIPROC_DIR"] = str(metrics_dir)
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "--factory",
+                "workflow_service.app.main:create_app",
+                "--port",
+                str(port),
+                "--workers",
+                str(workers),
+                "--no-access-log",
+                "--log-level",
+                "warning",
+            ],
+            env=env,
+            cwd=REPO_ROOT,
+            stdout=None if server_logs else subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_live(base_url, server)
+            yield base_url
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def _wait_until_live(base_url: str, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not become live within {timeout}s")
+
+
+async def run_all(
+    base_url: str, scenarios: list[str], count: int, concurrency: int, seed: int = 0
+) -> list[ScenarioResult]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # warm up connections, caches and compiled statements before measuring
+        await run_requests(client, lambda c, i: c.get("/records"), concurrency, concurrency)
+        return [
+            await run_scenario(client, scenario, count, concurrency, seed) for scenario in scenarios
+        ]
+
+
+def format_table(results: list[ScenarioResult]) -> str:
+    lines = [
+        f"{'scenario':<11} {'requests':>8} {'errors':>6} {'shed':>6} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.scenario:<11} {r.requests:>8} {r.errors:>6} {r.shed:>6} {r.throughput_rps:>9.1f} "
+            f"{r.p50_ms:>8.2f} {r.p95_ms:>8.2f} {r.p99_ms:>8.2f} {r.db_queries_per_request:>7.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="target a running server instead of starting one")
+    parser.add_argument("--database-url", help="database for the started server (default: SQLite)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    # above the admission capacity (pool size + overflow) requests are shed with 503
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="also write the results here")
+    parser.add_argument("--server-logs", action="store_true", help="show the server's log lines")
+    args = parser.parse_args()
+
+    def run(base_url: str) -> list[ScenarioResult]:
+        return asyncio.run(
+            run_all(base_url, args.scenarios, args.requests, args.concurrency, args.seed)
+        )
+
+    if args.url:
+        results = run(args.url)
+    else:
+        with local_server(args.database_url, args.workers, args.server_logs) as base_url:
+            results = run(base_url)
+
+    print(format_table(results))
+    if args.json_path:
+        Path(args.json_path).write_text(
+            json.dumps([asdict(r) for r in results], indent=2) + "\n", encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
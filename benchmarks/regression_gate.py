@@ -0,0 +1,205 @@
+"""Benchmark regression gate: compare a fixed scenario set against a committed baseline.
+
+Seeds a fresh SQLite database with ``generate_records`` (fixed seed), starts the app with
+``loadgen.local_server`` and runs the gate scenarios ``--repeat`` times, keeping the median
+of each metric:
+
+- ``ingest``: ``POST /records``
+- ``list_deep``: ``GET /records`` near the last page (offset pagination)
+- ``summary``: ``GET /reports/summary``
+- ``process``: ``POST /records/{id}/process``
+
+Each metric is compared with ``benchmarks/baseline.json`` within its tolerance band:
+latency may rise and throughput may drop by the baseline's relative tolerance, while the
+DB statements per request are compared almost exactly, so an extra query in a handler
+fails the gate on any machine. Any failed or shed request is a regression as well. The
+exit status is 1 on regressions and a diff table is printed either way.
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/regression_gate.py
+    PYTHONPATH=. python benchmarks/regression_gate.py --update-baseline  # after intended changes
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from generate_records import Choice, RecordGenerator, write_sqlite
+from loadgen import ScenarioResult, local_server, run_all
+from sqlalchemy import create_engine
+
+from workflow_service.app.models import Base
+
+GATE_SCENARIOS = ["ingest", "list_deep", "summary", "process"]
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# metric -> True when higher values are better
+METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "db_queries_per_request": False,
+}
+DEFAULT_TOLERANCES = {
+    "throughput_rps": 0.25,
+    "p50_ms": 0.30,
+    "p95_ms": 0.50,
+    "db_queries_per_request": 0.01,
+}
+DEFAULT_CONFIG = {"rows": 20000, "requests": 500, "concurrency": 4, "repeat": 3, "seed": 0}
+
+
+@dataclass
+class Comparison:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    tolerance: float
+    higher_is_better: bool
+
+    @property
+    def change(self) -> float:
+        if not self.baseline:
+            return 0.0 if not self.current else float("inf")
+        return (self.current - self.baseline) / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        change = -self.change if self.higher_is_better else self.change
+        return change > self.tolerance
+
+    @property
+    def improved(self) -> bool:
+        change = self.change if self.higher_is_better else -self.change
+        return change > self.tolerance
+
+
+def seed_database(url: str, rows: int, seed: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    generator = RecordGenerator(
+        rows=rows,
+        seed=seed,
+        start=datetime(2024, 1, 1),
+        days=365,
+        categories=Choice.parse("zipf:50:1.1", "category"),
+        sources=Choice.parse("api:6,batch:3,import:1", "source"),
+        statuses=Choice.parse("pending:1,processed:8,failed:1", "status"),
+        payload_bytes=256,
+    )
+    write_sqlite(engine, generator.rows_iter(), batch_size=50_000)
+    engine.dispose()
+
+
+def run_gate_scenarios(config: dict[str, int]) -> dict[str, dict[str, float]]:
+    """Median of each metric over ``config["repeat"]`` runs, on a freshly seeded database."""
+    runs: list[list[ScenarioResult]] = []
+    for _ in range(config["repeat"]):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'gate.db'}"
+            seed_database(url, config["rows"], config["seed"])
+            with local_server(url) as base_url:
+                runs.append(
+                    asyncio.run(
+                        run_all(
+                            base_url,
+                            GATE_SCENARIOS,
+                            config["requests"],
+                            config["concurrency"],
+                            config["seed"],
+                        )
+                    )
+                )
+    print(file=sys.stderr)
+
+    results: dict[str, dict[str, float]] = {}
+    for index, scenario in enumerate(GATE_SCENARIOS):
+        samples = [asdict(run[index]) for run in runs]
+        results[scenario] = {
+            metric: round(statistics.median(sample[metric] for sample in samples), 2)
+            for metric in METRICS
+        }
+        results[scenario]["errors"] = max(sample["errors"] for sample in samples)
+    return results
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    tolerances: dict[str, float],
+) -> list[Comparison]:
+    return [
+        Comparison(
+            scenario=scenario,
+            metric=metric,
+            baseline=baseline[scenario][metric],
+            current=current[scenario][metric],
+            tolerance=tolerances.get(metric, DEFAULT_TOLERANCES[metric]),
+            higher_is_better=higher_is_better,
+        )
+        for scenario in GATE_SCENARIOS
+        if scenario in baseline
+        for metric, higher_is_better in METRICS.items()
+    ]
+
+
+def format_diff(comparisons: list[Comparison]) -> str:
+    lines = [
+        f"{'scenario':<10} {'metric':<23} {'baseline':>10} {'current':>10} "
+        f"{'change':>8} {'band':>7}  result",
+    ]
+    for c in comparisons:
+        result = "REGRESSION" if c.regressed else "improved" if c.improved else "ok"
+        lines.append(
+            f"{c.scenario:<10} {c.metric:<23} {c.baseline:>10.2f} {c.current:>10.2f} "
+            f"{c.change:>+8.1%} {c.tolerance:>7.0%}  {result}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="write the current results as baseline"
+    )
+    for key, value in DEFAULT_CONFIG.items():
+        parser.add_argument(f"--{key}", type=int, help=f"default: baseline's, else {value}")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    # run with the baseline's configuration unless overridden, so results are comparable
+    config = {**DEFAULT_CONFIG, **(baseline or {}).get("config", {})}
+    config.update({key: getattr(args, key) for key in DEFAULT_CONFIG if getattr(args, key)})
+    current = run_gate_scenarios(config)
+
+    if args.update_baseline or baseline is None:
+        tolerances = (baseline or {}).get("tolerances", DEFAULT_TOLERANCES)
+        document = {"config": config, "tolerances": tolerances, "scenarios": current}
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    comparisons = compare(baseline["scenarios"], current, baseline.get("tolerances", {}))
+    print(format_diff(comparisons))
+    failed = [c for c in comparisons if c.regressed]
+    errored = [scenario for scenario, metrics in current.items() if metrics["errors"]]
+    for scenario in errored:
+        print(f"{scenario}: {current[scenario]['errors']} failed or shed requests")
+    if failed or errored:
+        print(f"\n{len(failed)} regression(s) beyond tolerance")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Microbenchmarks of the hot service functions (pytest-benchmark).
+
+Usage (from the repository root):
+    PYTHONPATH=. python -m pytest benchmarks/test_microbenchmarks.py --benchmark-only
+    BENCH_ROWS=100000 PYTHONPATH=. python -m pytest benchmarks/test_microbenchmarks.py \\
+        --benchmark-only --benchmark-json=micro.json
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from workflow_service.app.api.records import _to_read_model
+from workflow_service.app.models.record import Record
+from workflow_service.app.services import processing, reporting
+
+
+def test_to_read_model(benchmark, db):
+    rec = db.execute(select(Record).limit(1)).scalar_one()
+    model = benchmark(_to_read_model, rec)
+    assert model.id == rec.id
+
+
+def test_get_records_first_page(benchmark, db):
+    items, total = benchmark(reporting.get_records, db, limit=50)
+    assert len(items) == 50 and total > 0
+
+
+def test_get_records_filtered(benchmark, db):
+    items, _ = benchmark(reporting.get_records, db, status="processed", category="beta", limit=50)
+    assert all(rec.category == "beta" for rec in items)
+
+
+def test_get_records_deep_offset(benchmark, db):
+    total = db.execute(select(Record.id)).all()
+    offset = max(len(total) - 100, 0)
+    items, _ = benchmark(reporting.get_records, db, limit=50, offset=offset)
+    assert items
+
+
+def test_get_records_cursor(benchmark, db):
+    # the same deep page, reached with a keyset cursor instead of an offset
+    last = db.execute(
+        select(Record.created_at, Record.id)
+        .order_by(Record.created_at.asc(), Record.id.asc())
+        .offset(100)
+        .limit(1)
+    ).one()
+    items, _ = benchmark(reporting.get_records, db, limit=50, after=(last.created_at, last.id))
+    assert items
+
+
+def test_get_summary(benchmark, db):
+    summary = benchmark(reporting.get_summary, db)
+    assert summary["totals"]["all"] > 0
+
+
+def test_get_summary_filtered(benchmark, db):
+    summary = benchmark(
+        reporting.get_summary,
+        db,
+        category="alpha",
+        date_from=datetime(2024, 1, 1),
+        date_to=datetime(2030, 1, 1),
+    )
+    assert summary["by_category"][0]["category"] == "alpha"
+
+
+def test_process_record(benchmark, processing_sessions):
+    def pending_record():
+        with processing_sessions() as session:
+            rec = Record(source="bench", category="alpha", payload={"priority": 1})
+            session.add(rec)
+            session.commit()
+            return (rec.id,), {}
+
+    benchmark.pedantic(processing.process_record, setup=pending_record, rounds=200)
@@ -0,0 +1,158 @@
+"""Tests for per-route-class admission control of DB-bound requests."""
+
+import importlib
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.core import admission  # noqa: E402
+from workflow_service.app.core.admission import AdmissionController  # noqa: E402
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.services.notifications import record_notifier  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+client = TestClient(app)
+
+SHARES = {"ingest": 1.0, "read": 0.75, "report": 0.5}
+
+
+def test_lower_priority_classes_are_shed_first():
+    controller = AdmissionController(capacity=4, shares=SHARES)
+    assert controller.limits == {"ingest": 4, "read": 3, "report": 2}
+
+    assert controller.try_acquire("report")
+    assert controller.try_acquire("read")
+    # two in flight: reports are at their share, reads and ingest still admitted
+    assert not controller.try_acquire("report")
+    assert controller.try_acquire("read")
+    assert not controller.try_acquire("read")
+    assert controller.try_acquire("ingest")
+    assert not controller.try_acquire("ingest")
+
+    controller.release("read")
+    controller.release("read")
+    controller.release("ingest")
+    assert controller.try_acquire("report")
+    assert controller.snapshot()["in_flight"] == {"ingest": 0, "read": 0, "report": 2}
+
+
+def test_saturated_class_fails_fast_with_503(monkeypatch):
+    controller = AdmissionController(capacity=4, shares=SHARES, retry_after=2)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    # two slow reads in flight: reports are shed, ingest and health still go through
+    assert controller.try_acquire("read") and controller.try_acquire("read")
+
+    r = client.get("/reports/summary")
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "2"
+    body = r.json()
+    assert body["error"]["code"] == "SERVICE_UNAVAILABLE"
+    assert body["request_id"] == r.headers["x-request-id"]
+
+    payload = {"source": "admission", "category": "c", "payload": {}}
+    assert client.post("/records", json=payload).status_code == 201
+    assert client.get("/health").status_code == 200
+
+    # slots taken by requests are returned, rejected or not
+    assert controller.total == 2
+
+
+@pytest.fixture
+def pooled(tmp_path, monkeypatch):
+    """A file database: its QueuePool counts checked-out connections."""
+    pooled_engine = create_engine(f"sqlite:///{tmp_path / 'admission.db'}", pool_size=2)
+    models_record.Record.__table__.metadata.create_all(bind=pooled_engine)
+    factory = sessionmaker(bind=pooled_engine)
+
+    def pooled_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, pooled_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", factory)
+    yield pooled_engine
+    pooled_engine.dispose()
+
+
+def test_connections_are_returned_before_the_slot(pooled, monkeypatch):
+    controller = AdmissionController(capacity=4, shares=SHARES)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    slots_at_checkin = []
+    event.listen(pooled, "checkin", lambda *args: slots_at_checkin.append(controller.total))
+
+    payload = {"source": "admission", "category": "c", "payload": {}}
+    rid = client.post("/records", json=payload).json()["id"]
+    assert client.get("/records").status_code == 200
+    assert client.get(f"/records/{rid}").status_code == 200
+    assert client.get("/reports/summary").status_code == 200
+
+    # every connection went back to the pool while its request still held a slot
+    assert slots_at_checkin and min(slots_at_checkin) >= 1
+    assert controller.total == 0
+
+
+def test_long_poll_waiter_holds_neither_slot_nor_connection(pooled, monkeypatch):
+    controller = AdmissionController(capacity=4, shares=SHARES)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    payload = {"source": "admission", "category": "c", "payload": {"priority": 1}}
+    rid = client.post("/records", json=payload).json()["id"]
+    result = {}
+
+    def _poll():
+        result["response"] = client.get(f"/records/{rid}?wait=5s")
+
+    poller = threading.Thread(target=_poll)
+    poller.start()
+    deadline = time.monotonic() + 2
+    while record_notifier.waiter_count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.2)  # past the first read
+    assert record_notifier.waiter_count() == 1
+    assert controller.total == 0
+    assert pooled.pool.checkedout() == 0
+
+    assert client.post(f"/records/{rid}/process").status_code == 200
+    poller.join(timeout=5)
+    assert result["response"].json()["status"] == "processed"
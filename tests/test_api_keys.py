@@ -0,0 +1,144 @@
+"""Tests for hashed API keys loaded from a key file and their per-key write limits."""
+
+import importlib
+import json
+import os
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.config import Settings  # noqa: E402
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+security_module = importlib.import_module("workflow_service.app.core.security")
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+client = TestClient(app)
+
+PAYLOAD = {"source": "keys", "category": "c", "payload": {"x": 1}}
+
+
+def _write_keys(path, *entries):
+    keys = [
+        {"id": key_id, "sha256": security_module.hash_api_key(secret), **limits}
+        for key_id, secret, limits in entries
+    ]
+    path.write_text(json.dumps({"keys": keys}))
+
+
+@pytest.fixture
+def key_file(tmp_path, monkeypatch):
+    path = tmp_path / "api_keys.json"
+    _write_keys(
+        path,
+        ("noisy", "noisy-secret", {"rate_per_second": 0.01, "burst": 2}),
+        ("quiet", "quiet-secret", {}),
+    )
+    config = Settings(API_KEY=None, API_KEYS_FILE=str(path), API_KEYS_RELOAD_SECONDS=0)
+    store = security_module.ApiKeyStore(config)
+    monkeypatch.setattr(security_module, "key_store", store)
+    return path
+
+
+def test_keys_are_matched_by_hash(key_file):
+    store = security_module.key_store
+    assert "noisy-secret" not in key_file.read_text()
+    assert store.lookup("noisy-secret").key_id == "noisy"
+    assert store.lookup("quiet-secret").key_id == "quiet"
+    assert store.lookup("unknown") is None
+
+    r = client.post("/records", json=PAYLOAD, headers={"X-API-Key": "unknown"})
+    assert r.status_code == 401
+    assert r.headers["www-authenticate"] == "ApiKey"
+
+
+def test_key_file_is_hot_reloaded(key_file):
+    store = security_module.key_store
+    assert store.lookup("rotated-secret") is None
+
+    _write_keys(key_file, ("quiet", "rotated-secret", {}))
+    mtime = os.stat(key_file).st_mtime + 1
+    os.utime(key_file, (mtime, mtime))
+
+    assert store.lookup("rotated-secret").key_id == "quiet"
+    assert store.lookup("quiet-secret") is None
+
+
+def test_rate_limit_applies_per_key(key_file):
+    noisy = {"X-API-Key": "noisy-secret"}
+    for _ in range(2):
+        assert client.post("/records", json=PAYLOAD, headers=noisy).status_code == 201
+
+    r = client.post("/records", json=PAYLOAD, headers=noisy)
+    assert r.status_code == 429
+    assert r.json()["error"]["code"] == "RATE_LIMITED"
+    assert int(r.headers["retry-after"]) >= 1
+
+    # other producers are unaffected
+    r = client.post("/records", json=PAYLOAD, headers={"X-API-Key": "quiet-secret"})
+    assert r.status_code == 201
+
+
+def test_concurrency_limit_releases_on_completion():
+    api_key = security_module.ApiKey(key_id="k", key_hash="h", max_concurrency=1)
+    first = security_module.enforce_write_limits(api_key)
+    assert next(first) is api_key
+
+    with pytest.raises(HTTPException) as exc:
+        next(security_module.enforce_write_limits(api_key))
+    assert exc.value.status_code == 429
+
+    first.close()
+    assert api_key.concurrency.in_flight == 0
+    second = security_module.enforce_write_limits(api_key)
+    assert next(second) is api_key
+    second.close()
+
+
+def test_default_limits_leave_legacy_keys_unthrottled():
+    store = security_module.ApiKeyStore(Settings(API_KEY="legacy-secret", API_KEYS_FILE=None))
+    legacy = store.lookup("legacy-secret")
+    assert legacy.key_id == "default"
+    assert legacy.bucket is None and legacy.concurrency is None
+
+    # a rate without a burst gets one second's worth
+    rated = store._key_from({"id": "r", "sha256": "00", "rate_per_second": 2.5})
+    assert rated.bucket.burst == 3
@@ -0,0 +1,201 @@
+"""Tests for the app factory: lazy database setup and the startup warmup."""
+
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.orm import sessionmaker
+
+db_module = importlib.import_module("workflow_service.app.database")
+config_module = importlib.import_module("workflow_service.app.config")
+main_module = importlib.import_module("workflow_service.app.main")
+warmup_module = importlib.import_module("workflow_service.app.core.warmup")
+
+from workflow_service.app.core import (  # noqa: E402
+    admission,
+    profiling,
+    readiness,
+    security,
+    sql_instrumentation,
+)
+from workflow_service.app.models import Base, Record  # noqa: E402
+from workflow_service.app.services import outbox, record_cache, reporting  # noqa: E402
+from workflow_service.app.utils import log_sampling  # noqa: E402
+
+
+@pytest.fixture
+def restore_app_state():
+    """Put back the engine and session factory the other test modules installed, and the
+    per-worker singletons configured from the environment's settings."""
+    names = ("_config", *db_module._LAZY)
+    saved = {name: vars(db_module)[name] for name in names if name in vars(db_module)}
+    yield
+    for name in names:
+        vars(db_module).pop(name, None)
+    vars(db_module).update(saved)
+    settings = config_module.settings
+    sql_instrumentation.install(settings)
+    for module in (admission, security, record_cache, outbox, readiness, profiling, log_sampling):
+        module.configure(settings)
+
+
+def _config(tmp_path, **overrides):
+    return config_module.Settings(
+        DATABASE_URL=f"sqlite:///{tmp_path / 'factory.db'}", DB_POOL_SIZE=3, **overrides
+    )
+
+
+def test_create_app_builds_the_engine_on_first_use(tmp_path, restore_app_state):
+    config = _config(tmp_path)
+    app = main_module.create_app(config)
+
+    assert app.state.settings is config
+    assert "engine" not in vars(db_module)
+    assert "SessionLocal" not in vars(db_module)
+
+    engine = db_module.get_engine()
+    assert str(engine.url) == config.DATABASE_URL
+    # the one session factory is bound to that engine and reused
+    assert db_module.SessionLocal.kw["bind"] is engine
+    assert db_module.get_session_factory() is db_module.SessionLocal
+    engine.dispose()
+
+
+def test_create_app_configures_the_worker_singletons(tmp_path, restore_app_state):
+    config = _config(
+        tmp_path,
+        ADMISSION_MAX_IN_FLIGHT=7,
+        API_KEY="factory-key",
+        RECORD_CACHE_MAX_ENTRIES=3,
+        HEALTH_CHECK_INTERVAL_SECONDS=2.5,
+        PROFILE_STORE_SIZE=4,
+        LOG_SAMPLE_RATE=0.5,
+        SQL_QUERY_BUDGET=3,
+        WEBHOOK_ENDPOINTS={"factory": "http://hooks.test/factory"},
+    )
+    main_module.create_app(config)
+
+    assert admission.admission_controller.capacity == 7 - config.ADMISSION_RESERVED
+    assert security.key_store.config is config
+    assert not security.key_store.open_access
+    assert record_cache.record_cache.max_entries == 3
+    assert readiness.readiness_monitor.interval == 2.5
+    assert profiling.profile_store.max_entries == 4
+    assert log_sampling.request_log_sampler.sample_rate == 0.5
+    assert sql_instrumentation.query_budget_for("/records") == 3
+    assert outbox._config is config
+
+
+def test_route_handlers_read_the_factory_settings(tmp_path, restore_app_state):
+    app = main_module.create_app(
+        _config(tmp_path, WARMUP_ENABLED=False, DEDUP_ENABLED=True, BATCH_GET_MAX_IDS=1)
+    )
+    engine = db_module.get_engine()
+    Base.metadata.create_all(bind=engine)
+    body = {"source": "factory", "category": "alpha", "payload": {"n": 1}}
+
+    with TestClient(app) as client:
+        created = client.post("/records", json=body)
+        resent = client.post("/records", json=body)
+        assert created.status_code == 201
+        assert resent.status_code == 200
+        assert resent.json()["id"] == created.json()["id"]
+
+        ids = [created.json()["id"], "missing"]
+        assert client.post("/records/batch-get", json={"ids": ids}).status_code == 400
+    engine.dispose()
+
+
+def test_importing_main_builds_no_app():
+    code = (
+        "import workflow_service.app.main as main\n"
+        "from workflow_service.app.utils import logging as app_logging\n"
+        "assert 'app' not in vars(main)\n"
+        "assert app_logging._listener is None\n"
+        "assert main.app is main.app\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[1])
+
+
+def test_startup_warmup_fills_the_pool_and_compiles_statements(tmp_path, restore_app_state):
+    app = main_module.create_app(_config(tmp_path))
+    engine = db_module.get_engine()
+    Base.metadata.create_all(bind=engine)
+    engine.pool.dispose()
+    engine.clear_compiled_cache()
+
+    with TestClient(app) as client:
+        # opened by the warmup; the readiness check may hold one of them right now
+        assert engine.pool.checkedin() + engine.pool.checkedout() == 3
+        assert len(engine._compiled_cache) > 0
+        assert client.get("/health/live").status_code == 200
+    engine.dispose()
+
+
+def test_warmup_can_be_disabled(tmp_path, restore_app_state):
+    app = main_module.create_app(_config(tmp_path, WARMUP_ENABLED=False))
+    engine = db_module.get_engine()
+    Base.metadata.create_all(bind=engine)
+    engine.pool.dispose()
+
+    with TestClient(app):
+        # only the readiness check's connection has been opened
+        assert engine.pool.checkedin() <= 1
+    engine.dispose()
+
+
+def test_warmup_failure_does_not_block_startup(tmp_path, restore_app_state, caplog):
+    config = _config(tmp_path)
+    main_module.create_app(config)
+    engine = db_module.get_engine()  # no tables: priming the statements fails
+
+    warmup_module.warm_up(engine, db_module.SessionLocal, config)
+
+    assert "warmup failed" in caplog.text
+    engine.dispose()
+
+
+def test_priming_reads_no_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'prime.db'}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Record(source="s", category="c", payload="{}"))
+        session.commit()
+    statements = []
+    event.listen(
+        engine, "after_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql)
+    )
+
+    warmup_module.prime_statements(sessionmaker(bind=engine))
+
+    aggregates = [sql for sql in statements if "count(" in sql.lower()]
+    assert len(aggregates) == 4  # list count, summary total, by status, by category
+    assert all(sql.endswith(" LIMIT 0") for sql in aggregates)
+    engine.dispose()
+
+
+def test_priming_compiles_the_unfiltered_route_statements(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'prime.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    warmup_module.prime_statements(session_factory)
+    cache_hits = []
+    event.listen(
+        engine,
+        "after_cursor_execute",
+        lambda conn, cursor, sql, params, context, many: cache_hits.append(
+            context.cache_hit == CACHE_HIT
+        ),
+    )
+
+    with session_factory() as db:
+        reporting.get_records(db)
+        reporting.get_summary(db)
+
+    assert cache_hits == [True] * 5
+    engine.dispose()
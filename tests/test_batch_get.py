@@ -0,0 +1,108 @@
+"""Tests for fetching many records by id (POST /records/batch-get)."""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.services.record_cache import record_cache  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+    record_cache.clear()
+
+
+client = TestClient(app)
+
+
+def _queries(response):
+    return int(response.headers["server-timing"].split('desc="')[1].split()[0])
+
+
+def _create(category="batch"):
+    body = {"source": "batch", "category": category, "payload": {"priority": 1}}
+    r = client.post("/records", json=body)
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_batch_get_returns_records_in_request_order_and_reports_missing():
+    ids = [_create(category=f"c{i}") for i in range(3)]
+    requested = [ids[2], "does-not-exist", ids[0], ids[2], ids[1]]
+
+    r = client.post("/records/batch-get", json={"ids": requested})
+    assert r.status_code == 200
+    body = r.json()
+    assert [item["id"] for item in body["items"]] == [ids[2], ids[0], ids[1]]
+    assert body["items"][0]["category"] == "c2"
+    assert body["items"][0]["payload"] == {"priority": 1}
+    assert body["missing"] == ["does-not-exist"]
+    # one IN query for all of them
+    assert _queries(r) == 1
+
+
+def test_batch_get_chunks_the_in_query(monkeypatch):
+    monkeypatch.setattr(app.state.settings, "BATCH_GET_CHUNK_SIZE", 2)
+    ids = [_create() for _ in range(5)]
+
+    r = client.post("/records/batch-get", json={"ids": ids})
+    assert r.status_code == 200
+    assert [item["id"] for item in r.json()["items"]] == ids
+    assert _queries(r) == 3
+
+
+def test_batch_get_serves_cached_records_without_queries():
+    ids = [_create() for _ in range(2)]
+    first = client.post("/records/batch-get", json={"ids": ids})
+    assert _queries(first) == 1
+
+    second = client.post("/records/batch-get", json={"ids": ids})
+    assert _queries(second) == 0
+    assert second.json() == first.json()
+    # the single-record endpoint shares the cache
+    assert _queries(client.get(f"/records/{ids[0]}")) == 0
+
+
+def test_batch_get_limits(monkeypatch):
+    monkeypatch.setattr(app.state.settings, "BATCH_GET_MAX_IDS", 2)
+    r = client.post("/records/batch-get", json={"ids": ["a", "b", "c"]})
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "BAD_REQUEST"
+
+    r = client.post("/records/batch-get", json={"ids": []})
+    assert r.status_code == 422
@@ -0,0 +1,152 @@
+"""Tests for the Server-Sent Events change feed (GET /records/changes)."""
+
+import importlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, literal
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.models import RecordChange  # noqa: E402
+
+changes_service = importlib.import_module("workflow_service.app.services.changes")
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+    # keep streams short so each request completes
+    monkeypatch.setattr(app.state.settings, "CHANGE_FEED_MAX_STREAM_SECONDS", 0.3)
+    monkeypatch.setattr(app.state.settings, "CHANGE_FEED_HEARTBEAT_SECONDS", 0.1)
+
+
+client = TestClient(app)
+
+
+def _events(response):
+    events = []
+    for block in response.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "data" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _create(category, payload=None, source="feed"):
+    body = {"source": source, "category": category, "payload": payload or {"priority": 1}}
+    r = client.post("/records", json=body)
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_change_feed_emits_create_and_transition_events():
+    ok = _create("feed-a")
+    bad = _create("feed-a", {"priority": "high"})
+    client.post(f"/records/{ok}/process")
+    client.post(f"/records/{bad}/process")
+
+    r = client.get("/records/changes?last_event_id=0&category=feed-a")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(r)
+    seqs = [seq for seq, _, _ in events]
+    assert seqs == sorted(seqs)
+    assert [(e, d["record_id"]) for _, e, d in events] == [
+        ("created", ok),
+        ("created", bad),
+        ("processed", ok),
+        ("failed", bad),
+    ]
+
+
+def test_change_feed_resumes_after_last_event_id():
+    _create("feed-b")
+    first = _events(client.get("/records/changes?last_event_id=0&category=feed-b"))
+    assert len(first) == 1
+
+    rid = _create("feed-b")
+    r = client.get("/records/changes?category=feed-b", headers={"Last-Event-ID": str(first[-1][0])})
+    resumed = _events(r)
+    assert [(e, d["record_id"]) for _, e, d in resumed] == [("created", rid)]
+
+
+def test_change_feed_filters_by_source():
+    _create("feed-c", source="s1")
+    other = _create("feed-c", source="s2")
+    events = _events(client.get("/records/changes?last_event_id=0&source=s2"))
+    assert [d["record_id"] for _, _, d in events] == [other]
+
+
+def test_change_feed_without_cursor_starts_at_head():
+    _create("feed-d")
+    r = client.get("/records/changes?category=feed-d")
+    assert r.status_code == 200
+    assert _events(r) == []
+    assert ": keep-alive" in r.text
+
+
+def test_change_committed_out_of_order_survives_resume(monkeypatch):
+    # On Postgres transaction 10 writes change B, transaction 11 writes the later change C
+    # and commits first; while 10 runs, the snapshot xmin (the commit horizon) stays at 10.
+    horizon = {"xmin": 10}
+    monkeypatch.setattr(changes_service, "txid_horizon", lambda: literal(horizon["xmin"]))
+    with SessionLocal() as db:
+        base = db.query(func.max(RecordChange.id)).scalar() or 0
+
+    def commit_change(offset, txid):
+        with SessionLocal() as db:
+            db.add(
+                RecordChange(
+                    id=base + offset,
+                    txid=txid,
+                    record_id=f"r{offset}",
+                    event="created",
+                    status="pending",
+                    source="feed",
+                    category="feed-e",
+                )
+            )
+            db.commit()
+
+    commit_change(1, txid=5)  # A
+    commit_change(3, txid=11)  # C
+    first = _events(client.get("/records/changes?last_event_id=0&category=feed-e"))
+    assert [seq for seq, _, _ in first] == [base + 1]  # C waits for 10 to finish
+
+    commit_change(2, txid=10)  # B
+    horizon["xmin"] = 12
+    r = client.get("/records/changes?category=feed-e", headers={"Last-Event-ID": str(base + 1)})
+    assert [seq for seq, _, _ in _events(r)] == [base + 2, base + 3]
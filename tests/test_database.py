@@ -0,0 +1,60 @@
+"""Tests for engine configuration: pool settings and SQLite connection pragmas."""
+
+import importlib
+
+from sqlalchemy import text
+
+db_module = importlib.import_module("workflow_service.app.database")
+config_module = importlib.import_module("workflow_service.app.config")
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_file_database_gets_tuned_pragmas_and_pool(tmp_path):
+    config = config_module.Settings(
+        SQLITE_TUNED=True, DB_POOL_SIZE=3, DB_MAX_OVERFLOW=1, SQLITE_BUSY_TIMEOUT_MS=1234
+    )
+    engine = db_module.build_engine(f"sqlite:///{tmp_path / 'tuned.db'}", config)
+    try:
+        with engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "wal"
+            assert _pragma(conn, "synchronous") == 1  # NORMAL
+            assert _pragma(conn, "busy_timeout") == 1234
+            assert _pragma(conn, "cache_size") == config.SQLITE_CACHE_SIZE
+            assert _pragma(conn, "mmap_size") == config.SQLITE_MMAP_SIZE
+        assert engine.pool.size() == 3
+        assert engine.pool._max_overflow == 1
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_is_left_untuned_by_default(tmp_path):
+    config = config_module.Settings()
+    assert db_module.sqlite_pragmas(f"sqlite:///{tmp_path / 'plain.db'}", config) == []
+    engine = db_module.build_engine(f"sqlite:///{tmp_path / 'plain.db'}", config)
+    try:
+        with engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "delete"
+            assert _pragma(conn, "synchronous") == 2  # FULL
+    finally:
+        engine.dispose()
+
+
+def test_in_memory_sqlite_skips_file_only_settings():
+    pragmas = db_module.sqlite_pragmas(
+        "sqlite:///:memory:", config_module.Settings(SQLITE_TUNED=True)
+    )
+    assert pragmas
+    assert not any("journal_mode" in p or "mmap_size" in p for p in pragmas)
+    assert "pool_size" not in db_module._get_engine_kwargs("sqlite:///:memory:")
+
+
+def test_postgres_pool_settings_come_from_config():
+    config = config_module.Settings(DB_POOL_SIZE=20, DB_MAX_OVERFLOW=5, DB_POOL_TIMEOUT=2.5)
+    kwargs = db_module._get_engine_kwargs("postgresql://u:p@db/app", config)
+    assert kwargs["pool_size"] == 20
+    assert kwargs["max_overflow"] == 5
+    assert kwargs["pool_timeout"] == 2.5
+    assert kwargs["pool_pre_ping"] is True
@@ -0,0 +1,103 @@
+"""Tests for content-hash deduplication on ingest (POST /records?dedup=true)."""
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.models import Record  # noqa: E402
+from workflow_service.app.services import dedup  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+client = TestClient(app)
+
+
+def _create(payload, category="dedup", **params):
+    body = {"source": "resender", "category": category, "payload": payload}
+    return client.post("/records", json=body, params=params)
+
+
+def test_identical_payloads_are_inserted_twice_by_default():
+    first, second = _create({"n": 1}), _create({"n": 1})
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] != second.json()["id"]
+
+
+def test_dedup_returns_the_existing_record():
+    first = _create({"a": 1, "b": [1, 2]}, dedup="true")
+    assert first.status_code == 201
+
+    # key order does not change the canonical payload
+    second = _create({"b": [1, 2], "a": 1}, dedup="true")
+    assert second.status_code == 200
+    assert second.headers["x-deduplicated"] == "true"
+    assert second.json()["id"] == first.json()["id"]
+
+    assert _create({"a": 1, "b": [1, 2]}, category="other", dedup="true").status_code == 201
+    assert _create({"a": 2, "b": [1, 2]}, dedup="true").status_code == 201
+
+
+def test_dedup_window(monkeypatch):
+    monkeypatch.setattr(app.state.settings, "DEDUP_WINDOW_SECONDS", 60)
+    first = _create({"window": True}, dedup="true").json()["id"]
+    with SessionLocal() as db:
+        rec = db.get(Record, first)
+        rec.created_at = datetime.utcnow() - timedelta(minutes=5)
+        db.commit()
+
+    second = _create({"window": True}, dedup="true")
+    assert second.status_code == 201
+    assert second.json()["id"] != first
+
+
+def test_dedup_setting_and_per_request_override(monkeypatch):
+    monkeypatch.setattr(app.state.settings, "DEDUP_ENABLED", True)
+    first = _create({"setting": 1}).json()["id"]
+    assert _create({"setting": 1}).json()["id"] == first
+    assert _create({"setting": 1}, dedup="false").json()["id"] != first
+
+
+def test_content_hash_is_stored_on_insert():
+    record_id = _create({"stored": 1}).json()["id"]
+    with SessionLocal() as db:
+        stored = db.get(Record, record_id).content_hash
+    assert stored == dedup.content_hash("resender", "dedup", {"stored": 1})
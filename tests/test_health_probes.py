@@ -0,0 +1,150 @@
+"""Tests for the split liveness/readiness probes."""
+
+import asyncio
+import importlib
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Import app and services
+from workflow_service.app.core import readiness  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_monitor(monkeypatch):
+    monkeypatch.setattr(db_module, "engine", engine)
+    monkeypatch.setattr(readiness.readiness_monitor, "last_check", None)
+
+
+client = TestClient(app)
+
+
+def _queries(response):
+    return response.headers["server-timing"].split('desc="')[1].split()[0]
+
+
+def test_live_does_not_touch_the_database():
+    r = client.get("/health/live")
+    assert r.status_code == 200
+    assert r.json() == {"status": "alive"}
+    assert _queries(r) == "0"
+
+
+def test_ready_reuses_the_cached_database_check():
+    first = client.get("/health/ready")
+    assert first.status_code == 200
+    body = first.json()
+    assert body["status"] == "ready"
+    assert body["database"]["status"] == "connected"
+    assert set(body["threadpool"]) == {"busy", "size", "waiting"}
+
+    second = client.get("/health/ready")
+    assert second.status_code == 200
+    assert _queries(second) == "0"
+
+
+def test_ready_fails_when_the_database_check_failed(monkeypatch):
+    failed = readiness.DatabaseCheck(
+        ok=False, checked_at=time.monotonic(), latency_ms=1.0, error="connection refused"
+    )
+    monkeypatch.setattr(readiness.readiness_monitor, "last_check", failed)
+
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.json()["reasons"] == ["database unavailable"]
+    assert r.json()["database"]["error"] == "connection refused"
+
+
+def test_ready_fails_when_the_pool_is_saturated(tmp_path, monkeypatch):
+    small = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0)
+    monkeypatch.setattr(db_module, "engine", small)
+    monkeypatch.setattr(readiness._config, "DB_MAX_OVERFLOW", 0)
+    assert client.get("/health/ready").status_code == 200
+
+    with small.connect():
+        r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.json()["reasons"] == ["connection pool saturated"]
+    assert r.json()["pool"] == {"checked_out": 1, "capacity": 1, "saturation": 1.0}
+    small.dispose()
+
+
+def test_saturated_pool_is_reported_without_waiting_for_a_connection(tmp_path, monkeypatch):
+    small = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0)
+    monkeypatch.setattr(db_module, "engine", small)
+    monkeypatch.setattr(readiness._config, "DB_MAX_OVERFLOW", 0)
+
+    with small.connect():
+        started = time.monotonic()
+        r = client.get("/health/ready")
+        # the inline check would have queued for the held connection (pool_timeout=30)
+        assert time.monotonic() - started < 2
+    assert r.status_code == 503
+    assert r.json()["reasons"] == ["connection pool saturated"]
+    assert r.json()["database"] is None
+    assert readiness.readiness_monitor.last_check is None
+    small.dispose()
+
+
+def test_slow_database_check_times_out(monkeypatch):
+    monkeypatch.setattr(readiness._config, "READY_CHECK_TIMEOUT_SECONDS", 0.05)
+
+    def slow_check(engine):
+        time.sleep(0.3)
+        return readiness.DatabaseCheck(ok=True, checked_at=time.monotonic(), latency_ms=300.0)
+
+    monkeypatch.setattr(readiness, "check_database", slow_check)
+    monitor = readiness.ReadinessMonitor(5.0)
+
+    async def probe():
+        check = await monitor.database_check(engine)
+        assert check.error == readiness.CHECK_TIMED_OUT
+        # the check keeps running; probes meanwhile share it instead of starting another
+        running = monitor._refreshing
+        assert monitor._refresh_task(engine) is running
+        await running
+        return monitor.last_check
+
+    assert asyncio.run(probe()).ok
+
+
+def test_failed_database_check_reports_a_generic_reason(tmp_path):
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+    check = readiness.check_database(broken)
+    assert not check.ok
+    assert check.error == readiness.CHECK_FAILED
+    broken.dispose()
+
+
+def test_ready_fails_with_a_request_backlog(monkeypatch):
+    monkeypatch.setattr(readiness._config, "READY_MAX_QUEUE_BACKLOG", -1)
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert "request queue backlog" in r.json()["reasons"]
+
+
+def test_background_refresh_runs_during_lifespan(monkeypatch):
+    monkeypatch.setattr(readiness.readiness_monitor, "interval", 0.05)
+    with TestClient(app):
+        deadline = time.monotonic() + 2
+        while readiness.readiness_monitor.last_check is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert readiness.readiness_monitor.last_check.ok
+    assert readiness.readiness_monitor._task is None
@@ -0,0 +1,23 @@
+"""Tests for time-ordered record ids."""
+
+import time
+import uuid
+
+from workflow_service.app.utils import ids
+
+
+def test_uuid7_layout_and_timestamp():
+    before = time.time_ns() // 1_000_000
+    value = ids.uuid7()
+    after = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert before <= ids.uuid7_timestamp_ms(value) <= after
+
+
+def test_ids_are_unique_and_sort_in_creation_order():
+    generated = [ids.new_record_id() for _ in range(20000)]
+    assert len(set(generated)) == len(generated)
+    assert generated == sorted(generated)
+    assert all(len(value) == 36 for value in generated)
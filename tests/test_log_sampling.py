@@ -0,0 +1,86 @@
+"""Tests for request log sampling."""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from workflow_service.app.utils.log_sampling import RequestLogSampler, request_log_sampler
+
+main_module = importlib.import_module("workflow_service.app.main")
+client = TestClient(main_module.app)
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    events = []
+    monkeypatch.setattr(main_module, "log_json", lambda obj, level="info": events.append(obj))
+    return events
+
+
+def test_errors_and_slow_requests_are_always_kept():
+    sampler = RequestLogSampler(sample_rate=0.0, slow_request_ms=500)
+    assert sampler.decide("/records", 404, 1) == 1.0
+    assert sampler.decide("/records", 500, 1) == 1.0
+    assert sampler.decide("/records", 200, 750) == 1.0
+    assert sampler.decide("/records", 200, 10) is None
+
+    stats = sampler.stats()
+    assert stats["kept_error"] == 2
+    assert stats["kept_slow"] == 1
+    assert stats["dropped"] == 1
+
+
+def test_sample_rate_and_route_overrides():
+    sampler = RequestLogSampler(
+        sample_rate=0.5,
+        route_sample_rates={"/health": 0.0, "/reports/summary": 1.0},
+        rng=lambda: 0.3,
+    )
+    assert sampler.sampling_enabled
+    assert sampler.decide("/records", 200, 1) == 0.5
+    assert sampler.decide("/health", 200, 1) is None
+    assert sampler.decide("/reports/summary", 200, 1) == 1.0
+
+    assert not RequestLogSampler().sampling_enabled
+
+
+def test_middleware_drops_sampled_out_requests_but_keeps_errors(monkeypatch, logged):
+    monkeypatch.setattr(request_log_sampler, "sample_rate", 0.0)
+
+    assert client.get("/version").status_code == 200
+    assert logged == []
+
+    assert client.get("/records/missing-id").status_code == 404
+    request_events = [e["event"] for e in logged if e["event"].startswith("request")]
+    assert request_events == ["request.start", "request.end"]
+
+
+def test_middleware_merges_start_and_end(monkeypatch, logged):
+    monkeypatch.setattr(request_log_sampler, "merge_start_end", True)
+
+    r = client.get("/version", headers={"X-Request-ID": "merged-1"})
+    assert r.status_code == 200
+    assert len(logged) == 1
+    line = logged[0]
+    assert line["event"] == "request"
+    assert (line["method"], line["path"], line["status_code"]) == ("GET", "/version", 200)
+    assert line["request_id"] == "merged-1"
+    assert "duration_ms" in line
+
+
+def test_route_override_applies_only_to_that_route(monkeypatch, logged):
+    monkeypatch.setattr(request_log_sampler, "route_sample_rates", {"/version": 0.0})
+    monkeypatch.setattr(request_log_sampler, "slow_request_ms", 10_000)
+
+    client.get("/version")
+    client.get("/logging/stats")
+    assert [e["path"] for e in logged if e["event"] == "request.end"] == ["/logging/stats"]
+
+
+def test_logging_stats_endpoint():
+    r = client.get("/logging/stats")
+    assert r.status_code == 200
+    data = r.json()
+    for key in ("kept_error", "kept_slow", "kept_sampled", "dropped", "sample_rate"):
+        assert key in data
@@ -0,0 +1,147 @@
+"""Tests for long-poll reads (GET /records/{id}?wait=...)."""
+
+import importlib
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.services.notifications import record_notifier  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+client = TestClient(app)
+
+
+def _create_pending(payload=None):
+    body = {"source": "t", "category": "poll", "payload": payload or {"priority": 1}}
+    r = client.post("/records", json=body)
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_wait_returns_when_record_transitions():
+    rid = _create_pending()
+    result = {}
+
+    def _poll():
+        result["response"] = client.get(f"/records/{rid}?wait=5s")
+
+    poller = threading.Thread(target=_poll)
+    started = time.monotonic()
+    poller.start()
+    time.sleep(0.2)
+    assert client.post(f"/records/{rid}/process").status_code == 200
+    poller.join(timeout=5)
+
+    assert not poller.is_alive()
+    assert time.monotonic() - started < 4
+    assert result["response"].status_code == 200
+    assert result["response"].json()["status"] == "processed"
+    assert record_notifier.waiter_count() == 0
+
+
+def test_wait_times_out_with_pending_record():
+    rid = _create_pending()
+    started = time.monotonic()
+    r = client.get(f"/records/{rid}?wait=300ms")
+    assert r.status_code == 200
+    assert r.json()["status"] == "pending"
+    assert time.monotonic() - started >= 0.25
+
+
+def test_waiting_request_holds_no_pooled_connection(tmp_path, monkeypatch):
+    # a file database gets a QueuePool, which counts checked-out connections
+    pooled = create_engine(f"sqlite:///{tmp_path / 'poll.db'}", pool_size=2, max_overflow=0)
+    models_record.Record.__table__.metadata.create_all(bind=pooled)
+    PooledSession = sessionmaker(bind=pooled)
+
+    def pooled_get_db():
+        db = PooledSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, pooled_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", PooledSession)
+    rid = _create_pending()
+    result = {}
+
+    def _poll():
+        result["response"] = client.get(f"/records/{rid}?wait=5s")
+
+    poller = threading.Thread(target=_poll)
+    poller.start()
+    deadline = time.monotonic() + 2
+    while record_notifier.waiter_count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.2)  # past the first read
+    assert record_notifier.waiter_count() == 1
+    assert pooled.pool.checkedout() == 0
+
+    assert client.post(f"/records/{rid}/process").status_code == 200
+    poller.join(timeout=5)
+    assert result["response"].json()["status"] == "processed"
+    assert pooled.pool.checkedout() == 0
+    pooled.dispose()
+
+
+def test_wait_returns_immediately_for_non_pending_record():
+    rid = _create_pending()
+    assert client.post(f"/records/{rid}/process").status_code == 200
+    started = time.monotonic()
+    r = client.get(f"/records/{rid}?wait=30s")
+    assert r.status_code == 200
+    assert r.json()["status"] == "processed"
+    assert time.monotonic() - started < 1
+
+
+def test_wait_invalid_duration():
+    rid = _create_pending()
+    r = client.get(f"/records/{rid}?wait=soon")
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "BAD_REQUEST"
+
+
+def test_wait_missing_record_is_404():
+    r = client.get("/records/does-not-exist?wait=1s")
+    assert r.status_code == 404
@@ -0,0 +1,125 @@
+"""Tests for the Prometheus /metrics endpoint."""
+
+import importlib
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+client = TestClient(app)
+
+
+def _metric_lines(name):
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    return [line for line in r.text.splitlines() if line.startswith(name)]
+
+
+def test_metrics_exposes_request_counts_by_route_template():
+    client.get("/records/missing-1")
+    client.get("/records/missing-2")
+
+    lines = _metric_lines("http_requests_total{")
+    assert any('route="/records/{record_id}"' in line and 'status="404"' in line for line in lines)
+    assert not any("missing-1" in line for line in lines)
+    assert _metric_lines("http_request_duration_seconds_bucket{")
+
+
+def test_metrics_exposes_processing_outcomes():
+    ok = client.post("/records", json={"source": "m", "category": "metrics-cat", "payload": {}})
+    bad = client.post(
+        "/records", json={"source": "m", "category": "metrics-cat", "payload": {"priority": "x"}}
+    )
+    client.post(f"/records/{ok.json()['id']}/process")
+    client.post(f"/records/{bad.json()['id']}/process")
+
+    lines = _metric_lines("record_processing_total{")
+    for outcome in ("processed", "failed"):
+        assert any(
+            'category="metrics-cat"' in line and f'status="{outcome}"' in line for line in lines
+        )
+    assert _metric_lines("record_processing_duration_seconds_count")
+
+
+def test_metrics_pool_gauges_present():
+    assert _metric_lines("db_pool_checked_out_connections")
+    assert _metric_lines("db_pool_overflow_connections")
+
+
+def _cache_hits():
+    lines = _metric_lines('sql_compiled_cache_total{result="hit"}')
+    return float(lines[0].split()[-1]) if lines else 0.0
+
+
+def test_metrics_count_compiled_statement_cache_hits():
+    client.get("/records/cache-1")
+    before = _cache_hits()
+    # same statements with different parameters reuse the compiled SQL
+    client.get("/records/cache-2")
+    client.get("/reports/summary?category=cache-cat")
+    client.get("/reports/summary?category=other-cat")
+    assert _cache_hits() >= before + 4
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path):
+    """Samples written by separate processes are summed in multiprocess mode."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = textwrap.dedent("""
+        from workflow_service.app.core import metrics
+        metrics.observe_request("GET", "/records", 200, 0.02)
+        """)
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+    scrape = textwrap.dedent("""
+        from workflow_service.app.core import metrics
+        print(metrics.render_latest()[0].decode())
+        """)
+    out = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    assert 'http_requests_total{method="GET",route="/records",status="200"} 2.0' in out
@@ -134,3 +134,25 @@ def test_request_id_in_error_responses():
     data = r.json()
     assert "request_id" in data
     assert data["request_id"] is not None
+
+
+def test_request_logging_start_and_end_events(monkeypatch):
+    """Test that the request middleware logs correlated start/end events."""
+    main_module = importlib.import_module("workflow_service.app.main")
+    events = []
+    monkeypatch.setattr(main_module, "log_json", lambda obj, level="info": events.append(obj))
+
+    r = client.get("/version", headers={"X-Request-ID": "log-test-1"})
+    assert r.status_code == 200
+
+    start, end = (e for e in events if e["event"] in ("request.start", "request.end"))
+    assert start == {
+        "event": "request.start",
+        "method": "GET",
+        "path": "/version",
+        "request_id": "log-test-1",
+    }
+    assert end["event"] == "request.end"
+    assert end["status_code"] == 200
+    assert end["request_id"] == "log-test-1"
+    assert end["duration_ms"] >= 0
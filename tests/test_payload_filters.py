@@ -0,0 +1,164 @@
+"""Tests for filtering GET /records and GET /reports/summary on payload fields."""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db, get_read_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.models import Record  # noqa: E402
+from workflow_service.app.services import payload_filters, reporting  # noqa: E402
+
+# the index the migration creates for the default PAYLOAD_INDEXED_PATHS
+with engine.begin() as conn:
+    conn.execute(
+        text(
+            f"CREATE INDEX {payload_filters.index_name('priority')} "
+            f"ON records ({payload_filters.path_expression('sqlite', 'priority')})"
+        )
+    )
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_read_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(app.state.settings, "PAYLOAD_INDEXED_PATHS", ["priority", "owner.name"])
+    with SessionLocal() as db:
+        db.query(Record).delete()
+        db.commit()
+
+
+client = TestClient(app)
+
+
+def _create(payload, category="c"):
+    r = client.post("/records", json={"source": "s", "category": category, "payload": payload})
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def _ids(**params):
+    r = client.get("/records", params=params)
+    assert r.status_code == 200, r.text
+    return {item["id"] for item in r.json()["items"]}
+
+
+def test_parse_payload_filter():
+    parse = payload_filters.parse_payload_filter
+    assert parse("priority>=3") == payload_filters.PayloadFilter("priority", ">=", 3)
+    assert parse("owner.name=Alice") == payload_filters.PayloadFilter("owner.name", "=", "Alice")
+    assert parse('code="42"').value == "42"
+    assert parse("flag != true") == payload_filters.PayloadFilter("flag", "!=", True)
+    assert parse("gone=null").kind == "null"
+    for bad in ("priority", "=3", "a..b=1", "a=[1]", "a>true", "a<null", "a'--=1"):
+        with pytest.raises(ValueError):
+            parse(bad)
+
+
+def test_payloads_are_stored_as_json_objects():
+    record_id = _create({"priority": 2, "tags": ["a"]})
+    with engine.connect() as conn:
+        stored = conn.execute(
+            text("SELECT json_type(payload) FROM records WHERE id = :id"), {"id": record_id}
+        ).scalar_one()
+    assert stored == "object"
+    assert client.get(f"/records/{record_id}").json()["payload"] == {"priority": 2, "tags": ["a"]}
+
+
+def test_list_records_filters_on_payload_fields():
+    low = _create({"priority": 1, "owner": {"name": "Bob"}})
+    high = _create({"priority": 4, "owner": {"name": "Alice"}})
+    top = _create({"priority": 5, "owner": {"name": "Bob"}})
+    as_text = _create({"priority": "9"})
+    missing = _create({"other": 1})
+
+    assert _ids(payload="priority>=4") == {high, top}
+    assert _ids(payload="priority<4") == {low}
+    assert _ids(payload='priority="9"') == {as_text}
+    assert _ids(payload="owner.name=Bob") == {low, top}
+    assert _ids(payload=["owner.name=Bob", "priority>1"]) == {top}
+    assert _ids(payload="priority!=1") == {high, top, as_text}
+    assert _ids(payload="priority=null") == {missing}
+    assert _ids(payload="priority!=null") == {low, high, top, as_text}
+
+    r = client.get("/records", params={"payload": "priority>=4", "limit": 1})
+    assert r.json()["total"] == 2
+
+
+def test_summary_filters_on_payload_fields():
+    _create({"priority": 1}, category="a")
+    _create({"priority": 3}, category="a")
+    _create({"priority": 4}, category="b")
+
+    r = client.get("/reports/summary", params={"payload": "priority>=3"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["totals"]["all"] == 2
+    assert sorted((c["category"], c["count"]) for c in body["by_category"]) == [("a", 1), ("b", 1)]
+    assert body["filters"]["payload"] == ["priority>=3"]
+
+
+def test_filters_on_undeclared_paths_are_rejected(monkeypatch):
+    r = client.get("/records", params={"payload": "name=Alice"})
+    assert r.status_code == 400
+    assert "not indexed" in r.json()["error"]["message"]
+    assert client.get("/reports/summary", params={"payload": "name=Alice"}).status_code == 400
+    assert client.get("/records", params={"payload": "priority>"}).status_code == 400
+
+    too_many = ["priority>=1"] * (app.state.settings.PAYLOAD_FILTER_MAX + 1)
+    r = client.get("/records", params={"payload": too_many})
+    assert r.status_code == 400
+    assert "at most" in r.json()["error"]["message"]
+    assert client.get("/reports/summary", params={"payload": too_many}).status_code == 400
+
+    monkeypatch.setattr(app.state.settings, "PAYLOAD_FILTER_ALLOW_UNINDEXED", True)
+    record_id = _create({"name": "Alice"})
+    assert _ids(payload="name=Alice") == {record_id}
+
+
+def test_payload_filters_use_the_path_index():
+    with SessionLocal() as db:
+        shape, params = reporting._filter_params(
+            None, None, None, None, db, [payload_filters.parse_payload_filter("priority>=3")]
+        )
+    compiled = reporting._count_stmt(shape).compile(engine)
+    bound = compiled.construct_params(params)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(bound[name] for name in compiled.positiontup)
+        )
+        plan = " ".join(row[-1] for row in rows)
+    assert payload_filters.index_name("priority") in plan
@@ -0,0 +1,94 @@
+"""Tests for on-demand request profiling (X-Profile: 1)."""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+security_module = importlib.import_module("workflow_service.app.core.security")
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+
+
+client = TestClient(app)
+
+
+def test_profiled_request_stores_report_keyed_by_request_id():
+    r = client.get("/reports/summary", headers={"X-Profile": "1", "X-Request-ID": "prof-1"})
+    assert r.status_code == 200
+    assert r.headers["x-profile-id"] == "prof-1"
+
+    report = client.get("/debug/profiles/prof-1")
+    assert report.status_code == 200
+    # the sync endpoint and the service it calls were profiled in the worker thread
+    assert "get_summary_endpoint" in report.text
+    assert "reporting.py" in report.text
+
+    listing = client.get("/debug/profiles").json()["items"]
+    assert listing[0]["request_id"] == "prof-1"
+    assert listing[0]["path"] == "/reports/summary"
+    assert listing[0]["status_code"] == 200
+
+
+def test_requests_without_header_are_not_profiled():
+    r = client.get("/records", headers={"X-Request-ID": "not-profiled"})
+    assert r.status_code == 200
+    assert "x-profile-id" not in r.headers
+    assert client.get("/debug/profiles/not-profiled").status_code == 404
+
+
+def test_profiling_requires_api_key_when_configured(monkeypatch):
+    config = security_module.settings.model_copy(update={"API_KEY": "profile-key"})
+    monkeypatch.setattr(security_module, "key_store", security_module.ApiKeyStore(config))
+
+    r = client.get("/records", headers={"X-Profile": "1"})
+    assert r.status_code == 401
+    assert r.json()["error"]["code"] == "UNAUTHORIZED"
+
+    r = client.get(
+        "/records",
+        headers={"X-Profile": "1", "X-API-Key": "profile-key", "X-Request-ID": "prof-2"},
+    )
+    assert r.status_code == 200
+    assert r.headers["x-profile-id"] == "prof-2"
+
+    assert client.get("/debug/profiles/prof-2").status_code == 401
+    r = client.get("/debug/profiles/prof-2", headers={"X-API-Key": "profile-key"})
+    assert r.status_code == 200
+    assert "list_records" in r.text
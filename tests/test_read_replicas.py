@@ -0,0 +1,128 @@
+"""Tests for routing read-only endpoints to read replicas (READ_DATABASE_URL)."""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+Record = models_record.Record
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+
+
+def _replica(tmp_path, name):
+    """A file database standing in for a replica, holding one record tagged with its name."""
+    replica = db_module.build_engine(f"sqlite:///{tmp_path / name}.db")
+    models_record.Record.__table__.metadata.create_all(bind=replica)
+    with sessionmaker(bind=replica)() as session:
+        session.add(Record(id=f"{name}-rec", source=name, category="replica", payload="{}"))
+        session.commit()
+    return replica
+
+
+@pytest.fixture
+def replica_set(tmp_path, monkeypatch):
+    engines = [_replica(tmp_path, "r1"), _replica(tmp_path, "r2")]
+    replicas = db_module.ReplicaSet(engines, retry_seconds=60)
+    monkeypatch.setattr(db_module, "replicas", replicas)
+    yield replicas
+    for replica in engines:
+        replica.dispose()
+
+
+client = TestClient(app)
+
+
+def _sources():
+    return {item["source"] for item in client.get("/records").json()["items"]}
+
+
+def test_reads_round_robin_across_replicas_and_writes_go_to_primary(replica_set):
+    assert [_sources() for _ in range(4)] == [{"r1"}, {"r2"}, {"r1"}, {"r2"}]
+    assert client.get("/records/r1-rec").json()["source"] == "r1"
+    summary = client.get("/reports/summary").json()
+    assert summary["totals"]["all"] == 1
+    assert summary["by_category"] == [{"category": "replica", "count": 1}]
+
+    created = client.post("/records", json={"source": "primary", "category": "c", "payload": {}})
+    assert created.status_code == 201
+    with SessionLocal() as session:
+        assert session.get(Record, created.json()["id"]) is not None
+    assert "primary" not in _sources() | _sources()
+
+
+def test_unreachable_replica_is_skipped_then_primary_is_used(replica_set, tmp_path):
+    broken = db_module.build_engine(f"sqlite:///{tmp_path / 'missing' / 'r3.db'}")
+    replica_set.engines.append(broken)
+
+    seen = [_sources() for _ in range(6)]
+    assert broken not in replica_set.candidates()
+    assert all(s in ({"r1"}, {"r2"}) for s in seen)
+
+    for replica in replica_set.engines:
+        replica_set.mark_down(replica)
+    with SessionLocal() as session:
+        session.add(Record(source="primary", category="c", payload="{}"))
+        session.commit()
+    assert "primary" in _sources()
+
+
+def test_without_replicas_reads_use_the_primary():
+    assert db_module.replicas.candidates() == []
+    with SessionLocal() as session:
+        session.add(Record(id="primary-only", source="primary", category="c", payload="{}"))
+        session.commit()
+    assert client.get("/records/primary-only").status_code == 200
+
+
+def test_cached_record_is_served_without_opening_a_replica_session(replica_set, monkeypatch):
+    replica_set.mark_down(replica_set.engines[0])
+    assert client.get("/records/r2-rec").status_code == 200  # fills the record cache
+    opened = []
+    open_replica_session = db_module._open_replica_session
+    monkeypatch.setattr(
+        db_module,
+        "_open_replica_session",
+        lambda: opened.append(1) or open_replica_session(),
+    )
+
+    assert client.get("/records/r2-rec").json()["source"] == "r2"
+    assert opened == []
+    assert client.get("/records").status_code == 200
+    assert opened == [1]
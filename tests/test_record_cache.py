@@ -0,0 +1,134 @@
+"""Tests for the in-process cache of serialized records behind GET /records/{id}."""
+
+import importlib
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.services.record_cache import RecordCache, record_cache  # noqa: E402
+
+Record = models_record.Record
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+client = TestClient(app)
+
+
+def _queries(response):
+    return int(response.headers["server-timing"].split('desc="')[1].split()[0])
+
+
+def _create(priority=1):
+    payload = {"source": "cache", "category": "c", "payload": {"priority": priority}}
+    r = client.post("/records", json=payload)
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_second_read_is_served_from_cache():
+    rid = _create()
+    first = client.get(f"/records/{rid}")
+    assert first.status_code == 200
+    assert _queries(first) >= 1
+
+    second = client.get(f"/records/{rid}")
+    assert second.status_code == 200
+    assert _queries(second) == 0
+    assert second.json() == first.json()
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_status_transition_invalidates_cached_record():
+    rid = _create()
+    assert client.get(f"/records/{rid}").json()["status"] == "pending"
+
+    assert client.post(f"/records/{rid}/process").status_code == 200
+
+    r = client.get(f"/records/{rid}")
+    assert r.json()["status"] == "processed"
+    assert _queries(r) >= 1
+
+
+def test_unknown_records_are_not_cached():
+    assert client.get("/records/no-such-record").status_code == 404
+    assert client.get("/records/no-such-record").status_code == 404
+    assert record_cache.get("no-such-record") is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache = RecordCache(max_entries=2, ttl_seconds=60)
+    for rid in ("a", "b"):
+        cache.set(rid, rid.encode(), cache.fill_token())
+    assert cache.get("a") == b"a"  # "b" is now least recently used
+    cache.set("c", b"c", cache.fill_token())
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a"
+    assert cache.get("c") == b"c"
+
+
+def test_entries_expire_after_ttl():
+    cache = RecordCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", b"a", cache.fill_token())
+    assert cache.get("a") == b"a"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_fill_started_before_invalidation_is_dropped():
+    cache = RecordCache(max_entries=10, ttl_seconds=60)
+    token = cache.fill_token()  # reader starts loading the old row
+    cache.invalidate("a")  # writer commits and invalidates
+    assert cache.set("a", b"old", token) is False
+    assert cache.get("a") is None
+    assert cache.set("a", b"new", cache.fill_token()) is True
+
+
+def test_hit_and_miss_metrics():
+    rid = _create()
+    client.get(f"/records/{rid}")
+    client.get(f"/records/{rid}")
+    lines = client.get("/metrics").text.splitlines()
+    for result in ("hit", "miss"):
+        assert any(
+            line.startswith(f'record_cache_requests_total{{result="{result}"}}') for line in lines
+        )
+    assert any(line.startswith("record_cache_entries") for line in lines)
@@ -0,0 +1,146 @@
+"""Tests for the bulk requeue admin operation (POST /records/requeue)."""
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+from workflow_service.app.models import Record, RecordChange  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+    with SessionLocal() as db:
+        db.query(Record).delete()
+        db.query(RecordChange).delete()
+        db.commit()
+
+
+client = TestClient(app)
+
+
+def _failed(category="c", source="s", error="upstream timeout", priority=1, created_at=None):
+    body = {"source": source, "category": category, "payload": {"priority": priority}}
+    r = client.post("/records", json=body)
+    assert r.status_code == 201
+    record_id = r.json()["id"]
+    with SessionLocal() as db:
+        rec = db.get(Record, record_id)
+        rec.status, rec.error = "failed", error
+        if created_at is not None:
+            rec.created_at = created_at
+        db.commit()
+    return record_id
+
+
+def _statuses(ids):
+    with SessionLocal() as db:
+        rows = db.execute(select(Record.id, Record.status, Record.error).where(Record.id.in_(ids)))
+        return {row.id: (row.status, row.error) for row in rows}
+
+
+def test_requeue_resets_matching_failed_records():
+    hit = [_failed(category="billing", error="upstream timeout") for _ in range(2)]
+    other_error = _failed(category="billing", error="invalid priority")
+    other_category = _failed(category="crm", error="upstream timeout")
+
+    r = client.post("/records/requeue", json={"category": "billing", "error_contains": "timeout"})
+    assert r.status_code == 200
+    assert r.json() == {"requeued": 2, "batches": 1, "enqueued": 0}
+
+    statuses = _statuses([*hit, other_error, other_category])
+    assert all(statuses[i] == ("pending", None) for i in hit)
+    assert statuses[other_error][0] == statuses[other_category][0] == "failed"
+    with SessionLocal() as db:
+        events = db.execute(
+            select(RecordChange.record_id).where(RecordChange.event == "requeued")
+        ).scalars()
+        assert sorted(events) == sorted(hit)
+
+
+def test_requeue_runs_in_bounded_batches(monkeypatch):
+    monkeypatch.setattr(app.state.settings, "REQUEUE_BATCH_SIZE", 2)
+    ids = [_failed() for _ in range(5)]
+
+    r = client.post("/records/requeue", json={})
+    assert r.json() == {"requeued": 5, "batches": 3, "enqueued": 0}
+    assert {status for status, _ in _statuses(ids).values()} == {"pending"}
+
+
+def test_requeue_limit_and_date_range():
+    now = datetime.utcnow()
+    old = [_failed(created_at=now - timedelta(days=10)) for _ in range(3)]
+    recent = _failed(created_at=now)
+
+    r = client.post(
+        "/records/requeue",
+        json={"created_before": (now - timedelta(days=1)).isoformat() + "Z", "limit": 2},
+    )
+    assert r.json()["requeued"] == 2
+    statuses = _statuses([*old, recent])
+    assert sorted(status for status, _ in (statuses[i] for i in old)) == [
+        "failed",
+        "pending",
+        "pending",
+    ]
+    assert statuses[recent][0] == "failed"
+
+
+def test_requeue_can_enqueue_processing():
+    good = _failed(priority=1)
+    bad = _failed(priority="x")
+
+    r = client.post("/records/requeue", json={"process": True})
+    assert r.json() == {"requeued": 2, "batches": 1, "enqueued": 2}
+    # TestClient runs background tasks before returning
+    statuses = _statuses([good, bad])
+    assert statuses[good] == ("processed", None)
+    assert statuses[bad] == ("failed", "invalid priority")
+
+
+def test_requeue_invalidates_cached_records():
+    record_id = _failed()
+    assert client.get(f"/records/{record_id}").json()["status"] == "failed"
+
+    client.post("/records/requeue", json={})
+    assert client.get(f"/records/{record_id}").json()["status"] == "pending"
+
+
+def test_requeue_rejects_pending_as_source_status():
+    r = client.post("/records/requeue", json={"status": "pending"})
+    assert r.status_code == 422
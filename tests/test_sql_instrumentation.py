@@ -0,0 +1,135 @@
+"""Tests for per-request SQL instrumentation (query counts, Server-Timing, slow queries)."""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.core import sql_instrumentation  # noqa: E402
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+main_module = importlib.import_module("workflow_service.app.main")
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    events = []
+
+    def capture(obj, level="info"):
+        events.append(obj)
+
+    monkeypatch.setattr(main_module, "log_json", capture)
+    monkeypatch.setattr(sql_instrumentation, "log_json", capture)
+    return events
+
+
+client = TestClient(app)
+
+
+def test_request_end_and_server_timing_report_queries(logged):
+    r = client.get("/records")
+    assert r.status_code == 200
+    assert r.headers["server-timing"].startswith("db;dur=")
+
+    end = next(e for e in logged if e["event"] == "request.end")
+    assert end["db_queries"] >= 2  # count + page
+    assert f'desc="{end["db_queries"]} queries"' in r.headers["server-timing"]
+    assert end["db_ms"] >= 0
+
+
+def test_requests_without_sql_report_zero(logged):
+    r = client.get("/version")
+    assert 'desc="0 queries"' in r.headers["server-timing"]
+    end = next(e for e in logged if e["event"] == "request.end")
+    assert end["db_queries"] == 0
+
+
+def test_query_budget_exceeded_is_flagged(monkeypatch, logged):
+    monkeypatch.setattr(
+        sql_instrumentation._config,
+        "SQL_ROUTE_QUERY_BUDGETS",
+        {"/records/{record_id}/process": 2},
+    )
+    rid = client.post("/records", json={"source": "s", "category": "c", "payload": {}}).json()["id"]
+    logged.clear()
+
+    assert client.post(f"/records/{rid}/process").status_code == 200
+
+    flagged = [e for e in logged if e["event"] == "sql.query_budget_exceeded"]
+    assert len(flagged) == 1
+    assert flagged[0]["route"] == "/records/{record_id}/process"
+    assert flagged[0]["db_queries"] > 2
+    end = next(e for e in logged if e["event"] == "request.end")
+    assert end["query_budget_exceeded"] is True
+
+
+def test_default_budget_flags_repeated_fetches(monkeypatch, logged):
+    ids = [
+        client.post("/records", json={"source": "s", "category": "c", "payload": {}}).json()["id"]
+        for _ in range(7)
+    ]
+    assert client.get("/records").status_code == 200
+    assert client.post(f"/records/{ids[0]}/process").status_code == 200
+    assert not [e for e in logged if e["event"] == "sql.query_budget_exceeded"]
+
+    # one SELECT per id instead of one per chunk
+    monkeypatch.setattr(app.state.settings, "BATCH_GET_CHUNK_SIZE", 1)
+    assert client.post("/records/batch-get", json={"ids": ids[1:]}).status_code == 200
+    flagged = [e for e in logged if e["event"] == "sql.query_budget_exceeded"]
+    assert [e["route"] for e in flagged] == ["/records/batch-get"]
+    assert flagged[0]["query_budget"] == 5
+
+
+def test_slow_queries_are_logged_normalized(monkeypatch, logged):
+    monkeypatch.setattr(sql_instrumentation._config, "SLOW_QUERY_MS", 0.0)
+    client.get("/records?category=slow-cat", headers={"X-Request-ID": "slow-1"})
+
+    slow = [e for e in logged if e["event"] == "sql.slow_query"]
+    assert slow
+    assert all(e["request_id"] == "slow-1" for e in slow)
+    assert all("\n" not in e["statement"] for e in slow)
+
+
+def test_normalize_sql():
+    sql = "SELECT *\n  FROM records WHERE id IN (?, ?, ?) AND category = 'x''y' LIMIT 10"
+    assert (
+        sql_instrumentation.normalize_sql(sql)
+        == "SELECT * FROM records WHERE id IN (?) AND category = ? LIMIT ?"
+    )
@@ -0,0 +1,144 @@
+"""Tests for in-process tracing spans and the batched OTLP/JSON exporter."""
+
+import importlib
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Setup an in-memory SQLite DB shared by connections (StaticPool)
+TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    TEST_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SessionLocal = sessionmaker(bind=engine)
+
+# Patch app.database to use test engine/session BEFORE importing app
+db_module = importlib.import_module("workflow_service.app.database")
+db_module.engine = engine
+db_module.SessionLocal = SessionLocal
+
+# Create tables from model metadata
+models_record = importlib.import_module("workflow_service.app.models.record")
+models_record.Record.__table__.metadata.create_all(bind=engine)
+
+# Import app and services
+from workflow_service.app.core import tracing  # noqa: E402
+from workflow_service.app.database import get_db  # noqa: E402
+from workflow_service.app.main import app  # noqa: E402
+
+
+# Override dependency
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def _use_module_db(monkeypatch):
+    # other test modules re-patch these globals at import; pin them to this module's DB
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(db_module, "SessionLocal", SessionLocal)
+
+
+@pytest.fixture
+def exported(tmp_path):
+    """Enable tracing with a file exporter; returns a callable flushing and reading spans."""
+    path = tmp_path / "traces.jsonl"
+    processor = tracing.BatchSpanProcessor(
+        tracing.FileSpanExporter("workflow_service", path=str(path)), export_interval=60
+    )
+    tracing.set_processor(processor)
+
+    def read():
+        processor.force_flush()
+        spans = []
+        for line in path.read_text().splitlines():
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+        return spans
+
+    yield read
+    tracing.shutdown_tracing()
+
+
+client = TestClient(app)
+
+
+def _attrs(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+def test_request_spans_form_one_trace_keyed_by_request_id(exported):
+    request_id = "5f0c6f1e-2a7b-4a43-9a0e-1f1f5a2b3c4d"
+    r = client.get("/reports/summary", headers={"X-Request-ID": request_id})
+    assert r.status_code == 200
+
+    spans = exported()
+    assert {s["traceId"] for s in spans} == {request_id.replace("-", "")}
+    by_name = {s["name"]: s for s in spans}
+
+    server = by_name["GET /reports/summary"]
+    assert "parentSpanId" not in server
+    assert server["kind"] == tracing.SPAN_KIND_SERVER
+    assert _attrs(server)["http.status_code"] == "200"
+    assert _attrs(server)["request.id"] == request_id
+
+    handler = by_name["handler get_summary_endpoint"]
+    assert handler["parentSpanId"] == server["spanId"]
+    service = by_name["reporting.get_summary"]
+    assert service["parentSpanId"] == handler["spanId"]
+
+    queries = [s for s in spans if s["name"] == "db.query"]
+    assert queries
+    assert all(q["parentSpanId"] == service["spanId"] for q in queries)
+    assert _attrs(queries[0])["db.system"] == "sqlite"
+
+
+def test_processing_spans_and_error_status(exported):
+    rid = client.post("/records", json={"source": "s", "category": "c", "payload": {}}).json()["id"]
+    assert client.post(f"/records/{rid}/process").status_code == 200
+    assert client.get("/records/does-not-exist").status_code == 404
+
+    spans = exported()
+    names = [s["name"] for s in spans]
+    assert "processing.process_record" in names
+    assert "POST /records/{record_id}/process" in names
+    not_found = next(s for s in spans if s["name"] == "GET /records/{record_id}")
+    assert _attrs(not_found)["http.status_code"] == "404"
+    assert not_found["status"]["code"] == tracing.STATUS_OK
+
+
+def test_nothing_is_recorded_when_disabled():
+    assert tracing.begin_span("x", trace_id="a" * 32) is None
+    with tracing.start_span("y") as span:
+        assert span is None
+
+
+def test_exporter_batches_and_writes_otlp_documents():
+    stream = io.StringIO()
+    processor = tracing.BatchSpanProcessor(
+        tracing.FileSpanExporter("svc", stream=stream), batch_size=2, export_interval=60
+    )
+    try:
+        for i in range(3):
+            span = tracing.Span(f"s{i}", "a" * 32, None, tracing.SPAN_KIND_INTERNAL, {"i": i})
+            span.end_ns = span.start_ns
+            processor.on_end(span)
+        processor.force_flush()
+    finally:
+        processor.shutdown()
+
+    documents = [json.loads(line) for line in stream.getvalue().splitlines()]
+    sizes = [len(d["resourceSpans"][0]["scopeSpans"][0]["spans"]) for d in documents]
+    assert sizes == [2, 1]
+    resource = documents[0]["resourceSpans"][0]["resource"]
+    assert resource["attributes"] == [{"key": "service.name", "value": {"stringValue": "svc"}}]
@@ -0,0 +1,257 @@
+"""Tests for the transactional outbox and batched webhook delivery against a stub server."""
+
+import importlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine, func, literal, select
+from sqlalchemy.orm import sessionmaker
+
+from workflow_service.app.models import Base, OutboxEvent, Record, WebhookCursor
+
+db_module = importlib.import_module("workflow_service.app.database")
+processing = importlib.import_module("workflow_service.app.services.processing")
+outbox = importlib.import_module("workflow_service.app.services.outbox")
+webhooks = importlib.import_module("workflow_service.app.services.webhooks")
+
+
+class StubServer:
+    """Local HTTP endpoint recording POSTed batches; answers with scripted status codes."""
+
+    def __init__(self):
+        self.requests = {}  # path -> list of decoded bodies
+        self.statuses = {}  # path -> status codes to answer before falling back to 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.setdefault(self.path, []).append(body)
+                scripted = stub.statuses.get(self.path) or [200]
+                status = scripted.pop(0) if len(scripted) > 1 else scripted[0]
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def event_ids(self, path):
+        return [event["id"] for body in self.requests.get(path, []) for event in body["events"]]
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(db_module, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _configure(monkeypatch, stub, *paths):
+    endpoints = {path.strip("/"): stub.url(path) for path in paths}
+    monkeypatch.setattr(outbox._config, "WEBHOOK_ENDPOINTS", endpoints)
+    return endpoints
+
+
+def _processed_records(sessions, count, payload=None):
+    ids = []
+    with sessions() as session:
+        for i in range(count):
+            rec = Record(source="hook", category="c", payload=payload or {"n": i})
+            session.add(rec)
+            session.commit()
+            ids.append(rec.id)
+    for record_id in ids:
+        processing.process_record(record_id)
+    return ids
+
+
+@pytest.fixture
+def make_dispatcher(sessions):
+    created = []
+
+    def make(endpoints, **kwargs):
+        kwargs.setdefault("retry_backoff", 0.0)
+        created.append(webhooks.WebhookDispatcher(sessions, endpoints, **kwargs))
+        return created[-1]
+
+    yield make
+    for dispatcher in created:
+        dispatcher.stop()
+
+
+def _outbox_size(sessions):
+    with sessions() as session:
+        return session.execute(select(func.count(OutboxEvent.id))).scalar()
+
+
+def test_process_record_writes_outbox_event_in_its_transaction(sessions, stub, monkeypatch):
+    _configure(monkeypatch, stub, "/a")
+    [ok] = _processed_records(sessions, 1)
+    [bad] = _processed_records(sessions, 1, {"priority": "x"})
+
+    with sessions() as session:
+        events = session.execute(select(OutboxEvent).order_by(OutboxEvent.id)).scalars().all()
+    assert [(e.record_id, e.event) for e in events] == [
+        (ok, "record.processed"),
+        (bad, "record.failed"),
+    ]
+    assert json.loads(events[1].body)["error"] == "invalid priority"
+
+
+def test_no_outbox_events_without_endpoints(sessions, monkeypatch):
+    monkeypatch.setattr(outbox._config, "WEBHOOK_ENDPOINTS", {})
+    _processed_records(sessions, 2)
+    assert _outbox_size(sessions) == 0
+
+
+def test_events_are_delivered_in_batches_per_endpoint(sessions, stub, make_dispatcher, monkeypatch):
+    endpoints = _configure(monkeypatch, stub, "/a", "/b")
+    dispatcher = make_dispatcher(endpoints, batch_size=2)
+    dispatcher.run_once()  # creates the cursors at the (empty) outbox head
+    ids = _processed_records(sessions, 5)
+
+    while dispatcher.run_once():
+        pass
+
+    for path in ("/a", "/b"):
+        assert [len(body["events"]) for body in stub.requests[path]] == [2, 2, 1]
+        events = [event for body in stub.requests[path] for event in body["events"]]
+        assert [event["record_id"] for event in events] == ids
+        assert events[0]["event"] == "record.processed"
+    # every endpoint has moved past them, so the delivered events are pruned
+    assert _outbox_size(sessions) == 0
+
+
+def test_failed_delivery_is_retried_without_blocking_other_endpoints(
+    sessions, stub, make_dispatcher, monkeypatch
+):
+    endpoints = _configure(monkeypatch, stub, "/ok", "/flaky")
+    stub.statuses["/flaky"] = [500, 200]
+    dispatcher = make_dispatcher(endpoints)
+    dispatcher.run_once()
+    _processed_records(sessions, 3)
+
+    dispatcher.run_once()
+    assert len(stub.event_ids("/ok")) == 3
+    with sessions() as session:
+        cursor = session.get(WebhookCursor, "flaky")
+        assert cursor.attempts == 1 and "500" in cursor.last_error
+    assert _outbox_size(sessions) == 3  # still needed by /flaky
+
+    dispatcher.run_once()  # backoff 0: the same batch again
+    assert stub.event_ids("/flaky") == stub.event_ids("/ok") * 2
+    with sessions() as session:
+        assert session.get(WebhookCursor, "flaky").attempts == 0
+    assert _outbox_size(sessions) == 0
+
+
+def test_batch_is_skipped_after_max_attempts(sessions, stub, make_dispatcher, monkeypatch):
+    endpoints = _configure(monkeypatch, stub, "/down")
+    stub.statuses["/down"] = [503]
+    dispatcher = make_dispatcher(endpoints, max_attempts=2)
+    dispatcher.run_once()
+    _processed_records(sessions, 2)
+
+    dispatcher.run_once()
+    dispatcher.run_once()
+    assert len(stub.requests["/down"]) == 2
+    with sessions() as session:
+        cursor = session.get(WebhookCursor, "down")
+        assert cursor.last_event_id == max(stub.event_ids("/down"))
+    assert dispatcher.run_once() == 0  # nothing left to send
+
+
+def test_retry_waits_for_backoff(sessions, stub, make_dispatcher, monkeypatch):
+    endpoints = _configure(monkeypatch, stub, "/slow")
+    stub.statuses["/slow"] = [500, 200]
+    dispatcher = make_dispatcher(endpoints, retry_backoff=60.0)
+    dispatcher.run_once()
+    _processed_records(sessions, 1)
+
+    dispatcher.run_once()
+    dispatcher.run_once()
+    assert len(stub.requests["/slow"]) == 1
+
+
+def test_event_committed_out_of_order_is_not_skipped(sessions, stub, make_dispatcher, monkeypatch):
+    # On Postgres transaction 10 inserts event 1, then transaction 11 inserts event 2 and
+    # commits first; while 10 runs, the snapshot xmin (the commit horizon) stays at 10.
+    endpoints = _configure(monkeypatch, stub, "/a")
+    horizon = {"xmin": 10}
+    monkeypatch.setattr(outbox, "txid_horizon", lambda: literal(horizon["xmin"]))
+    dispatcher = make_dispatcher(endpoints)
+    dispatcher.run_once()
+
+    def commit_event(event_id, txid):
+        with sessions() as session:
+            body = json.dumps({"event": "record.processed", "record_id": str(event_id)})
+            session.add(
+                OutboxEvent(
+                    id=event_id, txid=txid, event="record.processed", record_id="r", body=body
+                )
+            )
+            session.commit()
+
+    commit_event(2, txid=11)
+    assert dispatcher.run_once() == 0  # 11 is above the horizon: 10 may still commit
+
+    commit_event(1, txid=10)
+    horizon["xmin"] = 12
+    dispatcher.run_once()
+    assert stub.event_ids("/a") == [1, 2]
+    with sessions() as session:
+        cursor = session.get(WebhookCursor, "a")
+        assert (cursor.last_txid, cursor.last_event_id) == (11, 2)
+
+
+def test_leased_endpoint_is_skipped_by_other_workers(sessions, stub, make_dispatcher, monkeypatch):
+    endpoints = _configure(monkeypatch, stub, "/a")
+    first, second = make_dispatcher(endpoints), make_dispatcher(endpoints)
+    first.run_once()
+    _processed_records(sessions, 1)
+
+    with sessions() as session:
+        batch = outbox.claim_batch(session, "a", first.owner, 60, 10)
+    assert batch is not None
+    assert second.run_once() == 0
+    assert "/a" not in stub.requests
+
+
+def test_background_dispatcher_delivers_new_events(sessions, stub, monkeypatch):
+    endpoints = _configure(monkeypatch, stub, "/live")
+    config = outbox._config.model_copy(
+        update={"WEBHOOK_ENDPOINTS": endpoints, "WEBHOOK_POLL_INTERVAL_SECONDS": 0.05}
+    )
+    dispatcher = webhooks.start_dispatcher(config, sessions)
+    try:
+        time.sleep(0.2)  # let it create the cursor at the outbox head
+        ids = _processed_records(sessions, 3)
+        deadline = time.monotonic() + 5
+        while len(stub.event_ids("/live")) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        dispatcher.stop()
+    events = [event for body in stub.requests["/live"] for event in body["events"]]
+    assert [event["record_id"] for event in events] == ids
@@ -0,0 +1,39 @@
+"""Deliver outbox events in commit order: add outbox_events.txid and webhook_cursors.last_txid
+
+Revision ID: 12b3734425f6
+Revises: ae4c5182704d
+Create Date: 2026-10-19 08:39:45.259015
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "12b3734425f6"
+down_revision: str | Sequence[str] | None = "ae4c5182704d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing events get txid 0: they sort before every new one, still in id order
+    op.add_column(
+        "outbox_events",
+        sa.Column("txid", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_index("ix_outbox_events_txid_id", "outbox_events", ["txid", "id"], unique=False)
+    op.add_column(
+        "webhook_cursors",
+        sa.Column("last_txid", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("webhook_cursors", "last_txid")
+    op.drop_index("ix_outbox_events_txid_id", table_name="outbox_events")
+    op.drop_column("outbox_events", "txid")
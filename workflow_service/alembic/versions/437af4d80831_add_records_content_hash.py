@@ -0,0 +1,90 @@
+"""Add records.content_hash for ingest dedup and backfill it in batches
+
+Revision ID: 437af4d80831
+Revises: 9d7488f45c24
+Create Date: 2026-10-19 08:20:44.020254
+
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "437af4d80831"
+down_revision: str | Sequence[str] | None = "9d7488f45c24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 1000  # 3 bound parameters per row
+
+records = sa.table(
+    "records",
+    sa.column("id", sa.String(36)),
+    sa.column("source", sa.String(128)),
+    sa.column("category", sa.String(128)),
+    sa.column("payload", sa.JSON()),
+    sa.column("content_hash", sa.String(64)),
+)
+
+
+def _content_hash(source, category, payload) -> str:
+    # frozen copy of app.services.dedup.content_hash; keep the two in step
+    canonical = json.dumps(
+        [source, category, payload], sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _decode(payload):
+    # rows written by create_record hold the payload as a JSON-encoded string
+    while isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            break
+    return payload
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("records", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index(
+        "ix_records_content_hash_created_at",
+        "records",
+        ["content_hash", "created_at"],
+        unique=False,
+    )
+
+    # Backfill in id order, one UPDATE per batch committed on its own (autocommit): row locks
+    # stay short, and an interrupted run resumes where it stopped (only rows without a hash
+    # are read).
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        select_batch = (
+            sa.select(records.c.id, records.c.source, records.c.category, records.c.payload)
+            .where(records.c.content_hash.is_(None), records.c.id > sa.bindparam("after"))
+            .order_by(records.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        after = ""
+        while rows := conn.execute(select_batch, {"after": after}).all():
+            digests = {
+                row.id: _content_hash(row.source, row.category, _decode(row.payload))
+                for row in rows
+            }
+            conn.execute(
+                records.update()
+                .where(records.c.id.in_(list(digests)))
+                .values(content_hash=sa.case(digests, value=records.c.id))
+            )
+            after = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_records_content_hash_created_at", table_name="records")
+    op.drop_column("records", "content_hash")
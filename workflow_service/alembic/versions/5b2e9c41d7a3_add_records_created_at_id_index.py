@@ -0,0 +1,27 @@
+"""Add (created_at, id) index on records for keyset pagination
+
+Revision ID: 5b2e9c41d7a3
+Revises: af0fb35e590d
+Create Date: 2026-10-19 14:02:17.540113
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e9c41d7a3"
+down_revision: str | Sequence[str] | None = "af0fb35e590d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_records_created_at_id", "records", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_records_created_at_id", table_name="records")
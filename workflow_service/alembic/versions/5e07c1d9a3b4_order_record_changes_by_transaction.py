@@ -0,0 +1,34 @@
+"""Stream record changes in commit order: add record_changes.txid
+
+Revision ID: 5e07c1d9a3b4
+Revises: 12b3734425f6
+Create Date: 2026-10-19 08:52:17.604113
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e07c1d9a3b4"
+down_revision: str | Sequence[str] | None = "12b3734425f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing changes get txid 0: they sort before every new one, still in id order
+    op.add_column(
+        "record_changes",
+        sa.Column("txid", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_index("ix_record_changes_txid_id", "record_changes", ["txid", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_record_changes_txid_id", table_name="record_changes")
+    op.drop_column("record_changes", "txid")
@@ -0,0 +1,119 @@
+"""Store records.payload as a JSON object (JSONB on Postgres) and index filterable paths
+
+Revision ID: ae4c5182704d
+Revises: 437af4d80831
+Create Date: 2026-10-19 09:41:12.518337
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "ae4c5182704d"
+down_revision: str | Sequence[str] | None = "437af4d80831"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+REWRITE_BATCH_SIZE = 1000
+
+# the default PAYLOAD_INDEXED_PATHS; a deployment declaring more paths adds a migration
+# calling create_payload_index for each
+INDEXED_PATHS = ("priority",)
+
+# create_record used to store json.dumps(payload) in the JSON column, i.e. a JSON string
+# holding the object's text.
+# PostgreSQL: the type change rewrites the table under an ACCESS EXCLUSIVE lock anyway, so
+# the string is unwrapped in the same pass; records is locked for the length of one full
+# rewrite, so plan a maintenance window for large tables.
+_PG_DECODE = (
+    "CASE WHEN json_typeof(payload) = 'string' THEN (payload #>> '{}')::jsonb "
+    "ELSE payload::jsonb END"
+)
+_PG_ENCODE = (
+    "CASE WHEN jsonb_typeof(payload) = 'object' THEN to_json(payload::text) "
+    "ELSE payload::json END"
+)
+# SQLite: rewritten in batches; (type check, new value)
+_SQLITE_DECODE = ("json_type(payload) = 'text'", "json_extract(payload, '$')")
+_SQLITE_ENCODE = ("json_type(payload) = 'object'", "json_quote(payload)")
+
+
+# the index DDL as of this revision, frozen here rather than imported from the app
+def _index_name(path: str) -> str:
+    return "ix_records_payload_" + path.replace(".", "_")
+
+
+def _path_expression(dialect: str, path: str) -> str:
+    if dialect == "postgresql":
+        return "(payload #> '{" + ",".join(path.split(".")) + "}')"
+    return "json_extract(payload, '$." + path + "')"
+
+
+def _rewrite_payloads(conn, where: str, value: str) -> None:
+    # in id order, one UPDATE per batch committed on its own (autocommit), so each row is
+    # rewritten at most once
+    select_batch = sa.text(
+        f"SELECT id FROM records WHERE id > :after AND {where} ORDER BY id LIMIT :limit"
+    )
+    update_batch = sa.text(f"UPDATE records SET payload = {value} WHERE id IN :ids").bindparams(
+        sa.bindparam("ids", expanding=True)
+    )
+    params = {"after": "", "limit": REWRITE_BATCH_SIZE}
+    while ids := conn.execute(select_batch, params).scalars().all():
+        conn.execute(update_batch, {"ids": ids})
+        params["after"] = ids[-1]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.alter_column(
+            "records",
+            "payload",
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            existing_nullable=False,
+            postgresql_using=_PG_DECODE,
+        )
+    with op.get_context().autocommit_block():
+        if dialect == "sqlite":
+            _rewrite_payloads(op.get_bind(), *_SQLITE_DECODE)
+        if dialect == "postgresql":
+            # serves every equality filter (payload @> '{"path": value}')
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_records_payload_gin "
+                "ON records USING gin (payload jsonb_path_ops)"
+            )
+        concurrently = " CONCURRENTLY" if dialect == "postgresql" else ""
+        for path in INDEXED_PATHS:
+            op.execute(
+                f"CREATE INDEX{concurrently} IF NOT EXISTS {_index_name(path)} "
+                f"ON records ({_path_expression(dialect, path)})"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    concurrently = " CONCURRENTLY" if dialect == "postgresql" else ""
+    with op.get_context().autocommit_block():
+        for path in INDEXED_PATHS:
+            op.execute(f"DROP INDEX{concurrently} IF EXISTS {_index_name(path)}")
+        if dialect == "postgresql":
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_records_payload_gin")
+        if dialect == "sqlite":
+            _rewrite_payloads(op.get_bind(), *_SQLITE_ENCODE)
+    if dialect == "postgresql":
+        op.alter_column(
+            "records",
+            "payload",
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            existing_nullable=False,
+            postgresql_using=_PG_ENCODE,
+        )
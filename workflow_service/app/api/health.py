@@ -5,9 +5,13 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from .. import database
+from ..core.readiness import readiness_monitor
+from ..core.routing import InstrumentedRoute
 from ..database import get_db
+from ..utils.log_sampling import request_log_sampler
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 @router.get("/health")
@@ -30,6 +34,33 @@ def health(db: Session = Depends(get_db)):
         )
 
 
+@router.get("/health/live")
+async def health_live():
+    """
+    Liveness probe: the worker's event loop is responding. Does not touch the database.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def health_ready():
+    """
+    Readiness probe for load balancers and orchestrators.
+
+    Uses the cached database check (refreshed in the background every
+    HEALTH_CHECK_INTERVAL_SECONDS) plus connection pool saturation and the number of
+    requests queued for a threadpool worker.
+
+    Returns:
+        200 OK: Ready to receive traffic
+        503 Service Unavailable: Database unreachable, pool saturated or queue backlog
+    """
+    ready, body = await readiness_monitor.report(database.engine)
+    if not ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
+
+
 @router.get("/version")
 def version():
     """
@@ -42,3 +73,14 @@ def version():
         "commit": os.getenv("GIT_COMMIT", "unknown"),
         "environment": os.getenv("APP_ENV", "dev"),
     }
+
+
+@router.get("/logging/stats")
+def logging_stats():
+    """
+    Request log sampling counters.
+
+    Returns how many request log lines were kept (errors, slow, sampled) or dropped since
+    the worker started, plus the active sampling configuration.
+    """
+    return request_log_sampler.stats()
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Response
+
+from .. import database
+from ..core import metrics
+from ..core.routing import InstrumentedRoute
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Prometheus exposition endpoint.
+
+    Per-route request counts and latency histograms, processing outcomes and duration,
+    request log sampling decisions and SQLAlchemy pool gauges.
+    """
+    metrics.observe_pool(database.engine)
+    content, content_type = metrics.render_latest()
+    return Response(content=content, media_type=content_type)
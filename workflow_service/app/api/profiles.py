@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..core.profiling import profile_store
+from ..core.routing import InstrumentedRoute
+from ..core.security import ApiKey, verify_api_key
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.get("/debug/profiles")
+def list_profiles(_api_key: ApiKey = Depends(verify_api_key)):
+    """
+    List profile reports stored by this worker, newest first.
+
+    Profile a request by sending it with `X-Profile: 1` and a valid `X-API-Key`.
+    """
+    return {"items": [report.summary() for report in profile_store.list()]}
+
+
+@router.get("/debug/profiles/{request_id}", response_class=PlainTextResponse)
+def get_profile(request_id: str, _api_key: ApiKey = Depends(verify_api_key)):
+    """Return the cProfile report for a profiled request, keyed by its X-Request-ID."""
+    report = profile_store.get(request_id)
+    if not report:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="profile not found")
+    return report.text
@@ -1,33 +1,62 @@
 from __future__ import annotations
 
+import base64
+import binascii
 import json
+import re
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from ..core.security import verify_api_key
-from ..database import get_db
-from ..models.record import Record
-from ..schemas.record import RecordCreate, RecordRead
-from ..services import processing, reporting
+from .. import database
+from ..config import Settings, get_settings
+from ..core.admission import admission_slot, admit
+from ..core.metrics import RECORDS_DEDUPLICATED
+from ..core.routing import InstrumentedRoute
+from ..core.security import ApiKey, enforce_write_limits
+from ..database import get_db, get_read_db
+from ..models.record import Record, StatusEnum
+from ..models.record_change import RecordChange
+from ..schemas.record import (
+    RecordBatchGet,
+    RecordBatchGetResponse,
+    RecordCreate,
+    RecordRead,
+    RecordRequeue,
+    RecordRequeueResult,
+)
+from ..services import changes, notifications, payload_filters, processing, reporting, requeue
+from ..services import dedup as dedup_service
+from ..services.record_cache import record_cache
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+# built once; record_id is bound per call, so SQLAlchemy reuses the compiled SQL
+_FETCH_RECORD = select(Record).where(Record.id == bindparam("record_id"))
 
 
 def _fetch_record(db: Session, record_id: str) -> Record:
-    rec = db.query(Record).filter(Record.id == record_id).first()
+    rec = db.execute(_FETCH_RECORD, {"record_id": record_id}).scalars().first()
     if not rec:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="record not found")
     return rec
 
 
 def _to_read_model(rec: Record) -> RecordRead:
-    payload = {}
-    try:
-        payload = json.loads(getattr(rec, "payload", "{}"))
-    except Exception:
-        payload = {}
+    payload = getattr(rec, "payload", None) or {}
+    if isinstance(payload, (str, bytes)):
+        # rows written before payloads were stored as JSON objects hold an encoded string
+        try:
+            payload = json.loads(payload)
+        except Exception:
+            payload = {}
 
     result = None
     raw_result = getattr(rec, "result", None)
@@ -59,21 +88,47 @@ def _to_read_model(rec: Record) -> RecordRead:
     )
 
 
-@router.post("/records", response_model=RecordRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/records",
+    response_model=RecordRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[admit("ingest")],
+)
 def create_record(
     payload: RecordCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    _api_key: str = Depends(verify_api_key),
+    response: Response,
+    dedup: bool | None = Query(None),
+    db: Session = Depends(get_db, scope="function"),
+    _api_key: ApiKey = Depends(enforce_write_limits, scope="function"),
+    config: Settings = Depends(get_settings),
 ):
+    """
+    Create a pending record.
+    - dedup (optional, default DEDUP_ENABLED): if a record with the same source, category
+      and payload was created within DEDUP_WINDOW_SECONDS, return it (200) instead of
+      inserting a new one
+    """
+    digest = dedup_service.content_hash(payload.source, payload.category, payload.payload)
+    if config.DEDUP_ENABLED if dedup is None else dedup:
+        existing = dedup_service.find_duplicate(db, digest, config.DEDUP_WINDOW_SECONDS)
+        if existing is not None:
+            RECORDS_DEDUPLICATED.labels(source=payload.source).inc()
+            response.status_code = status.HTTP_200_OK
+            response.headers["X-Deduplicated"] = "true"
+            return _to_read_model(existing)
+
     rec = Record(
         source=payload.source,
         category=payload.category,
-        payload=json.dumps(payload.payload),
+        payload=payload.payload,
         status="pending",
+        content_hash=digest,
     )
     db.add(rec)
+    changes.record_change(db, rec, "created")
     db.commit()
+    notifications.notify_committed(rec.id)
     db.refresh(rec)
 
     # Do not auto-process here (explicit trigger endpoint exists)
@@ -93,7 +148,23 @@ def _parse_iso_datetime_optional(value: str | None) -> datetime | None:
         ) from e
 
 
-@router.get("/records", response_model=dict)
+def _encode_cursor(rec: Record) -> str:
+    raw = f"{rec.created_at.isoformat()}|{rec.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(value: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        created_at, record_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), record_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"invalid cursor: {value}"
+        ) from e
+
+
+@router.get("/records", response_model=dict, dependencies=[admit("read")])
 def list_records(
     status: str | None = Query(None),
     category: str | None = Query(None),
@@ -103,7 +174,10 @@ def list_records(
     offset: int = Query(0, ge=0),
     sort_by: str = Query("created_at", pattern="^(created_at|status|category|source)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None),
+    payload: list[str] = Query([]),
+    db: Session = Depends(get_read_db, scope="function"),
+    config: Settings = Depends(get_settings),
 ):
     """
     List records with filters, pagination, and sorting.
@@ -112,7 +186,11 @@ def list_records(
     - limit (default 50, max 200), offset (default 0)
     - sort_by (created_at|status|category|source, default: created_at)
     - sort_order (asc|desc, default: desc)
-    Returns: { items: [...], count: <page_count>, total: <total_matching> }
+    - cursor: next_cursor of the previous page (keyset pagination on created_at, id;
+      only with sort_by=created_at, ignores offset)
+    - payload (repeatable): payload field filter <path><op><value>, e.g. priority>=3 or
+      customer.name=Alice; op is = != > >= < <=, path one of PAYLOAD_INDEXED_PATHS
+    Returns: { items: [...], count: <page_count>, total: <total_matching>, next_cursor }
     """
     # enforce max limit
     if limit > 200:
@@ -121,32 +199,276 @@ def list_records(
     # parse datetimes
     dt_after = _parse_iso_datetime_optional(created_after)
     dt_before = _parse_iso_datetime_optional(created_before)
+    after = _decode_cursor(cursor) if cursor else None
 
     # fetch via service layer
-    items, total = reporting.get_records(
+    try:
+        filters = payload_filters.parse_payload_filters(
+            payload,
+            None if config.PAYLOAD_FILTER_ALLOW_UNINDEXED else config.PAYLOAD_INDEXED_PATHS,
+            config.PAYLOAD_FILTER_MAX,
+        )
+        items, total = reporting.get_records(
+            db,
+            status=status,
+            category=category,
+            created_after=dt_after,
+            created_before=dt_before,
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            after=after,
+            payload_filters=filters,
+        )
+    except ValueError as ve:
+        # the ``status`` query parameter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+
+    # a full page sorted by created_at can be continued from its last row
+    next_cursor = None
+    if sort_by == "created_at" and len(items) == limit:
+        next_cursor = _encode_cursor(items[-1])
+
+    return {
+        "items": [_to_read_model(i) for i in items],
+        "count": len(items),
+        "total": total,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.post("/records/requeue", response_model=RecordRequeueResult, dependencies=[admit("ingest")])
+def requeue_records(
+    body: RecordRequeue,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db, scope="function"),
+    _api_key: ApiKey = Depends(enforce_write_limits, scope="function"),
+    config: Settings = Depends(get_settings),
+):
+    """
+    Reset failed (or processed) records back to pending, e.g. after a downstream outage.
+    - status: records to requeue (failed|processed, default failed)
+    - category, source, error_contains (substring of error), created_after, created_before
+    - limit (optional): requeue at most this many records
+    - process: also enqueue the requeued records for processing after the response
+    Runs in batches of REQUEUE_BATCH_SIZE, each its own UPDATE and transaction.
+    Returns: { requeued, batches, enqueued }
+    """
+    result = requeue.requeue_records(
         db,
-        status=status,
-        category=category,
-        created_after=dt_after,
-        created_before=dt_before,
-        limit=limit,
-        offset=offset,
-        sort_by=sort_by,
-        sort_order=sort_order,
+        from_status=body.status,
+        category=body.category,
+        source=body.source,
+        error_contains=body.error_contains,
+        created_after=body.created_after,
+        created_before=body.created_before,
+        limit=body.limit,
+        batch_size=config.REQUEUE_BATCH_SIZE,
+    )
+    enqueued = 0
+    if body.process and result.record_ids:
+        background_tasks.add_task(processing.process_records, result.record_ids)
+        enqueued = len(result.record_ids)
+    return RecordRequeueResult(
+        requeued=len(result.record_ids), batches=result.batches, enqueued=enqueued
+    )
+
+
+@router.post(
+    "/records/batch-get", response_model=RecordBatchGetResponse, dependencies=[admit("read")]
+)
+def batch_get_records(
+    body: RecordBatchGet,
+    db: Session = Depends(get_read_db, scope="function"),
+    config: Settings = Depends(get_settings),
+):
+    """
+    Fetch many records by id in one request.
+    - ids: up to BATCH_GET_MAX_IDS record ids (duplicates are ignored)
+    Returns: { items: [...in request order], missing: [ids that do not exist] }
+    Cached records are served from the record cache; the rest are loaded with chunked
+    WHERE id IN (...) queries.
+    """
+    ids = list(dict.fromkeys(body.ids))
+    if len(ids) > config.BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"too many ids: at most {config.BATCH_GET_MAX_IDS} per request",
+        )
+
+    serialized: dict[str, bytes] = {}
+    if record_cache.enabled:
+        for record_id in ids:
+            if (data := record_cache.get(record_id)) is not None:
+                serialized[record_id] = data
+    token = record_cache.fill_token()
+    uncached = [record_id for record_id in ids if record_id not in serialized]
+    found = reporting.get_records_by_ids(db, uncached, config.BATCH_GET_CHUNK_SIZE)
+    for record_id, rec in found.items():
+        data = _to_read_model(rec).model_dump_json().encode()
+        if record_cache.enabled:
+            record_cache.set(record_id, data, token)
+        serialized[record_id] = data
+
+    # splice the serialized records rather than re-validating them into a response model
+    items = b",".join(serialized[record_id] for record_id in ids if record_id in serialized)
+    missing = [record_id for record_id in ids if record_id not in serialized]
+    content = b'{"items":[' + items + b'],"missing":' + json.dumps(missing).encode() + b"}"
+    return Response(content=content, media_type="application/json")
+
+
+def _start_position(after_id: int | None) -> changes.Position:
+    with database.SessionLocal() as db:
+        if after_id is None:
+            return changes.head_position(db)
+        return changes.resume_position(db, after_id)
+
+
+def _load_changes(
+    after: changes.Position, category: str | None, source: str | None, limit: int
+) -> tuple[changes.Position, list[RecordChange]]:
+    # short-lived session per read so an open stream never pins a pooled connection
+    db = database.SessionLocal()
+    try:
+        rows = changes.get_changes(
+            db,
+            after=after,
+            category=category,
+            source=source,
+            limit=limit,
+        )
+        return ((rows[-1].txid, rows[-1].id) if rows else after), rows
+    finally:
+        db.close()
+
+
+@router.get("/records/changes")
+async def stream_record_changes(
+    category: str | None = Query(None),
+    source: str | None = Query(None),
+    last_event_id: int | None = Query(None, ge=0),
+    last_event_id_header: int | None = Header(None, alias="Last-Event-ID", ge=0),
+    config: Settings = Depends(get_settings),
+):
+    """
+    Server-Sent Events stream of record changes (created, processed, failed, requeued).
+    - category, source (optional filters)
+    - Last-Event-ID header (or last_event_id query param): resume after that change
+      id; without it the stream starts at the current head. Use 0 to replay all.
+      Changes arrive in commit order, so ids are unique but not always ascending.
+    The stream is closed after CHANGE_FEED_MAX_STREAM_SECONDS; clients reconnect with
+    the last id they saw.
+    """
+    after_id = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    async def _events() -> AsyncIterator[str]:
+        cursor = await run_in_threadpool(_start_position, after_id)
+        deadline = time.monotonic() + config.CHANGE_FEED_MAX_STREAM_SECONDS
+        yield "retry: 2000\n\n"
+        while (remaining := deadline - time.monotonic()) > 0:
+            # subscribe before reading so a commit between the read and the wait wakes us
+            with notifications.record_notifier.subscribe(notifications.CHANGE_FEED_KEY) as changed:
+                cursor, rows = await run_in_threadpool(
+                    _load_changes, cursor, category, source, config.CHANGE_FEED_BATCH_SIZE
+                )
+                for change in rows:
+                    yield changes.format_sse(change)
+                if len(rows) >= config.CHANGE_FEED_BATCH_SIZE:
+                    continue
+                timeout = min(config.CHANGE_FEED_HEARTBEAT_SECONDS, remaining)
+                if not await notifications.wait_for(changed, timeout):
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    return {"items": [_to_read_model(i) for i in items], "count": len(items), "total": total}
+
+_WAIT_RE = re.compile(r"^(\d+(?:\.\d+)?)(ms|s)?$")
+
+
+def _parse_wait(value: str, max_wait: float) -> float:
+    """Parse a long-poll duration such as ``30s``, ``500ms`` or ``10`` (seconds)."""
+    match = _WAIT_RE.match(value.strip())
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"invalid wait duration: {value}"
+        )
+    seconds = float(match.group(1))
+    if match.group(2) == "ms":
+        seconds /= 1000
+    # enforce max wait
+    return min(seconds, max_wait)
+
+
+def _load_record_json(db: Session, record_id: str) -> bytes:
+    """Serialize the record and cache the bytes (unless it changed while we were reading)."""
+    token = record_cache.fill_token()
+    data = _to_read_model(_fetch_record_and_close(db, record_id)).model_dump_json().encode()
+    if record_cache.enabled:
+        record_cache.set(record_id, data, token)
+    return data
+
+
+def _fetch_record_and_close(db: Session, record_id: str) -> Record:
+    # return the connection to the pool inside the admission slot, and before a long-poll
+    # waits; the loaded record stays readable once detached
+    try:
+        return _fetch_record(db, record_id)
+    finally:
+        db.close()
+
+
+def _fetch_record_from_primary(record_id: str) -> Record:
+    # the transition was committed on the primary; a replica may still lag
+    with database.SessionLocal() as db:
+        return _fetch_record(db, record_id)
 
 
 @router.get("/records/{record_id}", response_model=RecordRead)
-def get_record(record_id: str, db: Session = Depends(get_db)):
-    rec = _fetch_record(db, record_id)
+async def get_record(
+    record_id: str,
+    wait: str | None = Query(None),
+    db: Session = Depends(get_read_db, scope="function"),
+    config: Settings = Depends(get_settings),
+):
+    """
+    Fetch a single record.
+    - wait (optional, e.g. 30s or 500ms): if the record is still pending, hold the request
+      until it transitions or the wait elapses, then return its current state
+    """
+    # admission slots are held around the reads only, not while a long-poll waits
+    if not wait:
+        data = record_cache.get(record_id) if record_cache.enabled else None
+        if data is None:
+            with admission_slot("read"):
+                data = await run_in_threadpool(_load_record_json, db, record_id)
+        return Response(content=data, media_type="application/json")
+
+    timeout = _parse_wait(wait, config.LONG_POLL_MAX_WAIT_SECONDS)
+    # subscribe before reading so a transition between the read and the wait is not missed
+    with notifications.record_notifier.subscribe(record_id) as transitioned:
+        with admission_slot("read"):
+            rec = await run_in_threadpool(_fetch_record_and_close, db, record_id)
+        if rec.status == StatusEnum.pending.value and timeout > 0:
+            if await notifications.wait_for(transitioned, timeout):
+                with admission_slot("read"):
+                    rec = await run_in_threadpool(_fetch_record_from_primary, record_id)
     return _to_read_model(rec)
 
 
-@router.post("/records/{record_id}/process", response_model=RecordRead)
+@router.post(
+    "/records/{record_id}/process",
+    response_model=RecordRead,
+    dependencies=[admit("ingest")],
+)
 def post_process_record(
-    record_id: str, db: Session = Depends(get_db), _api_key: str = Depends(verify_api_key)
+    record_id: str,
+    db: Session = Depends(get_db, scope="function"),
+    _api_key: ApiKey = Depends(enforce_write_limits, scope="function"),
 ):
     rec = _fetch_record(db, record_id)
 
@@ -4,10 +4,13 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from ..database import get_db
-from ..services import reporting
+from ..config import Settings, get_settings
+from ..core.admission import admit
+from ..core.routing import InstrumentedRoute
+from ..database import get_read_db
+from ..services import payload_filters, reporting
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 def _parse_iso_datetime(value: str | None) -> datetime | None:
@@ -24,13 +27,15 @@ def _parse_iso_datetime(value: str | None) -> datetime | None:
         ) from e
 
 
-@router.get("/reports/summary")
+@router.get("/reports/summary", dependencies=[admit("report")])
 def get_summary_endpoint(
     status: str | None = Query(None),
     category: str | None = Query(None),
     date_from: str | None = Query(None),
     date_to: str | None = Query(None),
-    db=Depends(get_db),
+    payload: list[str] = Query([]),
+    db=Depends(get_read_db, scope="function"),
+    config: Settings = Depends(get_settings),
 ):
     """
     Summary report with optional filters.
@@ -38,6 +43,7 @@ def get_summary_endpoint(
       - status: pending|processed|failed
       - category: string
       - date_from, date_to: ISO date or datetime (e.g. 2026-01-04 or 2026-01-04T12:34:56Z)
+      - payload (repeatable): payload field filter, e.g. priority>=3 (see GET /records)
     """
     # parse datetimes
     dt_from = _parse_iso_datetime(date_from)
@@ -45,15 +51,26 @@ def get_summary_endpoint(
 
     # validate date range
     if dt_from and dt_to and dt_from > dt_to:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from > date_to")
+        raise HTTPException(status_code=400, detail="date_from > date_to")
 
     # validate status (reporting will raise ValueError as well)
     try:
+        filters = payload_filters.parse_payload_filters(
+            payload,
+            None if config.PAYLOAD_FILTER_ALLOW_UNINDEXED else config.PAYLOAD_INDEXED_PATHS,
+            config.PAYLOAD_FILTER_MAX,
+        )
         summary = reporting.get_summary(
-            db, status=status, category=category, date_from=dt_from, date_to=dt_to
+            db,
+            status=status,
+            category=category,
+            date_from=dt_from,
+            date_to=dt_to,
+            payload_filters=filters,
         )
     except ValueError as ve:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve)) from ve
+        # the ``status`` query parameter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
 
     return {
         "generated_at": datetime.utcnow().isoformat() + "Z",
@@ -62,6 +79,7 @@ def get_summary_endpoint(
             "category": category,
             "date_from": date_from,
             "date_to": date_to,
+            "payload": payload,
         },
         "totals": summary["totals"],
         "by_category": summary["by_category"],
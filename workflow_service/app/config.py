@@ -1,9 +1,27 @@
 from pydantic_settings import BaseSettings
+from starlette.requests import Request
 
 
 class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str = "sqlite:///./workflow.db"
+    READ_DATABASE_URL: str | None = None  # read replica URL(s), comma-separated
+    REPLICA_RETRY_SECONDS: float = 30.0  # an unreachable replica is skipped for this long
+
+    # Connection Pool (QueuePool: Postgres and file-backed SQLite)
+    DB_POOL_SIZE: int = 5  # connections kept open per worker
+    DB_MAX_OVERFLOW: int = 10  # extra connections allowed under burst load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # recycle Postgres connections after this many seconds
+
+    # SQLite tuning, applied to every new connection when SQLITE_TUNED is set. Opt-in:
+    # journal_mode=WAL is persistent, so it converts an existing database file for good
+    SQLITE_TUNED: bool = False
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers no longer block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # fsync at checkpoints only; safe with WAL
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes of the file memory-mapped (256 MiB)
+    SQLITE_CACHE_SIZE: int = -64000  # page cache; negative values are KiB (64 MiB)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait for locks instead of failing immediately
 
     # Application Settings
     PROJECT_NAME: str = "workflow_service"
@@ -13,11 +31,107 @@ class Settings(BaseSettings):
     APP_ENV: str = "dev"  # dev, staging, prod
     LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
 
+    # Request Log Sampling (errors and slow requests are always logged)
+    LOG_SAMPLE_RATE: float = 1.0  # fraction of successful fast requests logged
+    LOG_SLOW_REQUEST_MS: int = 1000  # requests at or above this duration are always logged
+    LOG_ROUTE_SAMPLE_RATES: dict[str, float] = {}  # per-route overrides, JSON in env
+    LOG_MERGE_START_END: bool = False  # one "request" line instead of request.start + end
+
     # Security Configuration
     API_KEY: str | None = None  # API key for write operations (None = open access for dev)
+    API_KEYS_FILE: str | None = None  # JSON file of hashed keys with per-key limits
+    API_KEYS_RELOAD_SECONDS: float = 5.0  # how often the key file is checked for changes
+    API_KEY_RATE_PER_SECOND: float = 0.0  # default write requests/s per key; 0 = unlimited
+    API_KEY_BURST: int = 0  # default token-bucket size per key; 0 = one second's worth
+    API_KEY_MAX_CONCURRENCY: int = 0  # default in-flight write requests per key; 0 = unlimited
+
+    # SQL Instrumentation
+    SLOW_QUERY_MS: float = 200.0  # statements at or above this are written to the slow-query log
+    # requests issuing more statements than this are flagged; the routes issue 1-4 (a
+    # record write: read, update, change row), so a repeated fetch or an N+1 trips it
+    SQL_QUERY_BUDGET: int = 5
+    # per-route overrides, JSON in env (replaces this default); a change feed stream reads
+    # once per wake-up for as long as it is open
+    SQL_ROUTE_QUERY_BUDGETS: dict[str, int] = {"/records/changes": 10_000}
+
+    # Request Profiling (X-Profile: 1 with a valid API key)
+    PROFILING_ENABLED: bool = True  # kill switch for on-demand profiling
+    PROFILE_TOP_N: int = 40  # functions listed in the cumulative-time report
+    PROFILE_STORE_SIZE: int = 50  # recent reports kept in memory per worker
+    PROFILE_OUTPUT_DIR: str | None = None  # also write <request_id>.prof/.txt here
+
+    # Admission Control (DB-bound routes shed with 503 before the pool is exhausted)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 0  # 0 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_RESERVED: int = 1  # slots left free for health checks
+    ADMISSION_CLASS_SHARES: dict[str, float] = {"ingest": 1.0, "read": 0.75, "report": 0.5}
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Startup Warmup (lifespan, before the worker takes traffic)
+    WARMUP_ENABLED: bool = True  # pre-fill the pool and compile the hot statements
+    WARMUP_POOL_CONNECTIONS: int = 0  # connections opened at startup; 0 = DB_POOL_SIZE
+
+    # Webhooks (outbox events for processed/failed records, delivered in batches)
+    WEBHOOK_ENDPOINTS: dict[str, str] = {}  # endpoint name -> URL, JSON in env; {} = off
+    WEBHOOK_BATCH_SIZE: int = 100  # events per POST
+    WEBHOOK_MAX_CONCURRENCY: int = 4  # deliveries in flight per worker
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    WEBHOOK_MAX_ATTEMPTS: int = 10  # a batch is skipped after this many failed deliveries
+    WEBHOOK_RETRY_BACKOFF_SECONDS: float = 1.0  # doubled after each failed attempt
+    WEBHOOK_MAX_BACKOFF_SECONDS: float = 300.0
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0  # outbox polling while there is no backlog
+
+    # Health Probes (GET /health/live, GET /health/ready)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0  # background refresh of the readiness DB check
+    READY_MAX_POOL_SATURATION: float = 1.0  # not ready at/above this share of pool capacity
+    READY_MAX_QUEUE_BACKLOG: int = 50  # not ready with more requests waiting for a worker
+    READY_CHECK_TIMEOUT_SECONDS: float = 1.0  # longest a probe waits on an inline DB check
+
+    # Tracing (OTLP/JSON spans, one document per line)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "file"  # "file" or "stdout"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_BATCH_SIZE: int = 512  # spans per exported document
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 5.0  # flush interval for partial batches
+    TRACING_MAX_QUEUE_SIZE: int = 10000  # oldest spans are dropped beyond this
+
+    # Record Cache (GET /records/{record_id})
+    RECORD_CACHE_MAX_ENTRIES: int = 10000  # serialized records kept per worker; 0 disables
+    RECORD_CACHE_TTL_SECONDS: float = 30.0  # upper bound on staleness, e.g. behind a replica
+
+    # Long-poll Configuration
+    LONG_POLL_MAX_WAIT_SECONDS: float = 60.0  # upper bound for GET /records/{id}?wait=
+
+    # Ingest Dedup (POST /records; per request with ?dedup=true|false)
+    DEDUP_ENABLED: bool = False  # return the existing record for a resent payload
+    DEDUP_WINDOW_SECONDS: float = 86400.0  # how far back a duplicate counts; 0 = any age
+
+    # Bulk Requeue (POST /records/requeue)
+    REQUEUE_BATCH_SIZE: int = 500  # records reset per UPDATE and transaction
+
+    # Batch Fetch (POST /records/batch-get)
+    BATCH_GET_MAX_IDS: int = 1000  # ids accepted per request
+    BATCH_GET_CHUNK_SIZE: int = 500  # ids per IN query, below driver parameter limits
+
+    # Payload Filters (GET /records, GET /reports/summary; ?payload=priority>=3)
+    # dotted payload paths that may be filtered on; each needs its index created by migration
+    # (services.payload_filters.create_payload_index), JSON list in env
+    PAYLOAD_INDEXED_PATHS: list[str] = ["priority"]
+    PAYLOAD_FILTER_ALLOW_UNINDEXED: bool = False  # also accept other paths (full scans)
+    PAYLOAD_FILTER_MAX: int = 5  # payload filters accepted per request
+
+    # Change Feed Configuration (GET /records/changes)
+    CHANGE_FEED_BATCH_SIZE: int = 100  # changes read per query
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0  # idle keep-alive comment interval
+    CHANGE_FEED_MAX_STREAM_SECONDS: float = 300.0  # clients reconnect with Last-Event-ID
 
     class Config:
         env_file = ".env"
 
 
 settings = Settings()
+
+
+async def get_settings(request: Request) -> Settings:
+    """Dependency: the settings of the app serving the request (see main.create_app)."""
+    return request.app.state.settings
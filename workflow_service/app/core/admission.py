@@ -0,0 +1,120 @@
+"""Admission control for DB-bound routes.
+
+Without it, requests beyond the connection pool's capacity queue inside threadpool
+workers until ``DB_POOL_TIMEOUT`` and then fail as generic 500s. Instead each DB-bound
+route declares a class (``ingest``, ``read``, ``report``) and takes an admission slot
+before it runs; once the in-flight total reaches the class's share of capacity the request
+is rejected at once with 503 and ``Retry-After``.
+
+Capacity is the pool's (``DB_POOL_SIZE + DB_MAX_OVERFLOW``) unless ``ADMISSION_MAX_IN_FLIGHT``
+is set, minus ``ADMISSION_RESERVED`` slots kept free for health checks, which are never
+shed. Classes with a smaller share (reports by default) are turned away first as the
+total rises, so ingest keeps the last of the headroom.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+
+from fastapi import Depends, HTTPException, params, status
+
+from ..config import Settings, settings
+from .metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTIONS
+
+
+class AdmissionController:
+    def __init__(self, capacity: int, shares: dict[str, float], retry_after: int = 1):
+        self.capacity = capacity
+        self.retry_after = retry_after
+        # a class is admitted while the in-flight total is below its limit
+        self.limits = {name: max(1, int(capacity * share)) for name, share in shares.items()}
+        self.in_flight = dict.fromkeys(shares, 0)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> AdmissionController:
+        capacity = config.ADMISSION_MAX_IN_FLIGHT or (
+            config.DB_POOL_SIZE + max(config.DB_MAX_OVERFLOW, 0)
+        )
+        return cls(
+            max(capacity - config.ADMISSION_RESERVED, 1),
+            config.ADMISSION_CLASS_SHARES,
+            config.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+
+    def try_acquire(self, route_class: str) -> bool:
+        with self._lock:
+            if self.total >= self.limits[route_class]:
+                return False
+            self.total += 1
+            self.in_flight[route_class] += 1
+        ADMISSION_IN_FLIGHT.labels(route_class=route_class).inc()
+        return True
+
+    def release(self, route_class: str) -> None:
+        with self._lock:
+            self.total -= 1
+            self.in_flight[route_class] -= 1
+        ADMISSION_IN_FLIGHT.labels(route_class=route_class).dec()
+
+    @contextmanager
+    def slot(self, route_class: str) -> Iterator[None]:
+        """Hold a slot of ``route_class`` for the block; raise 503 if none is free."""
+        if not self.try_acquire(route_class):
+            ADMISSION_REJECTIONS.labels(route_class=route_class).inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"server busy: {route_class} capacity reached",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        try:
+            yield
+        finally:
+            self.release(route_class)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {"total": self.total, "in_flight": dict(self.in_flight), "limits": self.limits}
+
+
+_config: Settings = settings
+admission_controller = AdmissionController.from_settings(settings)
+
+
+def configure(config: Settings) -> None:
+    """Use ``config`` for admission control; the in-flight counts start over."""
+    global _config, admission_controller
+    _config = config
+    admission_controller = AdmissionController.from_settings(config)
+
+
+@contextmanager
+def admission_slot(route_class: str) -> Iterator[None]:
+    """``admission_controller.slot`` unless admission control is disabled."""
+    if not _config.ADMISSION_ENABLED:
+        yield
+        return
+    with admission_controller.slot(route_class):
+        yield
+
+
+def admit(route_class: str) -> params.Depends:
+    """Route dependency holding an admission slot of ``route_class`` while the endpoint runs.
+
+    Declare it in the route's ``dependencies`` so it is solved before the session
+    dependencies and a shed request never touches the pool. The slot is released when the
+    endpoint returns (``scope="function"``), not after the response has been sent, so a
+    client's next request does not find its previous slot still taken. Declare the
+    route's session dependencies with ``scope="function"`` as well: they are solved after
+    the slot and exit before it, so the connection is back in the pool by the time the
+    slot is free again.
+    """
+
+    async def dependency() -> AsyncIterator[None]:
+        with admission_slot(route_class):
+            yield
+
+    return Depends(dependency, scope="function")
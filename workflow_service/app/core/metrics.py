@@ -0,0 +1,171 @@
+"""Prometheus metrics for the service.
+
+With several uvicorn/gunicorn workers, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty,
+writable directory before the workers start. Each worker then writes its samples to that
+directory and ``/metrics`` aggregates all of them, whichever worker serves the scrape.
+"""
+
+from __future__ import annotations
+
+import os
+import weakref
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+RECORD_PROCESSING = Counter(
+    "record_processing_total",
+    "Record processing outcomes by resulting status and category.",
+    ["status", "category"],
+)
+RECORDS_DEDUPLICATED = Counter(
+    "records_deduplicated_total",
+    "POST /records requests answered with an existing record (content-hash dedup), by source.",
+    ["source"],
+)
+RECORD_PROCESSING_DURATION = Histogram(
+    "record_processing_duration_seconds",
+    "Time spent in processing.process_record.",
+    buckets=LATENCY_BUCKETS,
+)
+SQL_QUERY_BUDGET_EXCEEDED = Counter(
+    "sql_query_budget_exceeded_total",
+    "Requests that issued more SQL statements than their query budget, by route template.",
+    ["route"],
+)
+SQL_COMPILED_CACHE = Counter(
+    "sql_compiled_cache_total",
+    "Statements executed by SQLAlchemy compiled-cache lookup outcome (hit, miss, no_cache_key, ...).",
+    ["result"],
+)
+RECORD_CACHE_REQUESTS = Counter(
+    "record_cache_requests_total",
+    "Record cache lookups (GET /records/{record_id}, batch-get) by result (hit, miss).",
+    ["result"],
+)
+RECORD_CACHE_ENTRIES = Gauge(
+    "record_cache_entries",
+    "Serialized records held in the in-process record cache.",
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "DB-bound requests holding an admission slot, by route class.",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Requests shed with 503 because their route class was at capacity.",
+    ["route_class"],
+)
+API_KEY_REJECTIONS = Counter(
+    "api_key_rejections_total",
+    "Write requests rejected by a per-key rate or concurrency limit.",
+    ["key_id", "reason"],
+)
+WEBHOOK_DELIVERIES = Counter(
+    "webhook_deliveries_total",
+    "Webhook batch deliveries by endpoint and outcome (success, retry, dropped).",
+    ["endpoint", "outcome"],
+)
+WEBHOOK_EVENTS_DELIVERED = Counter(
+    "webhook_events_delivered_total",
+    "Outbox events delivered to each webhook endpoint.",
+    ["endpoint"],
+)
+REQUEST_LOG_DECISIONS = Counter(
+    "request_log_lines_total",
+    "Request log sampling decisions (kept_error, kept_slow, kept_sampled, dropped).",
+    ["outcome"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond pool_size (negative while the pool is not full).",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size_connections",
+    "Configured pool_size of the SQLAlchemy pool.",
+    multiprocess_mode="livesum",
+)
+
+
+def observe_request(method: str, route: str, status_code: int, duration_seconds: float) -> None:
+    HTTP_REQUESTS.labels(method=method, route=route, status=str(status_code)).inc()
+    HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(duration_seconds)
+
+
+def observe_pool(engine: Engine) -> None:
+    """Copy the pool's current counters into the gauges (QueuePool only)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(pool.overflow())
+    DB_POOL_SIZE.set(pool.size())
+
+
+_instrumented_engines: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Keep the pool gauges current on every checkout/checkin (idempotent)."""
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    def _on_pool_event(*_args) -> None:
+        observe_pool(engine)
+
+    event.listen(engine, "checkout", _on_pool_event)
+    event.listen(engine, "checkin", _on_pool_event)
+    observe_pool(engine)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a stopped worker's live gauges from the multiprocess directory."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
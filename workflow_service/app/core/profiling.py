@@ -0,0 +1,228 @@
+"""On-demand request profiling.
+
+A request carrying ``X-Profile: 1`` and a valid API key runs under cProfile: the event
+loop thread is profiled for the whole request, and sync endpoints are profiled inside
+their threadpool worker (see ``core.routing.InstrumentedRoute``). The merged report is
+stored in memory keyed by the request's ``X-Request-ID`` (and optionally written to
+``PROFILE_OUTPUT_DIR``) and served by ``GET /debug/profiles/{request_id}``.
+
+Only one request per worker is profiled at a time, since cProfile hooks are per thread
+and the loop thread is shared by all requests. Coroutines of other requests that run on
+the loop while a profiled request is in flight do appear in its loop profile.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import Settings, settings
+from ..schemas.error import ErrorBody, ErrorResponse
+from ..utils.logging import log_json
+from . import security
+
+
+@dataclass
+class ProfileReport:
+    request_id: str
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    created_at: float
+    text: str
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "created_at": self.created_at,
+        }
+
+
+class ProfileSession:
+    """Profiles collected for one request across the loop thread and worker threads."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self._lock = threading.Lock()
+        self._loop_profile = cProfile.Profile()
+        self._worker_profiles: list[cProfile.Profile] = []
+
+    def start(self) -> None:
+        self._loop_profile.enable()
+
+    def profile_call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` under a profiler owned by the calling (worker) thread."""
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._worker_profiles.append(profile)
+
+    def finish(self) -> pstats.Stats:
+        self._loop_profile.disable()
+        stats = pstats.Stats(self._loop_profile)
+        with self._lock:
+            for profile in self._worker_profiles:
+                stats.add(profile)
+        return stats
+
+
+_current_session: ContextVar[ProfileSession | None] = ContextVar("profile_session", default=None)
+
+
+def current_session() -> ProfileSession | None:
+    return _current_session.get()
+
+
+def render_report(stats: pstats.Stats, top_n: int) -> str:
+    buf = io.StringIO()
+    stats.stream = buf
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    # call tree of the service's own functions
+    stats.print_callees(r"workflow_service")
+    return buf.getvalue()
+
+
+class ProfileStore:
+    """Bounded, insertion-ordered store of recent profile reports."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._reports: OrderedDict[str, ProfileReport] = OrderedDict()
+
+    def add(self, report: ProfileReport) -> None:
+        with self._lock:
+            self._reports[report.request_id] = report
+            self._reports.move_to_end(report.request_id)
+            while len(self._reports) > self.max_entries:
+                self._reports.popitem(last=False)
+
+    def get(self, request_id: str) -> ProfileReport | None:
+        with self._lock:
+            return self._reports.get(request_id)
+
+    def list(self) -> list[ProfileReport]:
+        with self._lock:
+            return list(reversed(self._reports.values()))
+
+
+_config: Settings = settings
+profile_store = ProfileStore(settings.PROFILE_STORE_SIZE)
+
+
+def configure(config: Settings) -> None:
+    """Use ``config`` for profiling; ``profile_store`` keeps its reports (trimmed on add)."""
+    global _config
+    _config = config
+    profile_store.max_entries = config.PROFILE_STORE_SIZE
+
+
+_profiling_lock = threading.Lock()
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _write_to_disk(stats: pstats.Stats, report: ProfileReport) -> None:
+    directory = Path(_config.PROFILE_OUTPUT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = _UNSAFE_FILENAME_CHARS.sub("_", report.request_id)
+    stats.dump_stats(directory / f"{stem}.prof")
+    (directory / f"{stem}.txt").write_text(report.text)
+
+
+def _get_header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _error(status_code: int, code: str, message: str, request_id: str | None) -> JSONResponse:
+    body = ErrorResponse(error=ErrorBody(code=code, message=message), request_id=request_id).dict()
+    headers = {"X-Request-ID": request_id} if request_id else None
+    return JSONResponse(status_code=status_code, content=body, headers=headers)
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware running opted-in requests under the profiler."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not _config.PROFILING_ENABLED
+            or _get_header(scope, b"x-profile") != "1"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.get("state", {}).get("request_id")
+        if not security.is_authorized(_get_header(scope, b"x-api-key")):
+            response = _error(401, "UNAUTHORIZED", "valid API key required to profile", request_id)
+            await response(scope, receive, send)
+            return
+        if not _profiling_lock.acquire(blocking=False):
+            response = _error(409, "CONFLICT", "another request is being profiled", request_id)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self._profile(scope, receive, send, request_id)
+        finally:
+            _profiling_lock.release()
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, request_id: str) -> None:
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = request_id
+            await send(message)
+
+        session = ProfileSession(request_id)
+        token = _current_session.set(session)
+        started_at = time.perf_counter()
+        session.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stats = session.finish()
+            _current_session.reset(token)
+            report = ProfileReport(
+                request_id=request_id,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - started_at) * 1000, 2),
+                created_at=time.time(),
+                text=render_report(stats, _config.PROFILE_TOP_N),
+            )
+            profile_store.add(report)
+            if _config.PROFILE_OUTPUT_DIR:
+                _write_to_disk(stats, report)
+            log_json({"event": "profile.stored", **report.summary()}, level="info")
@@ -0,0 +1,183 @@
+"""Readiness state for ``GET /health/ready``.
+
+The database check runs on a background task every ``HEALTH_CHECK_INTERVAL_SECONDS`` and
+probes read the cached result, so orchestrator probes never open sessions of their own.
+Readiness also fails while the connection pool or the sync-endpoint threadpool is
+saturated, so load balancers stop routing to an overloaded worker until it catches up.
+
+A probe refreshes the check inline only when the cached one is stale, never while the pool
+is saturated (the checkout would queue behind requests for up to ``DB_POOL_TIMEOUT``), and
+waits at most ``READY_CHECK_TIMEOUT_SECONDS`` for it. Failures are logged; the response
+carries a generic reason only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+
+import anyio.to_thread
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+_config: Settings = settings
+
+CHECK_FAILED = "database check failed"
+CHECK_TIMED_OUT = "database check timed out"
+
+
+@dataclass
+class DatabaseCheck:
+    ok: bool
+    checked_at: float  # time.monotonic()
+    latency_ms: float
+    error: str | None = None
+
+
+def check_database(engine: Engine) -> DatabaseCheck:
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        error = None
+    except Exception:
+        # details stay in the server log; probes are often reachable from outside
+        logger.warning("readiness: database check failed", exc_info=True)
+        error = CHECK_FAILED
+    return DatabaseCheck(
+        ok=error is None,
+        checked_at=time.monotonic(),
+        latency_ms=round((time.perf_counter() - started) * 1000, 2),
+        error=error,
+    )
+
+
+def pool_status(engine: Engine) -> dict[str, object] | None:
+    """Checked-out connections against pool capacity (QueuePool only)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    capacity = pool.size() + max(_config.DB_MAX_OVERFLOW, 0)
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+def threadpool_status() -> dict[str, int]:
+    """Threadpool running sync endpoints: busy workers and requests queued for one.
+
+    Must be called from the event loop.
+    """
+    stats = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        "busy": stats.borrowed_tokens,
+        "size": int(stats.total_tokens),
+        "waiting": stats.tasks_waiting,
+    }
+
+
+class ReadinessMonitor:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_check: DatabaseCheck | None = None
+        self._task: asyncio.Task | None = None
+        self._refreshing: asyncio.Task | None = None
+
+    async def refresh(self, engine: Engine) -> DatabaseCheck:
+        # default executor, not the request threadpool, so a request backlog can't starve it
+        self.last_check = await asyncio.to_thread(check_database, engine)
+        return self.last_check
+
+    def _refresh_task(self, engine: Engine) -> asyncio.Task:
+        # one check at a time: the background loop and probes arriving meanwhile share it
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.get_running_loop().create_task(self.refresh(engine))
+        return self._refreshing
+
+    async def database_check(self, engine: Engine) -> DatabaseCheck:
+        """The cached check, refreshed inline only when the background task has fallen behind."""
+        check = self.last_check
+        if check is None or time.monotonic() - check.checked_at > 2 * self.interval:
+            timeout = _config.READY_CHECK_TIMEOUT_SECONDS
+            try:
+                # shielded: a timed-out check keeps running and updates last_check when done
+                check = await asyncio.wait_for(asyncio.shield(self._refresh_task(engine)), timeout)
+            except asyncio.TimeoutError:
+                check = DatabaseCheck(
+                    ok=False,
+                    checked_at=time.monotonic(),
+                    latency_ms=round(timeout * 1000, 2),
+                    error=CHECK_TIMED_OUT,
+                )
+        return check
+
+    async def _run(self, engine: Engine) -> None:
+        while True:
+            await self._refresh_task(engine)
+            await asyncio.sleep(self.interval)
+
+    def start(self, engine: Engine) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(engine))
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._refreshing = None
+
+    async def report(self, engine: Engine) -> tuple[bool, dict[str, object]]:
+        """Return ``(ready, body)`` for the readiness endpoint."""
+        pool = pool_status(engine)
+        threads = threadpool_status()
+        saturated = pool is not None and pool["saturation"] >= _config.READY_MAX_POOL_SATURATION
+        # a saturated pool has no connection to spare: report the cached check as it is
+        check = self.last_check if saturated else await self.database_check(engine)
+
+        reasons = []
+        if check is not None and not check.ok:
+            reasons.append("database unavailable")
+        if saturated:
+            reasons.append("connection pool saturated")
+        if threads["waiting"] > _config.READY_MAX_QUEUE_BACKLOG:
+            reasons.append("request queue backlog")
+
+        body = {
+            "status": "ready" if not reasons else "not_ready",
+            "reasons": reasons,
+            "database": (
+                None
+                if check is None
+                else {
+                    "status": "connected" if check.ok else "disconnected",
+                    "latency_ms": check.latency_ms,
+                    "checked_seconds_ago": round(time.monotonic() - check.checked_at, 3),
+                    "error": check.error,
+                }
+            ),
+            "pool": pool,
+            "threadpool": threads,
+        }
+        return not reasons, body
+
+
+readiness_monitor = ReadinessMonitor(settings.HEALTH_CHECK_INTERVAL_SECONDS)
+
+
+def configure(config: Settings) -> None:
+    """Use ``config`` for the readiness thresholds and ``readiness_monitor``'s interval."""
+    global _config
+    _config = config
+    readiness_monitor.interval = config.HEALTH_CHECK_INTERVAL_SECONDS
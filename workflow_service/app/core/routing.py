@@ -0,0 +1,51 @@
+"""Route class shared by all routers so cross-cutting hooks can wrap endpoints."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.routing import APIRoute
+
+from . import profiling, tracing
+
+
+def instrument_endpoint(endpoint: Callable[..., Any], path: str = "") -> Callable[..., Any]:
+    """Wrap an endpoint in a handler span and, for sync endpoints, the request's profiler.
+
+    A sync wrapper executes in the threadpool worker that runs the endpoint, which is the
+    only place a per-thread profiler can see the handler's work. ``functools.wraps``
+    keeps the signature FastAPI inspects for parameters and dependencies.
+    """
+    if getattr(endpoint, "__instrumented__", False):
+        return endpoint
+    span_name = f"handler {endpoint.__name__}"
+    attributes = {"code.function": endpoint.__qualname__, "http.route": path}
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracing.start_span(span_name, attributes=attributes):
+                return await endpoint(*args, **kwargs)
+
+        async_wrapper.__instrumented__ = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with tracing.start_span(span_name, attributes=attributes):
+            session = profiling.current_session()
+            if session is None:
+                return endpoint(*args, **kwargs)
+            return session.profile_call(endpoint, *args, **kwargs)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, instrument_endpoint(endpoint, path), **kwargs)
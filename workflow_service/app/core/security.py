@@ -1,20 +1,197 @@
-"""Security utilities for API key authentication."""
+"""Security utilities for API key authentication.
 
-from fastapi import Header, HTTPException, status
+Keys are loaded from ``API_KEYS_FILE`` (JSON, hot-reloaded when the file changes) and/or
+the single ``API_KEY`` setting, and are held only as SHA-256 digests. Each key carries a
+token-bucket rate limit and a concurrency limit, enforced on write routes by
+``enforce_write_limits`` so one noisy producer cannot saturate the database for everyone.
 
-from ..config import settings
+Key file format::
 
+    {"keys": [{"id": "ingest-bot", "sha256": "<hex digest of the key>",
+               "rate_per_second": 20, "burst": 40, "max_concurrency": 4}]}
 
-def verify_api_key(x_api_key: str = Header(None)) -> str:
+Limits omitted for a key fall back to ``API_KEY_RATE_PER_SECOND``, ``API_KEY_BURST`` and
+``API_KEY_MAX_CONCURRENCY``, which default to ``0``: unlimited (a burst of ``0`` is one
+second's worth of the rate).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from fastapi import Depends, Header, HTTPException, status
+
+from ..config import Settings, settings
+from .metrics import API_KEY_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(key: str) -> str:
+    """SHA-256 hex digest stored in the key file instead of the key itself."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``burst``; one token per request."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token; return 0.0 on success or the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+
+class ConcurrencyLimit:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+@dataclass
+class ApiKey:
+    key_id: str
+    key_hash: str
+    rate_per_second: float = 0.0
+    burst: int = 1
+    max_concurrency: int = 0
+    bucket: TokenBucket | None = field(default=None, repr=False, compare=False)
+    concurrency: ConcurrencyLimit | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.rate_per_second > 0:
+            self.bucket = TokenBucket(self.rate_per_second, self.burst)
+        if self.max_concurrency > 0:
+            self.concurrency = ConcurrencyLimit(self.max_concurrency)
+
+
+# principal for dev mode (no keys configured): open access, no limits
+DEV_KEY = ApiKey(key_id="dev-mode", key_hash="")
+
+
+class ApiKeyStore:
+    """In-memory index of key digests, reloaded when the key file changes."""
+
+    def __init__(self, config: Settings):
+        self.config = config
+        self._lock = threading.Lock()
+        self._index: dict[str, ApiKey] = {}
+        self._mtime: float | None = None
+        self._next_check = 0.0
+        self._load()
+
+    @property
+    def path(self) -> str | None:
+        return self.config.API_KEYS_FILE
+
+    def _key_from(self, entry: dict) -> ApiKey:
+        config = self.config
+        rate = float(entry.get("rate_per_second", config.API_KEY_RATE_PER_SECOND))
+        return ApiKey(
+            key_id=entry["id"],
+            key_hash=entry["sha256"].lower(),
+            rate_per_second=rate,
+            burst=int(entry.get("burst", config.API_KEY_BURST)) or math.ceil(rate),
+            max_concurrency=int(entry.get("max_concurrency", config.API_KEY_MAX_CONCURRENCY)),
+        )
+
+    def _load(self) -> None:
+        keys = []
+        if self.config.API_KEY:
+            keys.append(
+                self._key_from({"id": "default", "sha256": hash_api_key(self.config.API_KEY)})
+            )
+        if self.path:
+            self._mtime = os.stat(self.path).st_mtime
+            with open(self.path, encoding="utf-8") as fh:
+                keys.extend(self._key_from(entry) for entry in json.load(fh)["keys"])
+
+        index = {}
+        for key in keys:
+            # keep the limiter state of keys whose definition did not change
+            previous = self._index.get(key.key_hash)
+            index[key.key_hash] = previous if previous == key else key
+        self._index = index
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if not self.path or now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.config.API_KEYS_RELOAD_SECONDS
+            try:
+                if os.stat(self.path).st_mtime != self._mtime:
+                    self._load()
+                    logger.info("api keys reloaded from %s (%d keys)", self.path, len(self._index))
+            except (OSError, ValueError, KeyError):
+                # keep serving the last good key set
+                logger.exception("api keys: reload from %s failed", self.path)
+
+    @property
+    def open_access(self) -> bool:
+        return not self.config.API_KEY and not self.path
+
+    def lookup(self, presented: str | None) -> ApiKey | None:
+        if not presented:
+            return None
+        self._reload_if_changed()
+        # the dict is keyed by digest: a match is found by hashing, not by comparing secrets
+        return self._index.get(hash_api_key(presented))
+
+
+key_store = ApiKeyStore(settings)
+
+
+def configure(config: Settings) -> None:
+    """Load the keys of ``config``; limiter state starts over."""
+    global key_store
+    key_store = ApiKeyStore(config)
+
+
+def verify_api_key(x_api_key: str = Header(None)) -> ApiKey:
     """
     Verify API key for write operations.
 
     Reads from header: X-API-Key
-    Returns the key if valid, raises 401 if missing or invalid.
+    Returns the matching key, raises 401 if missing or invalid.
     """
-    if not settings.API_KEY:
+    if key_store.open_access:
         # No API key configured = open access (dev mode)
-        return "dev-mode"
+        return DEV_KEY
 
     if not x_api_key:
         raise HTTPException(
@@ -23,11 +200,46 @@ def verify_api_key(x_api_key: str = Header(None)) -> str:
             headers={"WWW-Authenticate": "ApiKey"},
         )
 
-    if x_api_key != settings.API_KEY:
+    api_key = key_store.lookup(x_api_key)
+    if api_key is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
             headers={"WWW-Authenticate": "ApiKey"},
         )
 
-    return x_api_key
+    return api_key
+
+
+def enforce_write_limits(api_key: ApiKey = Depends(verify_api_key)) -> Iterator[ApiKey]:
+    """Apply the key's rate and concurrency limits while a write endpoint runs.
+
+    Declare it with ``scope="function"`` so the concurrency slot is released when the
+    endpoint returns rather than after the response has been sent.
+    """
+    if api_key.bucket is not None:
+        retry_after = api_key.bucket.try_acquire()
+        if retry_after:
+            API_KEY_REJECTIONS.labels(key_id=api_key.key_id, reason="rate").inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+    if api_key.concurrency is not None and not api_key.concurrency.try_acquire():
+        API_KEY_REJECTIONS.labels(key_id=api_key.key_id, reason="concurrency").inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="too many concurrent requests",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield api_key
+    finally:
+        if api_key.concurrency is not None:
+            api_key.concurrency.release()
+
+
+def is_authorized(x_api_key: str | None) -> bool:
+    """Return True if ``x_api_key`` would pass ``verify_api_key`` (always True in dev mode)."""
+    return key_store.open_access or key_store.lookup(x_api_key) is not None
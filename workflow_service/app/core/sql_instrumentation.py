@@ -0,0 +1,139 @@
+"""Per-request SQL instrumentation.
+
+Global ``before_cursor_execute``/``after_cursor_execute`` hooks on every ``Engine`` add each
+statement's count and duration to the ``RequestSqlStats`` of the current request. The
+request middleware installs the stats object in a context variable; Starlette copies the
+context into threadpool workers, so statements run by sync endpoints and dependencies are
+attributed to the right request. When tracing is enabled each statement is also recorded
+as a ``db.query`` span under the current span, and the outcome of SQLAlchemy's compiled
+statement cache lookup is counted in ``sql_compiled_cache_total``.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHING_DISABLED,
+    NO_CACHE_KEY,
+    NO_DIALECT_SUPPORT,
+)
+
+from ..config import Settings, settings
+from ..utils.logging import log_json
+from . import tracing
+from .metrics import SQL_COMPILED_CACHE
+
+
+@dataclass
+class RequestSqlStats:
+    request_id: str | None = None
+    query_count: int = 0
+    total_ms: float = 0.0
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.query_count} queries"'
+
+
+_current_stats: ContextVar[RequestSqlStats | None] = ContextVar("request_sql_stats", default=None)
+_config: Settings = settings
+
+
+def begin_request(request_id: str) -> tuple[RequestSqlStats, Token]:
+    stats = RequestSqlStats(request_id=request_id)
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def current_stats() -> RequestSqlStats | None:
+    return _current_stats.get()
+
+
+def query_budget_for(route: str) -> int:
+    return _config.SQL_ROUTE_QUERY_BUDGETS.get(route, _config.SQL_QUERY_BUDGET)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|:\w+|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|%s))+\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse a statement to its shape: literals and placeholder lists become ``?``."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+_CACHE_RESULTS = {
+    CACHE_HIT: "hit",
+    CACHE_MISS: "miss",
+    CACHING_DISABLED: "disabled",
+    NO_CACHE_KEY: "no_cache_key",
+    NO_DIALECT_SUPPORT: "no_dialect_support",
+}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    span = tracing.begin_span(
+        "db.query",
+        tracing.SPAN_KIND_CLIENT,
+        {"db.system": conn.dialect.name, "db.statement": normalize_sql(statement)},
+    )
+    conn.info.setdefault("query_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    tracing.end_span(conn.info["query_spans"].pop())
+    cache_result = getattr(context, "cache_hit", None)
+    if cache_result is not None:
+        SQL_COMPILED_CACHE.labels(result=_CACHE_RESULTS.get(cache_result, "other")).inc()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.total_ms += elapsed_ms
+    if elapsed_ms >= _config.SLOW_QUERY_MS:
+        log_json(
+            {
+                "event": "sql.slow_query",
+                "duration_ms": round(elapsed_ms, 2),
+                "statement": normalize_sql(statement),
+                "request_id": stats.request_id if stats else None,
+            },
+            level="warning",
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # a failed statement never reaches after_cursor_execute; drop its start time and span
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+        tracing.end_span(conn.info["query_spans"].pop(), error=True)
+
+
+def install(config: Settings = settings) -> None:
+    """Register the cursor hooks on all engines (idempotent); budgets and thresholds from
+    ``config``."""
+    global _config
+    _config = config
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
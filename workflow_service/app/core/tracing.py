@@ -0,0 +1,324 @@
+"""Lightweight in-process tracing.
+
+Spans are opened by the request middleware (server span), ``InstrumentedRoute`` (route
+handler), ``@traced`` service functions and the SQL cursor hooks (one span per
+statement). Parent/child links follow a context variable, which Starlette copies into
+threadpool workers. The trace id is derived from the request's ``X-Request-ID``, so spans
+and log lines correlate on the same id.
+
+Finished spans are buffered in memory and exported in batches by a background thread as
+OTLP/JSON (``ExportTraceServiceRequest``), one JSON document per line, to a file or stdout.
+Tracing is off unless ``TRACING_ENABLED`` is set; disabled, each hook is a single
+``None`` check.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any
+
+from ..config import Settings
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def trace_id_for(request_id: str) -> str:
+    """Map a request id onto a 128-bit trace id (UUID request ids map one-to-one)."""
+    try:
+        return uuid.UUID(request_id).hex
+    except ValueError:
+        return hashlib.sha256(request_id.encode()).hexdigest()[:32]
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status_code",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: str | None,
+        kind: int,
+        attributes: dict[str, Any] | None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = dict(attributes or {})
+        self.status_code = STATUS_OK
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class FileSpanExporter:
+    """Append one OTLP/JSON document per batch to a file (or a stream such as stdout)."""
+
+    def __init__(self, service_name: str, path: str | None = None, stream=None):
+        self.service_name = service_name
+        self.path = path
+        self.stream = stream
+
+    def export(self, spans: list[Span]) -> None:
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", self.service_name)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "workflow_service"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(document, separators=(",", ":")) + "\n"
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+        else:
+            stream = self.stream or sys.stdout
+            stream.write(line)
+            stream.flush()
+
+
+class BatchSpanProcessor:
+    """Buffer finished spans and export them from a background thread in batches."""
+
+    def __init__(
+        self,
+        exporter: FileSpanExporter,
+        batch_size: int = 512,
+        export_interval: float = 5.0,
+        max_queue_size: int = 10000,
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.export_interval = export_interval
+        self.dropped = 0
+        self._queue: deque[Span] = deque(maxlen=max_queue_size)
+        self._condition = threading.Condition()
+        self._export_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1  # deque drops the oldest span
+            self._queue.append(span)
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._queue) < self.batch_size:
+                    self._condition.wait(self.export_interval)
+                stopped = self._stopped
+            self.force_flush()
+            if stopped:
+                return
+
+    def force_flush(self) -> None:
+        with self._export_lock:
+            while True:
+                with self._condition:
+                    batch = [
+                        self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))
+                    ]
+                if not batch:
+                    return
+                try:
+                    self.exporter.export(batch)
+                except Exception:
+                    self.dropped += len(batch)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout=self.export_interval + 1)
+        self.force_flush()
+
+
+_processor: BatchSpanProcessor | None = None
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def configure_tracing(config: Settings) -> BatchSpanProcessor | None:
+    """Start the span processor when tracing is enabled (idempotent)."""
+    if not config.TRACING_ENABLED or _processor is not None:
+        return _processor
+    if config.TRACING_EXPORTER == "stdout":
+        exporter = FileSpanExporter(config.PROJECT_NAME)
+    else:
+        exporter = FileSpanExporter(config.PROJECT_NAME, path=config.TRACING_FILE_PATH)
+    return set_processor(
+        BatchSpanProcessor(
+            exporter,
+            batch_size=config.TRACING_BATCH_SIZE,
+            export_interval=config.TRACING_EXPORT_INTERVAL_SECONDS,
+            max_queue_size=config.TRACING_MAX_QUEUE_SIZE,
+        )
+    )
+
+
+def set_processor(processor: BatchSpanProcessor | None) -> BatchSpanProcessor | None:
+    global _processor
+    if _processor is None and processor is not None:
+        atexit.register(shutdown_tracing)
+    _processor = processor
+    return processor
+
+
+def shutdown_tracing() -> None:
+    """Export buffered spans and stop the exporter thread."""
+    global _processor
+    if _processor is not None:
+        _processor.shutdown()
+        _processor = None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def set_current_span(span: Span | None) -> Token:
+    return _current_span.set(span)
+
+
+def reset_current_span(token: Token) -> None:
+    _current_span.reset(token)
+
+
+def begin_span(
+    name: str,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: dict[str, Any] | None = None,
+    trace_id: str | None = None,
+) -> Span | None:
+    """Open a span as a child of the current one; does not make it current.
+
+    Without a current span a span is only started when ``trace_id`` is given (a root), so
+    work outside of a traced request is not traced.
+    """
+    if _processor is None:
+        return None
+    parent = _current_span.get()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, kind, attributes)
+    if trace_id is None:
+        return None
+    return Span(name, trace_id, None, kind, attributes)
+
+
+def end_span(span: Span | None, error: bool = False) -> None:
+    if span is None:
+        return
+    span.end_ns = time.time_ns()
+    if error:
+        span.status_code = STATUS_ERROR
+    processor = _processor
+    if processor is not None:
+        processor.on_end(span)
+
+
+@contextmanager
+def use_span(span: Span | None) -> Iterator[Span | None]:
+    """Make ``span`` current for the block and end it afterwards."""
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    error = False
+    try:
+        yield span
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _current_span.reset(token)
+        end_span(span, error=error)
+
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, attributes: dict[str, Any] | None = None):
+    return use_span(begin_span(name, kind, attributes))
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator recording each call of a sync function as a span named ``name``."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _processor is None or _current_span.get() is None:
+                return func(*args, **kwargs)
+            with start_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
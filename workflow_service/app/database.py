@@ -1,30 +1,234 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import itertools
+import logging
+import threading
+import time
 
-from .config import settings
+from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
+from .config import Settings, settings
 
-def _get_engine_kwargs(database_url: str) -> dict:
+logger = logging.getLogger(__name__)
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+
+def _get_engine_kwargs(database_url: str, config: Settings = settings) -> dict:
     """Return engine configuration based on database type."""
     if database_url.startswith("sqlite"):
-        return {"connect_args": {"check_same_thread": False}}
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if not _is_memory_sqlite(database_url):
+            # file databases use a QueuePool; in-memory ones keep SQLAlchemy's default pool
+            kwargs.update(
+                pool_size=config.DB_POOL_SIZE,
+                max_overflow=config.DB_MAX_OVERFLOW,
+                pool_timeout=config.DB_POOL_TIMEOUT,
+            )
+        return kwargs
     elif database_url.startswith("postgresql"):
-        # Use NullPool for serverless/short-lived processes, or QueuePool with reasonable settings
         return {
             "pool_pre_ping": True,  # Verify connections before using
-            "pool_recycle": 3600,  # Recycle connections after 1 hour
+            "pool_recycle": config.DB_POOL_RECYCLE,
+            "pool_size": config.DB_POOL_SIZE,
+            "max_overflow": config.DB_MAX_OVERFLOW,
+            "pool_timeout": config.DB_POOL_TIMEOUT,
         }
     return {}
 
 
-engine = create_engine(settings.DATABASE_URL, **_get_engine_kwargs(settings.DATABASE_URL))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def sqlite_pragmas(database_url: str, config: Settings = settings) -> list[str]:
+    """PRAGMA statements run on every new SQLite connection (empty when not tuned)."""
+    if not database_url.startswith("sqlite") or not config.SQLITE_TUNED:
+        return []
+    pragmas = [
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size={int(config.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}",
+    ]
+    if not _is_memory_sqlite(database_url):
+        # WAL and mmap only apply to file databases
+        pragmas.insert(0, f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}")
+        pragmas.append(f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}")
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: list[str]) -> None:
+    """Run ``pragmas`` on each connection the engine opens."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def build_engine(database_url: str, config: Settings = settings) -> Engine:
+    engine = create_engine(database_url, **_get_engine_kwargs(database_url, config))
+    apply_sqlite_pragmas(engine, sqlite_pragmas(database_url, config))
+    return engine
+
+
+class ReplicaSet:
+    """Round-robin selection over read replica engines.
+
+    A replica whose connection attempt fails is skipped for ``retry_seconds`` and then
+    tried again; while every replica is down, reads go to the primary.
+    """
+
+    def __init__(self, engines: list[Engine], retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+        self._down_until: dict[int, float] = {}
+
+    def candidates(self) -> list[Engine]:
+        """Healthy replicas, starting with the next one in round-robin order."""
+        if not self.engines:
+            return []
+        with self._lock:
+            start = next(self._next) % len(self.engines)
+        now = time.monotonic()
+        ordered = self.engines[start:] + self.engines[:start]
+        return [e for e in ordered if self._down_until.get(id(e), 0.0) <= now]
+
+    def mark_down(self, engine: Engine) -> None:
+        with self._lock:
+            self._down_until[id(engine)] = time.monotonic() + self.retry_seconds
+
+
+def _replica_urls(value: str | None) -> list[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+
 Base = declarative_base()
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# ``engine``, ``SessionLocal`` (the one session factory bound to it) and ``replicas`` are
+# built on first access from the settings passed to ``configure`` (see ``__getattr__``),
+# so importing the app does not create engines. Once built they are plain module
+# attributes; assigning them (as tests do) replaces them.
+_LAZY = ("engine", "SessionLocal", "replicas")
+_config: Settings = settings
+_build_lock = threading.RLock()
+
+
+def configure(config: Settings) -> None:
+    """Use ``config`` for the lazily built engine, session factory and replicas.
+
+    Objects built for a different configuration are discarded (not disposed: sessions
+    may still hold their connections).
+    """
+    global _config
+    with _build_lock:
+        if config is not _config:
+            _config = config
+            for name in _LAZY:
+                globals().pop(name, None)
+
+
+def _build(name: str):
+    with _build_lock:
+        namespace = globals()
+        if name not in namespace:
+            if name == "engine":
+                namespace[name] = build_engine(_config.DATABASE_URL, _config)
+            elif name == "SessionLocal":
+                namespace[name] = sessionmaker(
+                    autocommit=False, autoflush=False, bind=_get("engine")
+                )
+            else:
+                engines = [
+                    build_engine(url, _config) for url in _replica_urls(_config.READ_DATABASE_URL)
+                ]
+                namespace[name] = ReplicaSet(engines, _config.REPLICA_RETRY_SECONDS)
+        return namespace[name]
+
+
+def _get(name: str):
+    # a global lookup, not ``__getattr__``, so assigned attributes win
+    value = globals().get(name)
+    return value if value is not None else _build(name)
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return _get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_engine() -> Engine:
+    return _get("engine")
+
+
+def get_session_factory() -> sessionmaker:
+    return _get("SessionLocal")
 
 
 # Dependency for FastAPI
 def get_db():
-    db = SessionLocal()
+    db = get_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _open_replica_session() -> Session | None:
+    for replica in _get("replicas").candidates():
+        session = ReadSessionLocal(bind=replica)
+        try:
+            session.connection()  # check out (and pre-ping) a connection now
+        except DBAPIError:
+            session.close()
+            _get("replicas").mark_down(replica)
+            logger.warning("read replica %s unavailable; skipping it", replica.url)
+            continue
+        return session
+    return None
+
+
+class LazyReadSession:
+    """Stands in for the read session of a request until it is first used.
+
+    Only then is a replica chosen and a connection checked out (or the primary session
+    used), so a request that never reads, e.g. a record cache hit, pays for neither, and
+    the checkout happens inside the route's admission slot rather than while dependencies
+    are resolved.
+    """
+
+    def __init__(self, primary: Session):
+        self._primary = primary
+        self._session: Session | None = None
+
+    def _get(self) -> Session:
+        if self._session is None:
+            self._session = _open_replica_session() or self._primary
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self._get(), name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+# Dependency for read-only routes: a replica session, or the primary session as fallback,
+# opened on first use. Function-scoped like the admission slot it runs under (see
+# core.admission.admit).
+def get_read_db(primary: Session = Depends(get_db, scope="function")):
+    db = LazyReadSession(primary)
     try:
         yield db
     finally:
@@ -1,106 +1,186 @@
-import json
-import logging
+import asyncio
 import os
 import time
 import uuid
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from . import database
 from .api import (
     health,  # existing
+    metrics,
+    profiles,
     records,
     reports,  # existing
 )
+from .config import Settings, settings
+from .core import admission, profiling, readiness, security, sql_instrumentation, tracing
+from .core.metrics import (
+    SQL_QUERY_BUDGET_EXCEEDED,
+    instrument_engine,
+    mark_worker_dead,
+    observe_request,
+)
+from .core.profiling import ProfilingMiddleware
+from .core.readiness import readiness_monitor
+from .core.warmup import warm_up
 from .exceptions import DomainError
 from .schemas.error import ErrorBody, ErrorResponse
+from .services import notifications, outbox, record_cache, webhooks
+from .utils import log_sampling
+from .utils.log_sampling import RequestLogSampler, request_log_sampler
+from .utils.logging import configure_logging, log_json, logger
 
 APP_VERSION = os.getenv("APP_VERSION", "0.1.0")
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
-# configure a service logger; we will log structured JSON strings to stdout
-logger = logging.getLogger("workflow_service")
-# Avoid adding duplicate handlers if module is imported more than once
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter("%(message)s"))
-    logger.addHandler(handler)
-# Prevent double-logging via propagation to root handlers
-logger.propagate = False
-logger.setLevel(LOG_LEVEL)
 
+def _get_header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
-def _log_json(obj: dict, level: str = "info"):
-    try:
-        payload = json.dumps(obj, default=str)
-    except Exception:
-        payload = json.dumps({"msg": "failed to serialize log object"})
-    getattr(logger, level)(payload)
 
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware: assigns the request id and logs request start/end.
+
+    It also opens the request's server span; the trace id is derived from the request id.
+
+    With sampling enabled the start line is held back until the request finishes, so it
+    is only written for requests whose end line is kept.
+    """
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, sampler: RequestLogSampler = request_log_sampler):
+        self.app = app
+        self.sampler = sampler
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
-        started_at = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
         # support X-Request-ID header propagation
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        request.state.request_id = request_id
-
-        _log_json(
-            {
-                "event": "request.start",
-                "method": request.method,
-                "path": request.url.path,
-                "request_id": request_id,
-            },
-            level="info",
-        )
+        request_id = _get_header(scope, b"x-request-id") or str(uuid.uuid4())
+        # request.state.request_id for handlers (Request.state is backed by scope["state"])
+        scope.setdefault("state", {})["request_id"] = request_id
+        method = scope["method"]
+        path = scope["path"]
 
-        try:
-            response = await call_next(request)
-        except Exception:
-            # Let global exception handlers deal with it; re-raise to ensure they run
-            raise
-
-        duration_ms = int((time.time() - started_at) * 1000)
-
-        _log_json(
-            {
-                "event": "request.end",
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_ms": duration_ms,
-                "request_id": request_id,
-            },
-            level="info",
-        )
-        # attach request id header back to client
-        response.headers["X-Request-ID"] = request_id
-        return response
+        sampler = self.sampler
+        start_line = {
+            "event": "request.start",
+            "method": method,
+            "path": path,
+            "request_id": request_id,
+        }
+        defer_start = sampler.merge_start_end or sampler.sampling_enabled
+        if not defer_start:
+            log_json(start_line, level="info")
 
+        status_code = 500
+        sql_stats, sql_token = sql_instrumentation.begin_request(request_id)
+        span = tracing.begin_span(
+            f"{method} {path}",
+            tracing.SPAN_KIND_SERVER,
+            {"http.method": method, "http.target": path, "request.id": request_id},
+            trace_id=tracing.trace_id_for(request_id),
+        )
 
-app = FastAPI(title="Workflow Service", version=APP_VERSION)
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                # attach request id header back to client
+                headers["X-Request-ID"] = request_id
+                headers.append("Server-Timing", sql_stats.server_timing())
+            await send(message)
 
-# NOTE: Table creation is handled by Alembic migrations (see alembic/README.md)
-# For local dev, run: alembic upgrade head
+        span_token = tracing.set_current_span(span)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            tracing.reset_current_span(span_token)
+            sql_instrumentation.end_request(sql_token)
+            duration = time.perf_counter() - started_at
+            duration_ms = int(duration * 1000)
+            # route template (e.g. /records/{record_id}) once routing has run
+            route = getattr(scope.get("route"), "path", None)
+            if span is not None:
+                span.name = f"{method} {route or 'unmatched'}"
+                span.set_attribute("http.route", route or "unmatched")
+                span.set_attribute("http.status_code", status_code)
+                tracing.end_span(span, error=status_code >= 500)
+            observe_request(method, route or "unmatched", status_code, duration)
+            budget = sql_instrumentation.query_budget_for(route or path)
+            over_budget = sql_stats.query_count > budget
+            if over_budget:
+                SQL_QUERY_BUDGET_EXCEEDED.labels(route=route or "unmatched").inc()
+                log_json(
+                    {
+                        "event": "sql.query_budget_exceeded",
+                        "method": method,
+                        "route": route or path,
+                        "db_queries": sql_stats.query_count,
+                        "query_budget": budget,
+                        "request_id": request_id,
+                    },
+                    level="warning",
+                )
+            rate = sampler.decide(route or path, status_code, duration_ms)
+            if rate is not None:
+                end_line = {
+                    "event": "request" if sampler.merge_start_end else "request.end",
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "duration_ms": duration_ms,
+                    "db_queries": sql_stats.query_count,
+                    "db_ms": round(sql_stats.total_ms, 2),
+                    "request_id": request_id,
+                }
+                if over_budget:
+                    end_line["query_budget_exceeded"] = True
+                if rate < 1.0:
+                    end_line["sample_rate"] = rate
+                if defer_start and not sampler.merge_start_end:
+                    log_json(start_line, level="info")
+                log_json(end_line, level="info")
 
-# add logging middleware and exception handlers
-app.add_middleware(RequestLoggingMiddleware)
 
-# include routers
-app.include_router(health.router)
-app.include_router(records.router)
-app.include_router(reports.router)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    config: Settings = app.state.settings
+    if config.WARMUP_ENABLED:
+        # open pool connections and compile hot statements before taking traffic
+        await asyncio.to_thread(warm_up, database.engine, database.SessionLocal, config)
+    instrument_engine(database.engine)
+    # relay Postgres NOTIFY to in-process long-poll waiters (no-op on SQLite)
+    listener = notifications.start_listener(database.engine)
+    # keep the /health/ready database check warm without per-probe queries
+    readiness_monitor.start(database.engine)
+    # deliver outbox events to the configured webhooks (no-op without endpoints)
+    dispatcher = webhooks.start_dispatcher(config, database.SessionLocal)
+    try:
+        yield
+    finally:
+        if dispatcher:
+            await asyncio.to_thread(dispatcher.stop)
+        await readiness_monitor.stop()
+        if listener:
+            listener.stop()
+        mark_worker_dead(os.getpid())
+        tracing.shutdown_tracing()
 
 
 # Exception handlers: domain errors -> structured JSON
-@app.exception_handler(DomainError)
 async def domain_error_handler(request: Request, exc: DomainError):
     request_id = getattr(request.state, "request_id", None)
     body = ErrorResponse(
@@ -112,14 +192,13 @@ async def domain_error_handler(request: Request, exc: DomainError):
         request_id=request_id,
     ).dict()
     # log with stackless context
-    _log_json(
+    log_json(
         {"event": "domain.error", "error": body["error"], "request_id": request_id}, level="warning"
     )
     return JSONResponse(status_code=getattr(exc, "status_code", 400), content=body)
 
 
 # Pydantic/validation errors -> standardized 422 body
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     request_id = getattr(request.state, "request_id", None)
     details = exc.errors()
@@ -127,14 +206,31 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         error=ErrorBody(code="VALIDATION_ERROR", message="Validation failed", details=details),
         request_id=request_id,
     ).dict()
-    _log_json(
+    log_json(
         {"event": "validation.error", "details": details, "request_id": request_id}, level="warning"
     )
     return JSONResponse(status_code=422, content=body)
 
 
+# pool checkout timed out (admission control let too much through) -> 503, not a generic 500
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    request_id = getattr(request.state, "request_id", None)
+    body = ErrorResponse(
+        error=ErrorBody(code="SERVICE_UNAVAILABLE", message="database connection pool exhausted"),
+        request_id=request_id,
+    ).dict()
+    log_json(
+        {"event": "db.pool_timeout", "error": body["error"], "request_id": request_id},
+        level="warning",
+    )
+    return JSONResponse(
+        status_code=503,
+        content=body,
+        headers={"Retry-After": str(request.app.state.settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
 # HTTPException -> standardized error response
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     request_id = getattr(request.state, "request_id", None)
     # Map common HTTP status codes to error codes
@@ -145,14 +241,16 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         404: "NOT_FOUND",
         409: "CONFLICT",
         422: "VALIDATION_ERROR",
+        429: "RATE_LIMITED",
         500: "INTERNAL_ERROR",
+        503: "SERVICE_UNAVAILABLE",
     }
     error_code = error_code_map.get(exc.status_code, "HTTP_ERROR")
     body = ErrorResponse(
         error=ErrorBody(code=error_code, message=exc.detail, details=None),
         request_id=request_id,
     ).dict()
-    _log_json(
+    log_json(
         {
             "event": "http.error",
             "status_code": exc.status_code,
@@ -161,11 +259,11 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         },
         level="warning",
     )
-    return JSONResponse(status_code=exc.status_code, content=body)
+    # keep WWW-Authenticate / Retry-After set by the raiser
+    return JSONResponse(status_code=exc.status_code, content=body, headers=exc.headers)
 
 
 # catch-all for unexpected errors -> 500 but safe response
-@app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", None)
     # log full stack trace for server-side investigation
@@ -174,4 +272,64 @@ async def generic_exception_handler(request: Request, exc: Exception):
         error=ErrorBody(code="INTERNAL_ERROR", message="Internal server error"),
         request_id=request_id,
     ).dict()
-    return JSONResponse(status_code=500, content=body)
+    # this handler runs outside the request middleware, so set the header here
+    headers = {"X-Request-ID": request_id} if request_id else None
+    return JSONResponse(status_code=500, content=body, headers=headers)
+
+
+def create_app(config: Settings = settings) -> FastAPI:
+    """Build the application for ``config``.
+
+    Process-wide setup happens here rather than at import: logging, tracing and the SQL
+    hooks, and the per-worker singletons (admission, API keys, record cache, webhook
+    outbox, readiness, profiling, log sampling) are configured from ``config``. The engine and the shared
+    session factory are created on first use (``database.configure``); the lifespan
+    optionally warms them up before serving.
+    Run with ``uvicorn --factory workflow_service.app.main:create_app``.
+    """
+    # structured JSON is written to stdout from a queue listener thread
+    configure_logging(config.LOG_LEVEL)
+    # count statements and DB time per request on every engine
+    sql_instrumentation.install(config)
+    # buffer spans and export them in batches when TRACING_ENABLED is set
+    tracing.configure_tracing(config)
+    database.configure(config)
+    admission.configure(config)
+    security.configure(config)
+    record_cache.configure(config)
+    outbox.configure(config)
+    readiness.configure(config)
+    profiling.configure(config)
+    log_sampling.configure(config)
+
+    app = FastAPI(title="Workflow Service", version=APP_VERSION, lifespan=lifespan)
+    app.state.settings = config
+
+    # NOTE: Table creation is handled by Alembic migrations (see alembic/README.md)
+    # For local dev, run: alembic upgrade head
+
+    # add logging middleware and exception handlers (the last added middleware is outermost)
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+
+    # include routers
+    app.include_router(health.router)
+    app.include_router(metrics.router)
+    app.include_router(profiles.router)
+    app.include_router(records.router)
+    app.include_router(reports.router)
+
+    app.add_exception_handler(DomainError, domain_error_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(Exception, generic_exception_handler)
+    return app
+
+
+def __getattr__(name: str):
+    # ``main.app`` is built with the environment's settings on first access, not at import
+    if name == "app":
+        globals()["app"] = app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1 +1,5 @@
 from ..database import Base as Base
+from .outbox import OutboxEvent as OutboxEvent
+from .outbox import WebhookCursor as WebhookCursor
+from .record import Record as Record
+from .record_change import RecordChange as RecordChange
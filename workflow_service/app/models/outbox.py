@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+from .txid import current_txid
+
+
+class OutboxEvent(Base):
+    """Webhook event written in the same transaction as the record change it describes."""
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # delivery order (see models.txid)
+        Index("ix_outbox_events_txid_id", "txid", "id"),
+    )
+
+    # event id sent to receivers (SQLite only autoincrements INTEGER)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    # writing transaction; events are delivered in (txid, id) order
+    txid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=current_txid(), server_default="0"
+    )
+    event: Mapped[str] = mapped_column(String(64), nullable=False)  # record.processed|failed
+    record_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    # the event as delivered, serialized once at write time
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent id={self.id} event={self.event} record_id={self.record_id}>"
+
+
+class WebhookCursor(Base):
+    """Delivery position, retry state and lease of one webhook endpoint."""
+
+    __tablename__ = "webhook_cursors"
+
+    endpoint: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # (txid, id) of the last outbox event delivered (or given up on)
+    last_txid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    last_event_id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), nullable=False, default=0
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # the worker delivering for this endpoint; other workers skip it until the lease expires
+    lease_owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    leased_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<WebhookCursor endpoint={self.endpoint} "
+            f"position=({self.last_txid}, {self.last_event_id})>"
+        )
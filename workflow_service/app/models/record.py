@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import JSON, DateTime, String, Text
+from sqlalchemy import JSON, DateTime, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base  # adjust if Base is defined elsewhere
+from ..utils.ids import new_record_id
 
 
 class StatusEnum(PyEnum):
@@ -18,9 +19,15 @@ class StatusEnum(PyEnum):
 
 class Record(Base):
     __tablename__ = "records"
+    __table_args__ = (
+        # newest-first listing and keyset pagination order by (created_at, id)
+        Index("ix_records_created_at_id", "created_at", "id"),
+        # ingest dedup looks up the newest record with a hash inside the window
+        Index("ix_records_content_hash_created_at", "content_hash", "created_at"),
+    )
 
-    # primary key as uuid string
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # primary key as time-ordered uuid (v7) string, so inserts append to the index
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_record_id)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     status: Mapped[str] = mapped_column(
@@ -31,8 +38,11 @@ class Record(Base):
     source: Mapped[str] = mapped_column(String(128), nullable=False)
     category: Mapped[str] = mapped_column(String(128), nullable=False)
 
-    # free-form JSON payload
-    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # free-form JSON payload; JSONB on Postgres so it can be filtered on and indexed
+    # (see services.payload_filters)
+    payload: Mapped[dict] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=False
+    )
 
     # optional outcome fields
     classification: Mapped[str | None] = mapped_column(String(64), nullable=True)
@@ -41,5 +51,8 @@ class Record(Base):
     )  # change to Float if desired
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # sha256 of (source, category, canonical payload); see services.dedup
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     def __repr__(self) -> str:
         return f"<Record id={self.id} status={self.status} source={self.source} category={self.category}>"
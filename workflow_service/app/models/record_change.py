@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+from .txid import current_txid
+
+
+class RecordChange(Base):
+    """Append-only log of record state transitions, read in commit order (txid, id)."""
+
+    __tablename__ = "record_changes"
+    __table_args__ = (Index("ix_record_changes_txid_id", "txid", "id"),)
+
+    # change sequence; exposed to SSE clients as the event id (SQLite only autoincrements INTEGER)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    record_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    event: Mapped[str] = mapped_column(
+        String(32), nullable=False
+    )  # created|processed|failed|requeued
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    source: Mapped[str] = mapped_column(String(128), nullable=False)
+    category: Mapped[str] = mapped_column(String(128), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # writing transaction (see models.txid)
+    txid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=current_txid(), server_default="0"
+    )
+
+    def __repr__(self) -> str:
+        return f"<RecordChange id={self.id} record_id={self.record_id} event={self.event}>"
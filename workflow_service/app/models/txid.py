@@ -0,0 +1,56 @@
+"""Commit-ordered positions for the append-only logs (outbox_events, record_changes).
+
+An autoincrement id is assigned at INSERT but only becomes visible at COMMIT. On
+PostgreSQL, with writers committing out of order, a reader following ``id > cursor`` can
+see id 11 before id 10 commits and then skip 10 for good. Rows therefore also store the id
+of the transaction that wrote them (``txid``). Readers order by ``(txid, id)`` and only
+read rows below the snapshot's xmin, the oldest transaction still running. Every
+transaction below it has finished, so no row can later appear behind the cursor. A
+long-running writing transaction delays readers until it ends; nothing is skipped.
+
+SQLite serializes writers, so ids are already handed out in commit order: ``txid`` is 0
+there and the horizon is unbounded.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# sorts before every stored position; "replay everything"
+START = (-1, 0)
+
+
+class current_txid(FunctionElement):
+    """The writing transaction's id; used as the ``txid`` column default."""
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+class txid_horizon(FunctionElement):
+    """Rows with a ``txid`` below this are committed (or rolled back) for good."""
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_txid)
+def _current_txid(element, compiler, **kw):
+    return "0"
+
+
+@compiles(current_txid, "postgresql")
+def _current_txid_pg(element, compiler, **kw):
+    return "txid_current()"
+
+
+@compiles(txid_horizon)
+def _txid_horizon(element, compiler, **kw):
+    return "9223372036854775807"
+
+
+@compiles(txid_horizon, "postgresql")
+def _txid_horizon_pg(element, compiler, **kw):
+    return "txid_snapshot_xmin(txid_current_snapshot())"
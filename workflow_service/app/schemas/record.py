@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -26,3 +26,29 @@ class RecordRead(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class RecordBatchGet(BaseModel):
+    ids: list[str] = Field(..., min_length=1, example=["0190a5b2-7c1e-7d3a-9f4b-2e8c1a6d5f30"])
+
+
+class RecordBatchGetResponse(BaseModel):
+    items: list[RecordRead]
+    missing: list[str]
+
+
+class RecordRequeue(BaseModel):
+    status: Literal["failed", "processed"] = "failed"  # records to move back to pending
+    category: str | None = None
+    source: str | None = None
+    error_contains: str | None = Field(None, example="timeout")
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    limit: int | None = Field(None, ge=1)  # requeue at most this many
+    process: bool = False  # enqueue the requeued records for processing
+
+
+class RecordRequeueResult(BaseModel):
+    requeued: int
+    batches: int
+    enqueued: int
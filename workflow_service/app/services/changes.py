@@ -0,0 +1,103 @@
+"""Record change log backing the SSE change feed (GET /records/changes).
+
+Changes are read in commit order, ``(txid, id)``, and only below the commit horizon (see
+models.txid). A change whose transaction commits after a later change was streamed is
+still streamed, and a client resuming with ``Last-Event-ID`` does not lose it. Every
+committed change is emitted once per cursor; ids are unique but not always ascending.
+"""
+
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from ..models.record import Record
+from ..models.record_change import RecordChange
+from ..models.txid import START, txid_horizon
+from .notifications import publish_transition
+
+
+def record_change(session: Session, rec: Record, event: str) -> None:
+    """Append a change for ``rec`` to the current transaction.
+
+    Must be called before the commit that persists the status change so the log entry and
+    the transition are atomic.
+    """
+    if rec.id is None:
+        session.flush()
+    session.add(
+        RecordChange(
+            record_id=rec.id,
+            event=event,
+            status=rec.status,
+            source=rec.source,
+            category=rec.category,
+        )
+    )
+    publish_transition(session, rec.id)
+
+
+# cursor into the change log: (txid, id) of the last change read
+Position = tuple[int, int]
+
+
+def head_position(session: Session) -> Position:
+    """The position after the last change committed below the horizon."""
+    row = session.execute(
+        select(RecordChange.txid, RecordChange.id)
+        .where(RecordChange.txid < txid_horizon())
+        .order_by(RecordChange.txid.desc(), RecordChange.id.desc())
+        .limit(1)
+    ).first()
+    return (row.txid, row.id) if row else START
+
+
+def resume_position(session: Session, change_id: int) -> Position:
+    """The position of change ``change_id`` (an SSE ``Last-Event-ID``); 0 replays all."""
+    if change_id <= 0:
+        return START
+    txid = session.execute(
+        select(RecordChange.txid)
+        .where(RecordChange.id <= change_id)
+        .order_by(RecordChange.id.desc())
+        .limit(1)
+    ).scalar()
+    return START if txid is None else (txid, change_id)
+
+
+def get_changes(
+    session: Session,
+    *,
+    after: Position,
+    category: str | None = None,
+    source: str | None = None,
+    limit: int = 100,
+) -> list[RecordChange]:
+    """Return up to ``limit`` committed changes past ``after``, in commit order."""
+    q = session.query(RecordChange).filter(
+        tuple_(RecordChange.txid, RecordChange.id) > tuple_(*after),
+        RecordChange.txid < txid_horizon(),
+    )
+    if category:
+        q = q.filter(RecordChange.category == category)
+    if source:
+        q = q.filter(RecordChange.source == source)
+    return q.order_by(RecordChange.txid.asc(), RecordChange.id.asc()).limit(limit).all()
+
+
+def format_sse(change: RecordChange) -> str:
+    """Serialize a change as one Server-Sent Events message."""
+    data = json.dumps(
+        {
+            "seq": change.id,
+            "record_id": change.record_id,
+            "event": change.event,
+            "status": change.status,
+            "source": change.source,
+            "category": change.category,
+            "occurred_at": change.created_at.isoformat() + "Z",
+        }
+    )
+    return f"id: {change.id}\nevent: {change.event}\ndata: {data}\n\n"
@@ -0,0 +1,47 @@
+"""Content-hash deduplication for ``POST /records``.
+
+Every record stores ``content_hash``, the sha256 of its source, category and canonical
+payload (keys sorted, no insignificant whitespace), so ``{"a": 1, "b": 2}`` and
+``{"b": 2, "a": 1}`` hash the same. In dedup mode an ingest whose hash matches a record
+created within ``DEDUP_WINDOW_SECONDS`` returns that record instead of inserting a new one;
+the lookup is one probe of ``ix_records_content_hash_created_at``.
+
+Two identical requests racing each other can both insert: the window rules out a unique
+constraint, so dedup targets resends, not concurrent duplicates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+
+from ..models.record import Record
+
+# window 0: no age limit
+_EPOCH = datetime(1970, 1, 1)
+
+_FIND_DUPLICATE = (
+    select(Record)
+    .where(Record.content_hash == bindparam("content_hash"))
+    .where(Record.created_at >= bindparam("since"))
+    .order_by(Record.created_at.desc())
+    .limit(1)
+)
+
+
+def content_hash(source: str, category: str, payload: Any) -> str:
+    canonical = json.dumps(
+        [source, category, payload], sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def find_duplicate(db: Session, digest: str, window_seconds: float) -> Record | None:
+    """The newest record with ``digest`` created within the window, if any."""
+    since = datetime.utcnow() - timedelta(seconds=window_seconds) if window_seconds else _EPOCH
+    return db.execute(_FIND_DUPLICATE, {"content_hash": digest, "since": since}).scalars().first()
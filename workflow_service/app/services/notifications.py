@@ -0,0 +1,184 @@
+"""In-process notification of record status transitions.
+
+Long-poll readers subscribe to a record id *before* reading it and then wait on an
+``asyncio.Event``; writers call ``publish_transition`` inside the transaction that
+changes the status and ``notify_committed`` once it has committed. Change feed streams
+subscribe to ``CHANGE_FEED_KEY``, which is signalled for every committed change, and the
+record's entry in ``record_cache`` is invalidated.
+
+On SQLite the in-memory notifier is the whole story (single process). On Postgres the
+transition is also sent with ``pg_notify`` so that waiters in other uvicorn workers are
+woken by their process' ``PostgresNotificationListener``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import select
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .record_cache import RecordCache, record_cache
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "record_status"
+CHANGE_FEED_KEY = "__changes__"
+
+
+class RecordNotifier:
+    """Fan out "record changed" signals to asyncio waiters on any event loop/thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    @contextmanager
+    def subscribe(self, record_id: str) -> Iterator[asyncio.Event]:
+        """Register interest in ``record_id``; must be entered from a running event loop."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(record_id, set()).add(waiter)
+        try:
+            yield waiter[1]
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(record_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[record_id]
+
+    def notify(self, record_id: str) -> None:
+        """Wake every waiter for ``record_id``. Safe to call from any thread."""
+        with self._lock:
+            waiters = list(self._waiters.get(record_id, ()))
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # loop already closed (client went away); its subscription is stale
+                pass
+
+    def waiter_count(self) -> int:
+        with self._lock:
+            return sum(len(w) for w in self._waiters.values())
+
+
+record_notifier = RecordNotifier()
+
+
+def notify_committed(record_id: str) -> None:
+    """Invalidate the cached record and signal its waiters and change feed streams."""
+    record_cache.invalidate(record_id)
+    record_notifier.notify(record_id)
+    record_notifier.notify(CHANGE_FEED_KEY)
+
+
+async def wait_for(event: asyncio.Event, timeout: float) -> bool:
+    """Wait up to ``timeout`` seconds for ``event``; return True if it fired."""
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+def publish_transition(session: Session, record_id: str) -> None:
+    """Queue a cross-process notification in the current transaction (Postgres only).
+
+    ``pg_notify`` is transactional: listeners only see it if the status change commits.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(
+            text("SELECT pg_notify(:channel, :record_id)"),
+            {"channel": PG_CHANNEL, "record_id": record_id},
+        )
+
+
+def publish_transitions(session: Session, record_ids: list[str]) -> None:
+    """``publish_transition`` for many records in one statement (Postgres only)."""
+    if record_ids and session.get_bind().dialect.name == "postgresql":
+        session.execute(
+            text(
+                "SELECT pg_notify(:channel, record_id) "
+                "FROM unnest(CAST(:record_ids AS text[])) AS record_id"
+            ),
+            {"channel": PG_CHANNEL, "record_ids": record_ids},
+        )
+
+
+class PostgresNotificationListener:
+    """Background thread relaying ``LISTEN record_status`` payloads to the notifier."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        notifier: RecordNotifier,
+        cache: RecordCache | None = None,
+        poll_interval: float = 1.0,
+    ):
+        self._engine = engine
+        self._notifier = notifier
+        self._cache = cache
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="pg-notification-listener", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self._poll_interval * 2)
+
+    def _run(self) -> None:
+        backoff = self._poll_interval
+        while not self._stop.is_set():
+            try:
+                self._listen()
+                backoff = self._poll_interval
+            except Exception:
+                logger.exception("notification listener: connection lost, reconnecting")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _listen(self) -> None:
+        # dedicated connection, detached from the pool so the LISTEN never leaks back into it
+        pooled = self._engine.raw_connection()
+        pooled.detach()
+        conn = pooled.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {PG_CHANNEL}")
+            while not self._stop.is_set():
+                readable, _, _ = select.select([conn], [], [], self._poll_interval)
+                if not readable:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    record_id = conn.notifies.pop(0).payload
+                    if self._cache is not None:
+                        self._cache.invalidate(record_id)
+                    self._notifier.notify(record_id)
+                    self._notifier.notify(CHANGE_FEED_KEY)
+        finally:
+            pooled.close()
+
+
+def start_listener(engine: Engine) -> PostgresNotificationListener | None:
+    """Start the cross-process listener when running on Postgres; no-op otherwise."""
+    if engine.dialect.name != "postgresql":
+        return None
+    listener = PostgresNotificationListener(engine, record_notifier, record_cache)
+    listener.start()
+    return listener
@@ -0,0 +1,210 @@
+"""Transactional outbox for webhook events.
+
+``add_event`` stages an event in the session that commits the record's status change, so
+an event exists exactly when the change does. Delivery state lives in ``webhook_cursors``:
+one row per endpoint with the position of the last delivered event, the retry state and a
+lease. Each endpoint receives the events in commit order, ``(txid, id)``, and only events
+below the commit horizon are read (see models.txid). An event whose transaction commits
+after a later id was delivered is therefore still delivered, not skipped. A failing
+endpoint holds back only its own cursor. Events every configured endpoint has moved past
+are deleted.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, exists, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import Settings, settings
+from ..models.outbox import OutboxEvent, WebhookCursor
+from ..models.record import Record
+from ..models.txid import txid_horizon
+
+_config: Settings = settings
+
+
+def configure(config: Settings) -> None:
+    """Stage events for ``config``'s webhook endpoints."""
+    global _config
+    _config = config
+
+
+def add_event(session: Session, rec: Record) -> None:
+    """Stage a ``record.<status>`` event for ``rec`` in the current transaction.
+
+    A no-op while no webhook endpoints are configured, so the table does not grow with
+    nobody to drain it.
+    """
+    if not _config.WEBHOOK_ENDPOINTS:
+        return
+    event = f"record.{rec.status}"
+    body = {
+        "event": event,
+        "record_id": rec.id,
+        "status": rec.status,
+        "source": rec.source,
+        "category": rec.category,
+        "classification": rec.classification,
+        "score": rec.score,
+        "error": rec.error,
+        "occurred_at": datetime.utcnow().isoformat() + "Z",
+    }
+    session.add(OutboxEvent(event=event, record_id=rec.id, body=json.dumps(body)))
+
+
+@dataclass
+class Batch:
+    """Events claimed for one endpoint; ``attempts`` failed deliveries preceded this one."""
+
+    endpoint: str
+    events: list[tuple[int, str]]  # (event id, serialized body)
+    attempts: int
+    last_txid: int = 0  # with the last event id, the cursor position after this batch
+
+    @property
+    def last_id(self) -> int:
+        return self.events[-1][0]
+
+    def payload(self) -> bytes:
+        # the bodies are already JSON objects; splice in the ids instead of re-encoding them
+        events = ",".join(f'{{"id":{event_id},{body[1:]}' for event_id, body in self.events)
+        return f'{{"events":[{events}]}}'.encode()
+
+
+def _ensure_cursor(session: Session, endpoint: str) -> None:
+    """Create the endpoint's cursor at the current end of the outbox (new endpoints get
+    only new events)."""
+    if session.get(WebhookCursor, endpoint) is not None:
+        return
+    head = session.execute(
+        select(OutboxEvent.txid, OutboxEvent.id)
+        .where(OutboxEvent.txid < txid_horizon())
+        .order_by(OutboxEvent.txid.desc(), OutboxEvent.id.desc())
+        .limit(1)
+    ).first() or (0, 0)
+    try:
+        session.execute(
+            insert(WebhookCursor).values(
+                endpoint=endpoint, last_txid=head[0], last_event_id=head[1], attempts=0
+            )
+        )
+        session.commit()
+    except IntegrityError:
+        session.rollback()  # another worker created it
+
+
+def claim_batch(
+    session: Session, endpoint: str, owner: str, lease_seconds: float, batch_size: int
+) -> Batch | None:
+    """Lease ``endpoint`` for ``owner`` and return its next events.
+
+    ``None`` when another worker holds the lease, a retry is not yet due or nothing is
+    pending; the lease is only kept when a batch is returned.
+    """
+    _ensure_cursor(session, endpoint)
+    now = datetime.utcnow()
+    claimed = session.execute(
+        update(WebhookCursor)
+        .where(
+            WebhookCursor.endpoint == endpoint,
+            (WebhookCursor.leased_until.is_(None)) | (WebhookCursor.leased_until < now),
+            (WebhookCursor.next_attempt_at.is_(None)) | (WebhookCursor.next_attempt_at <= now),
+        )
+        .values(lease_owner=owner, leased_until=now + timedelta(seconds=lease_seconds))
+        .returning(WebhookCursor.last_txid, WebhookCursor.last_event_id, WebhookCursor.attempts)
+    ).first()
+    if claimed is None:
+        session.commit()
+        return None
+    events = session.execute(
+        select(OutboxEvent.txid, OutboxEvent.id, OutboxEvent.body)
+        .where(
+            tuple_(OutboxEvent.txid, OutboxEvent.id)
+            > tuple_(claimed.last_txid, claimed.last_event_id),
+            OutboxEvent.txid < txid_horizon(),
+        )
+        .order_by(OutboxEvent.txid, OutboxEvent.id)
+        .limit(batch_size)
+    ).all()
+    if not events:
+        _release(session, endpoint, owner)
+        session.commit()
+        return None
+    session.commit()
+    return Batch(
+        endpoint,
+        [(row.id, row.body) for row in events],
+        claimed.attempts,
+        last_txid=events[-1].txid,
+    )
+
+
+def _release(session: Session, endpoint: str, owner: str, **values) -> int:
+    return session.execute(
+        update(WebhookCursor)
+        .where(WebhookCursor.endpoint == endpoint, WebhookCursor.lease_owner == owner)
+        .values(lease_owner=None, leased_until=None, **values)
+    ).rowcount
+
+
+def mark_delivered(session: Session, batch: Batch, owner: str) -> None:
+    """Advance the cursor past ``batch`` and clear its retry state."""
+    _release(
+        session,
+        batch.endpoint,
+        owner,
+        last_txid=batch.last_txid,
+        last_event_id=batch.last_id,
+        attempts=0,
+        next_attempt_at=None,
+        last_error=None,
+    )
+    session.commit()
+
+
+def mark_failed(
+    session: Session, batch: Batch, owner: str, error: str, max_attempts: int, retry_in: float
+) -> bool:
+    """Record a failed delivery; returns True when ``batch`` was given up on (skipped)."""
+    attempts = batch.attempts + 1
+    if attempts >= max_attempts:
+        _release(
+            session,
+            batch.endpoint,
+            owner,
+            last_txid=batch.last_txid,
+            last_event_id=batch.last_id,
+            attempts=0,
+            next_attempt_at=None,
+            last_error=error,
+        )
+        session.commit()
+        return True
+    _release(
+        session,
+        batch.endpoint,
+        owner,
+        attempts=attempts,
+        next_attempt_at=datetime.utcnow() + timedelta(seconds=retry_in),
+        last_error=error,
+    )
+    session.commit()
+    return False
+
+
+def prune_delivered(session: Session, endpoints: list[str]) -> int:
+    """Delete events every endpoint in ``endpoints`` has moved past."""
+    pending = exists().where(
+        WebhookCursor.endpoint.in_(endpoints),
+        tuple_(OutboxEvent.txid, OutboxEvent.id)
+        > tuple_(WebhookCursor.last_txid, WebhookCursor.last_event_id),
+    )
+    has_cursor = exists().where(WebhookCursor.endpoint.in_(endpoints))
+    deleted = session.execute(delete(OutboxEvent).where(has_cursor, ~pending))
+    session.commit()
+    return deleted.rowcount
@@ -0,0 +1,229 @@
+"""Filters on payload fields for ``GET /records`` and ``GET /reports/summary``.
+
+A filter is ``<path><op><value>``, e.g. ``priority>=3`` or ``customer.name=Alice``: ``path``
+is a dotted key path into the payload, ``op`` one of ``= != > >= < <=`` and ``value`` a JSON
+scalar; a value that does not parse as JSON is taken as a string (``""`` is the empty one).
+``path=null`` matches a missing key as well as an explicit null, ``path!=null`` a present,
+non-null one. Range operators compare numbers with numbers and strings with strings only,
+so ``priority>=3`` never matches ``"priority": "5"``.
+
+Filters compile to JSON path SQL and run in the database: ``json_extract(payload, '$.path')``
+on SQLite; on PostgreSQL (JSONB) equality is a containment test (``payload @> '{...}'``,
+served by the GIN index) and everything else compares ``payload #> '{path}'``. The path is
+rendered as a SQL literal, not bound, so the expression is the one the per-path indexes of
+:func:`create_payload_index` are built on; values are always bound.
+
+Only the paths an admin declares in ``PAYLOAD_INDEXED_PATHS`` (each backed by an expression
+index created by migration) can be filtered on, unless ``PAYLOAD_FILTER_ALLOW_UNINDEXED``.
+"""
+
+from __future__ import annotations
+
+import json
+import operator
+import re
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import String, and_, bindparam, cast, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models.record import Record
+
+RANGE_OPERATORS = frozenset((">", ">=", "<", "<="))
+INDEX_PREFIX = "ix_records_payload_"
+
+# operators are tried longest first, so "a>=1" is not read as "a>" "=1"
+_FILTER_RE = re.compile(
+    r"^\s*([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)\s*(!=|>=|<=|=|>|<)(.*)$",
+    re.DOTALL,
+)
+# json_type() values on SQLite per value kind; rendered inline, like the paths
+_SQLITE_TYPES = {
+    "number": ("'integer'", "'real'"),
+    "string": ("'text'",),
+    "bool": ("'true'", "'false'"),
+}
+_PG_TYPES = {"number": "'number'", "string": "'string'"}
+_PG_NULL = "'null'"
+_COMPARATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+@dataclass(frozen=True)
+class PayloadFilter:
+    path: str
+    op: str
+    value: Any
+
+    @property
+    def kind(self) -> str:
+        if self.value is None:
+            return "null"
+        if isinstance(self.value, bool):
+            return "bool"
+        if isinstance(self.value, (int, float)):
+            return "number"
+        return "string"
+
+
+# one entry per filter: (dialect, path, op, kind); part of reporting's statement shape
+PayloadShape = tuple[tuple[str, str, str, str], ...]
+
+
+def parse_payload_filter(expr: str) -> PayloadFilter:
+    """Parse ``<path><op><value>``; raises ValueError on malformed input."""
+    match = _FILTER_RE.match(expr)
+    if not match:
+        raise ValueError(f"invalid payload filter: {expr!r}")
+    path, op, raw = match.group(1), match.group(2), match.group(3).strip()
+    if not raw:
+        # an empty string is written as ""
+        raise ValueError(f"payload filter without a value: {expr!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"payload filter values must be scalars: {expr!r}")
+    if isinstance(value, float) and value != value:  # NaN
+        raise ValueError(f"invalid payload filter value: {expr!r}")
+    parsed = PayloadFilter(path, op, value)
+    if op in RANGE_OPERATORS and parsed.kind not in ("number", "string"):
+        raise ValueError(f"{op} needs a number or string value: {expr!r}")
+    return parsed
+
+
+def parse_payload_filters(
+    exprs: Iterable[str],
+    allowed_paths: Collection[str] | None = None,
+    max_filters: int | None = None,
+) -> list[PayloadFilter]:
+    """Parse ``exprs``; with ``allowed_paths``, any other path is rejected (ValueError).
+
+    More than ``max_filters`` filters are rejected too: every combination is its own
+    statement shape, cached per shape.
+    """
+    exprs = list(exprs)
+    if max_filters is not None and len(exprs) > max_filters:
+        raise ValueError(f"at most {max_filters} payload filters are allowed, got {len(exprs)}")
+    filters = [parse_payload_filter(expr) for expr in exprs]
+    if allowed_paths is not None:
+        for f in filters:
+            if f.path not in allowed_paths:
+                allowed = ", ".join(sorted(allowed_paths)) or "none"
+                raise ValueError(
+                    f"payload path {f.path!r} is not indexed for filtering (indexed: {allowed})"
+                )
+    return filters
+
+
+def payload_shape(dialect: str, filters: Iterable[PayloadFilter]) -> PayloadShape:
+    return tuple((dialect, f.path, f.op, f.kind) for f in filters)
+
+
+def param_name(position: int) -> str:
+    return f"payload_{position}"
+
+
+def _sqlite_path(path: str) -> str:
+    return "'$." + path + "'"
+
+
+def _pg_path(path: str) -> str:
+    return "'{" + ",".join(path.split(".")) + "}'"
+
+
+def path_expression(dialect: str, path: str) -> str:
+    """The indexed SQL expression for ``path``, as it appears in index DDL."""
+    if dialect == "postgresql":
+        return f"(payload #> {_pg_path(path)})"
+    return f"json_extract(payload, {_sqlite_path(path)})"
+
+
+def filter_condition(dialect: str, path: str, op: str, kind: str, name: str) -> ColumnElement[bool]:
+    """The WHERE clause for one filter; its value is bound as ``name``."""
+    if dialect == "postgresql":
+        return _pg_condition(path, op, kind, name)
+    return _sqlite_condition(path, op, kind, name)
+
+
+def _sqlite_condition(path: str, op: str, kind: str, name: str) -> ColumnElement[bool]:
+    json_path = literal_column(_sqlite_path(path))
+    value = func.json_extract(Record.payload, json_path)
+    if kind == "null":
+        return value.is_(None) if op == "=" else value.is_not(None)
+    compared = _COMPARATORS[op](value, bindparam(name))
+    if op == "!=":
+        return compared
+    # json_extract returns true/false as 1/0 and SQLite orders text above any number;
+    # checking the JSON type keeps comparisons between values of the same kind
+    return and_(
+        compared,
+        func.json_type(Record.payload, json_path).in_(
+            [literal_column(name) for name in _SQLITE_TYPES[kind]]
+        ),
+    )
+
+
+def _pg_condition(path: str, op: str, kind: str, name: str) -> ColumnElement[bool]:
+    value = Record.payload.op("#>", return_type=JSONB)(literal_column(_pg_path(path)))
+    if kind == "null":
+        json_type = func.jsonb_typeof(value)
+        if op == "=":
+            return or_(json_type.is_(None), json_type == literal_column(_PG_NULL))
+        return json_type != literal_column(_PG_NULL)
+    bound = cast(bindparam(name, type_=String), JSONB)
+    if op == "=":
+        # containment is type-exact and can use the GIN (jsonb_path_ops) index
+        return Record.payload.op("@>", is_comparison=True)(bound)
+    compared = _COMPARATORS[op](value, bound)
+    if op == "!=":
+        return compared
+    # jsonb orders across types (strings sort below numbers); compare like with like
+    return and_(compared, func.jsonb_typeof(value) == literal_column(_PG_TYPES[kind]))
+
+
+def param_value(dialect: str, f: PayloadFilter) -> Any:
+    """The bound value for ``f``; ``None`` for null filters, which bind nothing."""
+    if f.kind == "null":
+        return None
+    if dialect != "postgresql":
+        return f.value
+    if f.op == "=":
+        document: Any = f.value
+        for key in reversed(f.path.split(".")):
+            document = {key: document}
+        return json.dumps(document)
+    return json.dumps(f.value)
+
+
+def index_name(path: str) -> str:
+    return INDEX_PREFIX + path.replace(".", "_")
+
+
+def create_payload_index(op, path: str) -> None:
+    """Create the expression index for filtering on ``path``; for use in migrations.
+
+    Built ``CONCURRENTLY`` on PostgreSQL, which must run outside a transaction: call it in
+    ``op.get_context().autocommit_block()``.
+    """
+    dialect = op.get_bind().dialect.name
+    concurrently = " CONCURRENTLY" if dialect == "postgresql" else ""
+    op.execute(
+        f"CREATE INDEX{concurrently} IF NOT EXISTS {index_name(path)} "
+        f"ON records ({path_expression(dialect, path)})"
+    )
+
+
+def drop_payload_index(op, path: str) -> None:
+    concurrently = " CONCURRENTLY" if op.get_bind().dialect.name == "postgresql" else ""
+    op.execute(f"DROP INDEX{concurrently} IF EXISTS {index_name(path)}")
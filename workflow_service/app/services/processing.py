@@ -1,17 +1,33 @@
 import json
 import logging
+import time
 
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 
-from ..database import engine
+from .. import database
+from ..core.metrics import RECORD_PROCESSING, RECORD_PROCESSING_DURATION
+from ..core.tracing import traced
 from ..models.record import Record, StatusEnum
-
-# Create a session factory bound to the app's engine.
-SessionLocal = sessionmaker(bind=engine)
+from .changes import record_change
+from .notifications import notify_committed
+from .outbox import add_event
 
 logger = logging.getLogger(__name__)
 
 
+def _commit_transition(session: Session, rec: Record) -> None:
+    """Commit a status change with its change-log entry and webhook event, and wake waiters
+    on the record."""
+    record_change(session, rec, rec.status)
+    add_event(session, rec)
+    # read before the commit expires them: afterwards each access would reload the row
+    record_id, status, category = rec.id, rec.status, rec.category
+    session.commit()
+    RECORD_PROCESSING.labels(status=status, category=category).inc()
+    notify_committed(record_id)
+
+
+@traced("processing.process_record")
 def process_record(record_id: str) -> None:
     """
     Background worker for processing a record.
@@ -19,8 +35,10 @@ def process_record(record_id: str) -> None:
     request-scoped session.
     """
     session: Session | None = None
+    started_at = time.perf_counter()
     try:
-        session = SessionLocal()
+        # the app's shared session factory, not a request-scoped session
+        session = database.SessionLocal()
         rec = session.query(Record).filter(Record.id == record_id).first()
         if not rec:
             logger.error("process_record: record %s not found", record_id)
@@ -37,7 +55,7 @@ def process_record(record_id: str) -> None:
             logger.exception("process_record: invalid payload for record %s", record_id)
             rec.status = StatusEnum.failed.value
             rec.error = "invalid payload"
-            session.commit()
+            _commit_transition(session, rec)
             return
 
         # Simple validation rule used by tests: if `priority` exists it must be numeric
@@ -49,7 +67,7 @@ def process_record(record_id: str) -> None:
                 logger.info("process_record: invalid priority for record %s", record_id)
                 rec.status = StatusEnum.failed.value
                 rec.error = "invalid priority"
-                session.commit()
+                _commit_transition(session, rec)
                 return
 
         # ---- Dummy processing logic (success) ----
@@ -58,7 +76,7 @@ def process_record(record_id: str) -> None:
         rec.status = StatusEnum.processed.value
         # ------------------------------------------
 
-        session.commit()
+        _commit_transition(session, rec)
         logger.info("process_record: record %s processed", record_id)
     except Exception:
         # Mark failed and persist error message
@@ -69,9 +87,16 @@ def process_record(record_id: str) -> None:
                 if rec:
                     rec.status = StatusEnum.failed.value
                     rec.error = "processing error (see logs)"
-                    session.commit()
+                    _commit_transition(session, rec)
             except Exception:
                 session.rollback()
     finally:
         if session:
             session.close()
+        RECORD_PROCESSING_DURATION.observe(time.perf_counter() - started_at)
+
+
+def process_records(record_ids: list[str]) -> None:
+    """Process ``record_ids`` one after another (background task for bulk requeues)."""
+    for record_id in record_ids:
+        process_record(record_id)
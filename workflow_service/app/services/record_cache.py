@@ -0,0 +1,96 @@
+"""In-process cache of serialized ``RecordRead`` responses for ``GET /records/{id}``.
+
+Entries are the JSON bytes sent to the client, kept in a bounded LRU with a TTL. Every
+committed write to a record goes through ``notifications.notify_committed``, which
+invalidates the record here; on Postgres other workers invalidate their copy when their
+``PostgresNotificationListener`` relays the transition's ``pg_notify``.
+
+A reader that loaded a record just before a concurrent write must not re-insert the old
+bytes afterwards. Readers take a ``fill_token()`` before querying and ``set`` drops the
+value if the record was invalidated after that token was taken.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from ..config import Settings, settings
+from ..core.metrics import RECORD_CACHE_ENTRIES, RECORD_CACHE_REQUESTS
+
+
+class RecordCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._epoch = 0
+        # epoch of the latest invalidation per id (bounded; older ones fold into _floor)
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._floor = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, record_id: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(record_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(record_id)
+                RECORD_CACHE_REQUESTS.labels(result="hit").inc()
+                return entry[0]
+            if entry is not None:
+                del self._entries[record_id]
+        RECORD_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+
+    def fill_token(self) -> int:
+        with self._lock:
+            return self._epoch
+
+    def set(self, record_id: str, data: bytes, token: int) -> bool:
+        """Store ``data`` unless ``record_id`` was invalidated after ``token`` was taken."""
+        with self._lock:
+            if token < max(self._floor, self._invalidated.get(record_id, 0)):
+                return False
+            self._entries[record_id] = (data, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(record_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            RECORD_CACHE_ENTRIES.set(len(self._entries))
+            return True
+
+    def invalidate(self, record_id: str) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.pop(record_id, None)
+            self._invalidated[record_id] = self._epoch
+            self._invalidated.move_to_end(record_id)
+            while len(self._invalidated) > max(self.max_entries, 1):
+                _, epoch = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, epoch)
+            RECORD_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._floor = self._epoch
+            self._entries.clear()
+            self._invalidated.clear()
+            RECORD_CACHE_ENTRIES.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+record_cache = RecordCache(settings.RECORD_CACHE_MAX_ENTRIES, settings.RECORD_CACHE_TTL_SECONDS)
+
+
+def configure(config: Settings) -> None:
+    """Size ``record_cache`` for ``config`` (in place: modules hold it by name); empties it."""
+    record_cache.max_entries = config.RECORD_CACHE_MAX_ENTRIES
+    record_cache.ttl_seconds = config.RECORD_CACHE_TTL_SECONDS
+    record_cache.clear()
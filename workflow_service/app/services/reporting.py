@@ -1,33 +1,143 @@
 from __future__ import annotations
 
+import functools
 from datetime import datetime
 
-from sqlalchemy import and_, func
+from sqlalchemy import Select, and_, bindparam, func, or_, select
 from sqlalchemy.orm import Session
 
+from ..core.tracing import traced
 from ..models.record import Record
+from .payload_filters import (
+    PayloadFilter,
+    PayloadShape,
+    filter_condition,
+    param_name,
+    param_value,
+    payload_shape,
+)
 
 ALLOWED_STATUSES = {"pending", "processed", "failed"}
 
-
-def _apply_filters(
-    query,
+# Hot queries are built once per "shape" (which filters are present, sort order) with
+# bind parameters for the filter values, and memoized. Repeat calls skip statement
+# construction, and SQLAlchemy's compiled cache (keyed on the same statement objects) skips
+# compilation; hits are counted in sql_compiled_cache_total. Payload filters make the number
+# of shapes open-ended, so each builder keeps only the most recently used ones.
+STATEMENT_CACHE_SIZE = 256
+
+# which of status, category, date_from, date_to are filtered on, plus the payload filters
+FilterShape = tuple[bool, bool, bool, bool, PayloadShape]
+
+_SORT_COLUMNS = {
+    "created_at": Record.created_at,
+    "status": Record.status,
+    "category": Record.category,
+    "source": Record.source,
+}
+
+
+def _apply_filters(stmt: Select, shape: FilterShape) -> Select:
+    has_status, has_category, has_from, has_to, payload = shape
+    if has_status:
+        stmt = stmt.where(Record.status == bindparam("status"))
+    if has_category:
+        stmt = stmt.where(Record.category == bindparam("category"))
+    if has_from:
+        stmt = stmt.where(Record.created_at >= bindparam("date_from"))
+    if has_to:
+        stmt = stmt.where(Record.created_at <= bindparam("date_to"))
+    for position, (dialect, path, op, kind) in enumerate(payload):
+        name = param_name(position)
+        stmt = stmt.where(filter_condition(dialect, path, op, kind, name))
+    return stmt
+
+
+def _filter_params(
     status: str | None,
     category: str | None,
     date_from: datetime | None,
     date_to: datetime | None,
-):
-    if status:
-        query = query.filter(Record.status == status)
-    if category:
-        query = query.filter(Record.category == category)
-    if date_from:
-        query = query.filter(Record.created_at >= date_from)
-    if date_to:
-        query = query.filter(Record.created_at <= date_to)
-    return query
+    db: Session,
+    payload: list[PayloadFilter] | None = None,
+) -> tuple[FilterShape, dict[str, object]]:
+    values = {"status": status, "category": category, "date_from": date_from, "date_to": date_to}
+    params = {name: value for name, value in values.items() if value}
+    payload_part: PayloadShape = ()
+    if payload:
+        # the compiled JSON path SQL differs per backend
+        dialect = db.get_bind().dialect.name
+        payload_part = payload_shape(dialect, payload)
+        for position, f in enumerate(payload):
+            if f.kind != "null":
+                params[param_name(position)] = param_value(dialect, f)
+    shape = (bool(status), bool(category), bool(date_from), bool(date_to), payload_part)
+    return shape, params
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _count_stmt(shape: FilterShape) -> Select:
+    return _apply_filters(select(func.count(Record.id)), shape)
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _page_stmt(shape: FilterShape, sort_by: str, descending: bool, keyset: bool) -> Select:
+    sort_column = _SORT_COLUMNS[sort_by]
+    stmt = _apply_filters(select(Record), shape)
+    if keyset:
+        # rows strictly after the cursor in (created_at, id) order
+        cursor_at, cursor_id = bindparam("cursor_created_at"), bindparam("cursor_id")
+        if descending:
+            after = or_(
+                Record.created_at < cursor_at,
+                and_(Record.created_at == cursor_at, Record.id < cursor_id),
+            )
+        else:
+            after = or_(
+                Record.created_at > cursor_at,
+                and_(Record.created_at == cursor_at, Record.id > cursor_id),
+            )
+        stmt = stmt.where(after)
+    # id breaks ties, so pages are stable when sort values repeat (ids are time-ordered)
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), Record.id.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), Record.id.asc())
+    return stmt.limit(bindparam("limit")).offset(bindparam("offset"))
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _status_counts_stmt(shape: FilterShape) -> Select:
+    stmt = select(Record.status, func.count(Record.id)).group_by(Record.status)
+    return _apply_filters(stmt, shape)
+
 
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _category_counts_stmt(shape: FilterShape) -> Select:
+    stmt = select(Record.category, func.count(Record.id)).group_by(Record.category)
+    return _apply_filters(stmt, shape)
 
+
+# one statement for every batch fetch: the IN list is expanded per call, chunked to stay
+# under the driver's bound-parameter limit
+_RECORDS_BY_IDS = select(Record).where(Record.id.in_(bindparam("ids", expanding=True)))
+
+
+def statement_cache_info() -> dict[str, dict[str, int]]:
+    """Hit/miss counts of the memoized statement builders."""
+    builders = {
+        "count": _count_stmt,
+        "page": _page_stmt,
+        "status_counts": _status_counts_stmt,
+        "category_counts": _category_counts_stmt,
+    }
+    return {
+        name: {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        for name, info in ((name, builder.cache_info()) for name, builder in builders.items())
+    }
+
+
+@traced("reporting.get_records")
 def get_records(
     db: Session,
     *,
@@ -39,34 +149,51 @@ def get_records(
     offset: int = 0,
     sort_by: str = "created_at",
     sort_order: str = "desc",
+    after: tuple[datetime, str] | None = None,
+    payload_filters: list[PayloadFilter] | None = None,
 ) -> tuple[list[Record], int]:
     """Return a page of records and the total matching count (without pagination).
 
-    Default ordering is newest-first (created_at desc).
+    Default ordering is newest-first (created_at desc), ties broken by id.
     Supports sorting by: created_at, status, category, source
+    ``after`` is a keyset cursor ``(created_at, id)`` of the last row of the previous page;
+    it requires sorting by created_at and replaces ``offset``.
+    ``payload_filters`` (see services.payload_filters) are applied in SQL.
     """
-    base_q = db.query(Record)
-    base_q = _apply_filters(base_q, status, category, created_after, created_before)
-
-    total = base_q.count()
+    if after is not None and sort_by != "created_at":
+        raise ValueError("cursor pagination requires sort_by=created_at")
+    shape, params = _filter_params(
+        status, category, created_after, created_before, db, payload_filters
+    )
+    total = db.execute(_count_stmt(shape), params).scalar() or 0
 
     # Apply sorting
-    sort_column_map = {
-        "created_at": Record.created_at,
-        "status": Record.status,
-        "category": Record.category,
-        "source": Record.source,
-    }
-
-    sort_column = sort_column_map.get(sort_by, Record.created_at)
-    if sort_order.lower() == "asc":
-        items = base_q.order_by(sort_column.asc()).limit(limit).offset(offset).all()
-    else:
-        items = base_q.order_by(sort_column.desc()).limit(limit).offset(offset).all()
+    if sort_by not in _SORT_COLUMNS:
+        sort_by = "created_at"
+    page_stmt = _page_stmt(shape, sort_by, sort_order.lower() != "asc", after is not None)
+    page_params = {**params, "limit": limit, "offset": offset}
+    if after is not None:
+        page_params.update(cursor_created_at=after[0], cursor_id=after[1], offset=0)
+    items = list(db.execute(page_stmt, page_params).scalars())
 
     return items, total
 
 
+@traced("reporting.get_records_by_ids")
+def get_records_by_ids(db: Session, ids: list[str], chunk_size: int = 500) -> dict[str, Record]:
+    """Return the records among ``ids`` that exist, keyed by id.
+
+    One ``WHERE id IN (...)`` query per ``chunk_size`` ids.
+    """
+    found: dict[str, Record] = {}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        for rec in db.execute(_RECORDS_BY_IDS, {"ids": chunk}).scalars():
+            found[rec.id] = rec
+    return found
+
+
+@traced("reporting.get_summary")
 def get_summary(
     db: Session,
     *,
@@ -74,6 +201,7 @@ def get_summary(
     category: str | None = None,
     date_from: datetime | None = None,
     date_to: datetime | None = None,
+    payload_filters: list[PayloadFilter] | None = None,
 ) -> dict[str, object]:
     """Return aggregated summary data for records.
 
@@ -84,45 +212,20 @@ def get_summary(
     if status and status not in ALLOWED_STATUSES:
         raise ValueError(f"invalid status: {status}")
 
-    # Base filters applied to queries
-    filters = []
-    if status:
-        filters.append(Record.status == status)
-    if category:
-        filters.append(Record.category == category)
-    if date_from:
-        filters.append(Record.created_at >= date_from)
-    if date_to:
-        filters.append(Record.created_at <= date_to)
+    shape, params = _filter_params(status, category, date_from, date_to, db, payload_filters)
 
     # Totals
-    total_q = db.query(func.count(Record.id))
-    if filters:
-        total_q = total_q.filter(and_(*filters))
-    total_all = total_q.scalar() or 0
+    total_all = db.execute(_count_stmt(shape), params).scalar() or 0
 
     # Totals by status (regardless of category unless filtered)
-    status_q = db.query(Record.status, func.count(Record.id)).group_by(Record.status)
-    if filters:
-        status_q = status_q.filter(and_(*filters))
-    status_rows = status_q.all()
+    status_rows = db.execute(_status_counts_stmt(shape), params).all()
     totals = {"all": int(total_all), "pending": 0, "processed": 0, "failed": 0}
     for st, cnt in status_rows:
         if st in totals:
             totals[st] = int(cnt)
 
     # Counts by category
-    cat_q = db.query(Record.category, func.count(Record.id)).group_by(Record.category)
-    if status:
-        # if status provided, include it in the category aggregation
-        cat_q = cat_q.filter(Record.status == status)
-    if date_from:
-        cat_q = cat_q.filter(Record.created_at >= date_from)
-    if date_to:
-        cat_q = cat_q.filter(Record.created_at <= date_to)
-    if category:
-        cat_q = cat_q.filter(Record.category == category)
-
-    by_category = [{"category": cat, "count": int(cnt)} for cat, cnt in cat_q.all()]
+    cat_rows = db.execute(_category_counts_stmt(shape), params).all()
+    by_category = [{"category": cat, "count": int(cnt)} for cat, cnt in cat_rows]
 
     return {"totals": totals, "by_category": by_category}
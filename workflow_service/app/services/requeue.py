@@ -0,0 +1,106 @@
+"""Bulk reset of finished records back to ``pending`` (POST /records/requeue).
+
+Matching records are moved in batches of ``batch_size``, one transaction per batch: a single
+``UPDATE ... WHERE id IN (SELECT id ... LIMIT n) RETURNING`` per batch, so no statement holds
+row locks on more than one batch and concurrent writers are blocked only briefly. The
+returned rows feed the change log (``requeued`` events) and the cache invalidation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from ..core.tracing import traced
+from ..models.record import Record, StatusEnum
+from ..models.record_change import RecordChange
+from .notifications import notify_committed, publish_transitions
+
+REQUEUE_EVENT = "requeued"
+
+
+@dataclass
+class RequeueResult:
+    record_ids: list[str] = field(default_factory=list)
+    batches: int = 0
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    # created_at is stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@traced("requeue.requeue_records")
+def requeue_records(
+    db: Session,
+    *,
+    from_status: str = StatusEnum.failed.value,
+    category: str | None = None,
+    source: str | None = None,
+    error_contains: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    limit: int | None = None,
+    batch_size: int = 500,
+) -> RequeueResult:
+    """Reset matching ``from_status`` records to ``pending`` and clear their outcome.
+
+    At most ``limit`` records are moved when it is given. Each batch is committed on its
+    own, so an interrupted call leaves the earlier batches requeued.
+    """
+    if from_status == StatusEnum.pending.value:
+        raise ValueError("records are already pending")
+    conditions = [Record.status == from_status]
+    if category:
+        conditions.append(Record.category == category)
+    if source:
+        conditions.append(Record.source == source)
+    if error_contains:
+        conditions.append(Record.error.contains(error_contains, autoescape=True))
+    if created_after := _naive_utc(created_after):
+        conditions.append(Record.created_at >= created_after)
+    if created_before := _naive_utc(created_before):
+        conditions.append(Record.created_at <= created_before)
+
+    result = RequeueResult()
+    while limit is None or len(result.record_ids) < limit:
+        size = batch_size if limit is None else min(batch_size, limit - len(result.record_ids))
+        batch = select(Record.id).where(*conditions).order_by(Record.id).limit(size)
+        # the status check is repeated for rows changed since the subquery's snapshot
+        rows = db.execute(
+            update(Record)
+            .where(Record.id.in_(batch.scalar_subquery()), Record.status == from_status)
+            .values(status=StatusEnum.pending.value, classification=None, score=None, error=None)
+            .returning(Record.id, Record.source, Record.category)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+        db.execute(
+            insert(RecordChange),
+            [
+                {
+                    "record_id": row.id,
+                    "event": REQUEUE_EVENT,
+                    "status": StatusEnum.pending.value,
+                    "source": row.source,
+                    "category": row.category,
+                }
+                for row in rows
+            ],
+        )
+        publish_transitions(db, ids)
+        db.commit()
+        for record_id in ids:
+            notify_committed(record_id)
+        result.record_ids.extend(ids)
+        result.batches += 1
+        if len(rows) < size:
+            break
+    return result
@@ -0,0 +1,164 @@
+"""Webhook delivery of outbox events.
+
+``WebhookDispatcher`` runs on a background thread, apart from request handling and
+``process_record``: processing only writes the outbox row in its own transaction, and
+delivery latency or a slow endpoint never reaches it. Each cycle claims a batch of up to
+``WEBHOOK_BATCH_SIZE`` events per endpoint (see ``outbox.claim_batch``) and POSTs it as
+``{"events": [...]}``, with at most ``WEBHOOK_MAX_CONCURRENCY`` deliveries in flight. A
+non-2xx response or a network error schedules a retry of the same batch with exponential
+backoff; after ``WEBHOOK_MAX_ATTEMPTS`` the batch is skipped and logged. Delivery is at
+least once: receivers should de-duplicate on the event ``id``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import sessionmaker
+
+from ..config import Settings
+from ..core.metrics import WEBHOOK_DELIVERIES, WEBHOOK_EVENTS_DELIVERED
+from . import outbox
+
+logger = logging.getLogger(__name__)
+
+
+def post_batch(url: str, payload: bytes, timeout: float) -> None:
+    """POST ``payload`` to ``url``; raises on a network error or a non-2xx response."""
+    request = urllib.request.Request(
+        url,
+        data=payload,
+        method="POST",
+        headers={"Content-Type": "application/json", "User-Agent": "workflow-service-webhooks"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if not 200 <= response.status < 300:
+            raise urllib.error.HTTPError(url, response.status, response.reason, None, None)
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        endpoints: dict[str, str],
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        timeout: float = 5.0,
+        max_attempts: int = 10,
+        retry_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        poll_interval: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        self.endpoints = endpoints
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        # the lease outlives a delivery that runs into its timeout
+        self.lease_seconds = timeout * 2 + 5
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max(max_concurrency, 1), "webhook-delivery")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="webhook-dispatcher", daemon=True)
+
+    @classmethod
+    def from_settings(cls, config: Settings, session_factory: sessionmaker) -> WebhookDispatcher:
+        return cls(
+            session_factory,
+            config.WEBHOOK_ENDPOINTS,
+            batch_size=config.WEBHOOK_BATCH_SIZE,
+            max_concurrency=config.WEBHOOK_MAX_CONCURRENCY,
+            timeout=config.WEBHOOK_TIMEOUT_SECONDS,
+            max_attempts=config.WEBHOOK_MAX_ATTEMPTS,
+            retry_backoff=config.WEBHOOK_RETRY_BACKOFF_SECONDS,
+            max_backoff=config.WEBHOOK_MAX_BACKOFF_SECONDS,
+            poll_interval=config.WEBHOOK_POLL_INTERVAL_SECONDS,
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.timeout + self.poll_interval)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                full = self.run_once() >= self.batch_size
+            except Exception:
+                logger.exception("webhook dispatcher: delivery cycle failed")
+                full = False
+            # drain a backlog without pausing; otherwise poll
+            if not full:
+                self._stop.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """Deliver one batch per endpoint; returns the largest batch delivered."""
+        futures = [
+            self._executor.submit(self.deliver, name, url) for name, url in self.endpoints.items()
+        ]
+        delivered = [future.result() for future in futures]
+        if any(delivered):
+            with self.session_factory() as session:
+                outbox.prune_delivered(session, list(self.endpoints))
+        return max(delivered, default=0)
+
+    def deliver(self, endpoint: str, url: str) -> int:
+        """Claim and POST the next batch for ``endpoint``; returns the events delivered."""
+        with self.session_factory() as session:
+            batch = outbox.claim_batch(
+                session, endpoint, self.owner, self.lease_seconds, self.batch_size
+            )
+        if batch is None:
+            return 0
+        try:
+            post_batch(url, batch.payload(), self.timeout)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            retry_in = min(self.retry_backoff * 2**batch.attempts, self.max_backoff)
+            with self.session_factory() as session:
+                skipped = outbox.mark_failed(
+                    session, batch, self.owner, error, self.max_attempts, retry_in
+                )
+            if skipped:
+                WEBHOOK_DELIVERIES.labels(endpoint=endpoint, outcome="dropped").inc()
+                logger.error(
+                    "webhook %s: giving up on events %d-%d after %d attempts: %s",
+                    endpoint,
+                    batch.events[0][0],
+                    batch.last_id,
+                    self.max_attempts,
+                    error,
+                )
+            else:
+                WEBHOOK_DELIVERIES.labels(endpoint=endpoint, outcome="retry").inc()
+                logger.warning(
+                    "webhook %s: delivery failed (%s), retrying in %.1fs", endpoint, error, retry_in
+                )
+            return 0
+        with self.session_factory() as session:
+            outbox.mark_delivered(session, batch, self.owner)
+        WEBHOOK_DELIVERIES.labels(endpoint=endpoint, outcome="success").inc()
+        WEBHOOK_EVENTS_DELIVERED.labels(endpoint=endpoint).inc(len(batch.events))
+        return len(batch.events)
+
+
+def start_dispatcher(config: Settings, session_factory: sessionmaker) -> WebhookDispatcher | None:
+    """Start delivering when webhook endpoints are configured; no-op otherwise."""
+    if not config.WEBHOOK_ENDPOINTS:
+        return None
+    dispatcher = WebhookDispatcher.from_settings(config, session_factory)
+    dispatcher.start()
+    return dispatcher
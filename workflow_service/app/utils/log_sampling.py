@@ -0,0 +1,93 @@
+"""Tail-based sampling of request log lines.
+
+Every error (status >= 400) and every slow request is logged. Successful fast requests
+are logged with probability ``LOG_SAMPLE_RATE``, or the per-route override from
+``LOG_ROUTE_SAMPLE_RATES`` keyed by route template (e.g. ``/records/{record_id}``).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from collections.abc import Callable
+
+from ..config import Settings, settings
+from ..core.metrics import REQUEST_LOG_DECISIONS
+
+
+class RequestLogSampler:
+    """Decide which request log lines to keep and count the decisions."""
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        slow_request_ms: int = 1000,
+        route_sample_rates: dict[str, float] | None = None,
+        merge_start_end: bool = False,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.route_sample_rates = dict(route_sample_rates or {})
+        self.merge_start_end = merge_start_end
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._counts = {"kept_error": 0, "kept_slow": 0, "kept_sampled": 0, "dropped": 0}
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> RequestLogSampler:
+        return cls(
+            sample_rate=config.LOG_SAMPLE_RATE,
+            slow_request_ms=config.LOG_SLOW_REQUEST_MS,
+            route_sample_rates=config.LOG_ROUTE_SAMPLE_RATES,
+            merge_start_end=config.LOG_MERGE_START_END,
+        )
+
+    @property
+    def sampling_enabled(self) -> bool:
+        """False when every request is logged, so start lines can be emitted immediately."""
+        return self.sample_rate < 1.0 or any(r < 1.0 for r in self.route_sample_rates.values())
+
+    def rate_for(self, route: str) -> float:
+        return self.route_sample_rates.get(route, self.sample_rate)
+
+    def decide(self, route: str, status_code: int, duration_ms: float) -> float | None:
+        """Return the sample rate the request was kept at, or None if it is dropped.
+
+        Errors and slow requests are always kept at rate 1.0.
+        """
+        if status_code >= 400:
+            outcome, rate = "kept_error", 1.0
+        elif duration_ms >= self.slow_request_ms:
+            outcome, rate = "kept_slow", 1.0
+        else:
+            rate = self.rate_for(route)
+            if rate >= 1.0 or self._rng() < rate:
+                outcome = "kept_sampled"
+            else:
+                outcome, rate = "dropped", None
+        with self._lock:
+            self._counts[outcome] += 1
+        REQUEST_LOG_DECISIONS.labels(outcome=outcome).inc()
+        return rate
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "sample_rate": self.sample_rate,
+            "slow_request_ms": self.slow_request_ms,
+            "route_sample_rates": self.route_sample_rates,
+            "merge_start_end": self.merge_start_end,
+        }
+
+
+request_log_sampler = RequestLogSampler.from_settings(settings)
+
+
+def configure(config: Settings) -> None:
+    """Apply ``config`` to ``request_log_sampler`` in place; its decision counts are kept."""
+    configured = RequestLogSampler.from_settings(config)
+    for name in ("sample_rate", "slow_request_ms", "route_sample_rates", "merge_start_end"):
+        setattr(request_log_sampler, name, getattr(configured, name))
@@ -1,8 +1,82 @@
+"""Structured JSON logging for the service.
+
+Log calls on the request path only enqueue the ``LogRecord``; a ``QueueListener`` thread
+serializes it to JSON and writes it to stdout, so the event loop never blocks on
+``json.dumps`` or stream I/O.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = "workflow_service"
+
+logger = logging.getLogger(LOGGER_NAME)
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render dict messages as JSON; plain messages (and tracebacks) pass through."""
+
+    def __init__(self) -> None:
+        super().__init__("%(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            try:
+                record.msg = json.dumps(record.msg, default=str)
+            except Exception:
+                record.msg = json.dumps({"msg": "failed to serialize log object"})
+            record.args = None
+        return super().format(record)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records untouched so formatting happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: str = "INFO") -> logging.Logger:
+    """Route the service logger through a queue to a stdout JSON handler (idempotent)."""
+    global _listener
+    logger.setLevel(level.upper())
+    # Prevent double-logging via propagation to root handlers
+    logger.propagate = False
+    if _listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(JsonFormatter())
+        logger.handlers = [_DeferredQueueHandler(log_queue)]
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
 
-logger = logging.getLogger("workflow_service")
-handler = logging.StreamHandler()
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+def log_json(obj: dict, level: str = "info") -> None:
+    """Log a structured event; serialization is deferred to the listener thread."""
+    logger.log(_LEVELS[level], obj)